@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+
+def candles_from_prices(prices, interval_in_seconds=60, start=1_600_000_000, spread=1.0) -> np.ndarray:
+    """
+    :return: (N, 6) candle array opening at the previous close, with high and low spread around the range.
+    """
+
+    close = np.asarray(prices, dtype=np.float64)
+    open_price = np.concatenate(([close[0]], close[:-1]))
+    open_time = start + interval_in_seconds * np.arange(close.shape[0])
+    return np.stack([
+        open_time,
+        open_price,
+        np.maximum(open_price, close) + spread,
+        np.minimum(open_price, close) - spread,
+        close,
+        np.full(close.shape[0], 10.0),
+    ], axis=1)
+
+
+@pytest.fixture
+def make_candles():
+    return candles_from_prices
+
+
+@pytest.fixture
+def simulator(make_candles):
+    """
+    SimulatorServer replaying 20 one minute BTCUSDT and ETHUSDT candles, 5 of them closed at the start.
+    """
+
+    from trader.live.binance.simulator import SimulatedExchange, SimulatorServer
+
+    exchange = SimulatedExchange(
+        {
+            "BTCUSDT": make_candles(100 + np.arange(20.0)),
+            "ETHUSDT": make_candles(50 - np.arange(20.0) / 2),
+        },
+        interval="1m",
+        start=5,
+    )
+    server = SimulatorServer(exchange)
+    server.start()
+    yield server
+    server.stop()
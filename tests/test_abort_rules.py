@@ -0,0 +1,72 @@
+import time
+
+import numpy as np
+
+from trader.backtest import AbortRules, BacktestFuturesTrader, run_backtest
+from trader.core.model import Balance, SymbolInfo
+from trader.core.strategy import Strategy
+
+
+class BuyAndHoldStrategy(Strategy):
+
+    def on_candle(self, candles):
+        if self.trader.get_position("BTCUSDT") is None and not self.trader.positions:
+            self.trader.create_position("BTCUSDT", quantity=5)
+
+
+def _strategy(abort_rules: AbortRules) -> BuyAndHoldStrategy:
+    trader = BacktestFuturesTrader(
+        symbol_info=SymbolInfo("BTCUSDT", quantity_precision=3, price_precision=2),
+        interval="1m",
+        balance=Balance("USDT", total=1000, available=1000),
+        abort_rules=abort_rules,
+    )
+    return BuyAndHoldStrategy(trader)
+
+
+def test_drawdown_of_an_open_position_aborts(make_candles):
+    # 5 BTC bought at 100, the equity falls by 5 per 1 dollar drop.
+    candles = make_candles(100 - np.arange(80.0), spread=0.0)
+    strategy = _strategy(AbortRules(max_drawdown=0.2))
+
+    run_backtest(candles, strategy, show_progress=False)
+
+    assert strategy.trader.aborted
+    assert "Drawdown" in strategy.trader.abort_reason
+    assert strategy.trader.position is not None
+    assert 0.2 < 1 - strategy.trader.equity / 1000 < 0.21
+
+
+def test_min_equity_counts_unrealized_losses(make_candles):
+    candles = make_candles(100 - np.arange(80.0), spread=0.0)
+    strategy = _strategy(AbortRules(min_equity=900))
+
+    run_backtest(candles, strategy, show_progress=False)
+
+    assert "fell below 900" in strategy.trader.abort_reason
+    assert not strategy.trader.positions
+
+
+def test_shared_rules_do_not_leak_between_runs(make_candles):
+    rules = AbortRules(max_drawdown=0.2)
+    falling = _strategy(rules)
+    run_backtest(make_candles(100 - np.arange(80.0), spread=0.0), falling, show_progress=False)
+
+    rising = _strategy(rules)
+    run_backtest(make_candles(100 + np.arange(80.0), spread=0.0), rising, show_progress=False)
+
+    assert falling.trader.aborted
+    assert not rising.trader.aborted
+    assert rising.trader.abort_state.peak_equity > falling.trader.abort_state.peak_equity
+
+
+def test_wall_clock_budget_starts_with_the_run(make_candles):
+    strategy = _strategy(AbortRules(max_seconds=0.05))
+    time.sleep(0.1)
+
+    run_backtest(make_candles(100 + np.arange(10.0)), strategy, show_progress=False)
+    assert not strategy.trader.aborted
+
+    strategy.trader.abort_state.deadline = time.monotonic() - 1
+    run_backtest(make_candles(100 + np.arange(20.0)), strategy, show_progress=False, start=10)
+    assert "Wall-clock" in strategy.trader.abort_reason
@@ -0,0 +1,143 @@
+import threading
+
+import pytest
+
+from trader.live.binance import BinanceFuturesTrader
+from trader.live.binance.account_state import AccountState
+from trader.live.binance.simulator import SimulatedWebsocketManager
+
+
+@pytest.fixture
+def trader(simulator):
+    trader = BinanceFuturesTrader(simulator.client())
+    trader.start_user_data_stream(SimulatedWebsocketManager(simulator.exchange))
+    return trader
+
+
+def _requests(simulator, trader, action):
+    before = simulator.requests
+    action(trader)
+    return simulator.requests - before
+
+
+def test_reads_are_local_after_seed(simulator, trader):
+    assert _requests(simulator, trader, lambda t: (t.get_position("BTCUSDT"), t.get_open_orders("BTCUSDT"))) == 0
+    assert trader.get_position("BTCUSDT") is None
+    assert trader.get_leverage("BTCUSDT") == 1
+
+
+def test_fill_updates_position_and_balance(simulator, trader):
+    trader.create_position("BTCUSDT", quantity=1, take_profit_price=200, stop_loss_price=50)
+    assert len(trader.get_open_orders("BTCUSDT")) == 3
+
+    simulator.advance()
+
+    position = trader.get_position("BTCUSDT")
+    assert position.quantity == 1
+    assert position.entry_price == float(simulator.exchange.candles["BTCUSDT"][5][4])
+    assert {order.type for order in trader.get_open_orders("BTCUSDT")} == {"STOP_MARKET", "TAKE_PROFIT_MARKET"}
+
+    balance = trader.get_balance("USDT")
+    assert balance.total == simulator.exchange.balance.total
+    assert balance.available == simulator.exchange.balance.available < balance.total
+
+
+def test_available_balance_is_queried_once_per_update(simulator, trader):
+    trader.create_position("ETHUSDT", quantity=1)
+    simulator.advance()
+
+    assert _requests(simulator, trader, lambda t: t.get_balances()) == 1
+    assert _requests(simulator, trader, lambda t: t.get_balances()) == 0
+
+
+def test_hedge_mode_keeps_both_position_sides():
+    state = AccountState()
+    state.seeded = True
+    state.apply({"e": "ACCOUNT_UPDATE", "E": 1, "a": {"m": "ORDER", "B": [], "P": [
+        {"s": "BTCUSDT", "pa": "2", "ep": "100", "up": "0", "ps": "LONG"},
+        {"s": "BTCUSDT", "pa": "-1", "ep": "110", "up": "0", "ps": "SHORT"},
+    ]}})
+
+    assert state.get_position("BTCUSDT", "LONG").quantity == 2
+    assert state.get_position("BTCUSDT", "SHORT").quantity == -1
+    assert len(state.get_positions()) == 2
+
+    state.apply_mark_price({"e": "markPriceUpdate", "s": "BTCUSDT", "p": "105"})
+    assert state.unrealized_profit("BTCUSDT", "LONG") == 10
+    assert state.unrealized_profit("BTCUSDT", "SHORT") == 5
+    assert sorted(state.risk_snapshot().position_sides) == ["LONG", "SHORT"]
+
+    state.apply({"e": "ACCOUNT_UPDATE", "E": 2, "a": {"m": "ORDER", "B": [], "P": [
+        {"s": "BTCUSDT", "pa": "0", "ep": "0", "up": "0", "ps": "SHORT"},
+    ]}})
+    assert state.get_position("BTCUSDT", "SHORT") is None
+    assert state.get_position("BTCUSDT").position_side == "LONG"
+
+
+class SlowAccountClient:
+    """
+    Account endpoints whose snapshot misses the events streamed while it is being taken.
+    """
+
+    def __init__(self, state: AccountState, events):
+        self.state = state
+        self.events = events
+
+    def futures_account(self):
+        for event in self.events:
+            self.state.apply(event)
+        return {
+            "assets": [{"asset": "USDT", "walletBalance": "1000", "availableBalance": "1000"}],
+            "positions": [{
+                "symbol": "BTCUSDT", "positionAmt": "0", "entryPrice": "0", "unrealizedProfit": "0", "leverage": "5",
+            }],
+        }
+
+    def futures_get_open_orders(self):
+        return []
+
+    def futures_account_balance(self):
+        return [{"asset": "USDT", "availableBalance": "900"}]
+
+
+def _account_update(event_time: int, quantity: str, wallet_balance: str) -> dict:
+    return {"e": "ACCOUNT_UPDATE", "E": event_time, "a": {"m": "ORDER", "B": [
+        {"a": "USDT", "wb": wallet_balance, "cw": wallet_balance},
+    ], "P": [
+        {"s": "BTCUSDT", "pa": quantity, "ep": "100", "up": "0", "ps": "BOTH"},
+    ]}}
+
+
+def test_seed_replays_events_missed_by_the_snapshot():
+    # Event times from a server clock far behind the local one.
+    state = AccountState()
+    state.seed(SlowAccountClient(state, [_account_update(1, "1", "999"), _account_update(2, "2", "998")]))
+
+    assert state.get_position("BTCUSDT").quantity == 2
+    assert state.get_leverage("BTCUSDT") == 5
+    assert [(balance.total, balance.available) for balance in state.get_balances()] == [(998, 900)]
+
+
+def test_events_racing_the_seed_are_kept():
+    state = AccountState()
+    events = [_account_update(i, str(i), "1000") for i in range(1, 201)]
+    applier = threading.Thread(target=lambda: [state.apply(event) for event in events])
+
+    class RacingClient(SlowAccountClient):
+
+        def futures_account(self):
+            applier.start()
+            return super().futures_account()
+
+    state.seed(RacingClient(state, []))
+    applier.join()
+
+    assert state.get_position("BTCUSDT").quantity == 200
+
+
+def test_reads_are_copies():
+    state = AccountState()
+    state.seed(SlowAccountClient(state, []))
+
+    state.get_balances()[0].total = 0
+    assert state.get_balances()[0].total == 1000
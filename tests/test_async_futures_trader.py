@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+from binance import AsyncClient
+
+from trader.core.model import Order
+from trader.live.binance import AsyncBinanceFuturesTrader, BinanceFuturesTrader, OrderResult, SymbolInfoCache
+from trader.live.binance.simulator import SimulatedExchange, SimulatorServer
+
+SYMBOLS = [f"S{i:02d}USDT" for i in range(40)]
+
+# Response latency of the mock exchange, in seconds.
+LATENCY = 0.01
+
+
+@pytest.fixture
+def server(make_candles):
+    exchange = SimulatedExchange(
+        {symbol: make_candles(100 + np.arange(10.0)) for symbol in SYMBOLS},
+        interval="1m",
+        balance=1_000_000.0,
+        start=5,
+    )
+    server = SimulatorServer(exchange, latency=LATENCY, weight_limit=100_000, order_limit_10s=10_000)
+    server.start()
+    yield server
+    server.stop()
+
+
+async def _async_trader(server) -> AsyncBinanceFuturesTrader:
+    client = AsyncClient("simulator", "simulator")
+    client.FUTURES_URL = f"{server.url}/fapi"
+    trader = AsyncBinanceFuturesTrader(client)
+    await trader.get_all_symbol_info()
+    return trader
+
+
+def _rebalance(symbol: str) -> dict:
+    return dict(symbol=symbol, quantity=1, take_profit_price=200, stop_loss_price=50)
+
+
+def test_async_positions_do_not_call_the_client(server):
+    async def run():
+        async with await _async_trader(server) as trader:
+            await trader.create_positions([_rebalance(symbol) for symbol in SYMBOLS[:2]])
+            server.advance()
+
+            position = await trader.get_position(SYMBOLS[0])
+            requests = server.requests
+            profit = position.profit()
+            assert server.requests == requests
+            assert await position.current_profit() == profit
+            return profit
+
+    assert asyncio.run(run()) == pytest.approx(0.0)
+
+
+def test_rebalance_benchmark(server):
+    """
+    40-symbol rebalance (entry, take profit and stop loss per symbol) against the mock exchange,
+    sequential on BinanceFuturesTrader vs concurrent on AsyncBinanceFuturesTrader.
+    """
+
+    sync_trader = BinanceFuturesTrader(server.client())
+    sync_trader.get_all_symbol_info()
+    start = time.perf_counter()
+    for symbol in SYMBOLS:
+        sync_trader.create_position(**_rebalance(symbol))
+    sync_seconds = time.perf_counter() - start
+
+    async def run():
+        async with await _async_trader(server) as trader:
+            start = time.perf_counter()
+            results = await trader.create_positions([_rebalance(symbol) for symbol in SYMBOLS])
+            return time.perf_counter() - start, results
+
+    async_seconds, results = asyncio.run(run())
+
+    assert all(len(orders) == 3 for orders in results)
+    # Sequential requests wait for at least 40 response latencies, concurrent ones for a few.
+    assert sync_seconds > len(SYMBOLS) * LATENCY
+    speedup = sync_seconds / async_seconds
+    assert speedup > 3, f"sync {sync_seconds * 1000:.0f} ms, async {async_seconds * 1000:.0f} ms"
+
+
+def test_cancel_orders_returns_order_results(server):
+    async def run():
+        async with await _async_trader(server) as trader:
+            orders = [
+                order
+                for orders in await trader.create_positions([_rebalance(symbol) for symbol in SYMBOLS[:3]])
+                for order in orders
+                if order.type != "MARKET"
+            ]
+            unknown = Order.limit(symbol=SYMBOLS[0], side="BUY", quantity=1, price=90)
+            unknown.order_id = 10 ** 9
+            return orders, unknown, await trader.cancel_orders(*orders, unknown)
+
+    orders, unknown, results = asyncio.run(run())
+
+    assert all(isinstance(result, OrderResult) for result in results)
+    assert [result.order for result in results] == orders + [unknown]
+    assert all(result.ok for result in results[:-1])
+    assert not results[-1].ok
+
+
+def test_symbol_info_cache_awaits_the_async_client(server):
+    async def run():
+        client = AsyncClient("simulator", "simulator")
+        client.FUTURES_URL = f"{server.url}/fapi"
+        async with AsyncBinanceFuturesTrader(client) as trader:
+            symbol_info, requests = await trader.get_symbol_info(SYMBOLS[1]), server.requests
+            assert await trader.get_symbol_info(SYMBOLS[2]) is trader.symbol_info_cache.lookup(SYMBOLS[2])
+            assert server.requests == requests
+
+            with pytest.raises(TypeError, match="AsyncSymbolInfoCache"):
+                SymbolInfoCache(client, background_refresh=False).get(SYMBOLS[1])
+            return symbol_info
+
+    assert asyncio.run(run()).symbol == SYMBOLS[1]
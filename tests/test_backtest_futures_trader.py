@@ -0,0 +1,54 @@
+import pytest
+
+from trader.backtest import BacktestFuturesTrader
+from trader.backtest.position import calculate_profit
+from trader.core.const.trade_actions import SELL
+from trader.core.model import Balance, SymbolInfo
+
+
+@pytest.fixture
+def trader():
+    return BacktestFuturesTrader(
+        symbol_info=SymbolInfo("BTCUSDT", quantity_precision=3, price_precision=2),
+        interval="1m",
+        balance=Balance("USDT", total=1000, available=1000),
+    )
+
+
+def _run(trader, candles, start=1):
+    for i in range(start, candles.shape[0] + 1):
+        trader(candles[:i])
+
+
+def test_market_short_opens_short_position(trader, make_candles):
+    candles = make_candles([100, 100, 90])
+    _run(trader, candles[:1])
+    trader.create_position("BTCUSDT", quantity=-1)
+    _run(trader, candles, start=2)
+
+    assert trader.position.side == SELL
+    assert sum(trader.position.quantities) == -1
+    assert calculate_profit(90, trader.position) == 10
+
+
+def test_limit_short_opens_short_position(trader, make_candles):
+    candles = make_candles([100, 100, 110])
+    _run(trader, candles[:1])
+    trader.create_position("BTCUSDT", quantity=-1, price=105)
+    _run(trader, candles, start=2)
+
+    assert trader.position.side == SELL
+    assert trader.position.entry_price == 105
+
+
+def test_take_profit_hit_clears_exit_orders(trader, make_candles):
+    candles = make_candles([100, 100, 120, 120])
+    _run(trader, candles[:1])
+    trader.create_position("BTCUSDT", quantity=1, take_profit_price=110, stop_loss_price=80)
+    _run(trader, candles, start=2)
+
+    assert trader.position is None
+    assert trader.positions[-1].prices[-1] == 110
+    assert trader.take_profit_order is None
+    assert trader.stop_order is None
+    assert trader.balance.total == 1010
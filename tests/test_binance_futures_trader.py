@@ -0,0 +1,106 @@
+from trader.core.model import Order
+from trader.live.binance import BinanceFuturesTrader
+from trader.live.binance.batch import chunk, map_batch_response
+
+
+def test_close_position_sends_a_quantized_reduce_only_order(simulator):
+    trader = BinanceFuturesTrader(simulator.client())
+    trader.create_position("BTCUSDT", quantity=0.1 + 0.2)
+    simulator.advance()
+    assert trader.get_position("BTCUSDT").quantity == 0.3
+
+    trader.close_position("BTCUSDT")
+    order = next(iter(simulator.exchange.orders.values()))
+    assert order.quantity == 0.3
+    assert order.reduce_only
+
+    simulator.advance()
+    assert trader.get_position("BTCUSDT") is None
+
+
+def _open_limit_orders(trader, symbols):
+    return [trader.create_order(Order.limit(symbol=symbol, side="BUY", quantity=1, price=50)) for symbol in symbols]
+
+
+def _unknown_order(symbol: str, order_id: int) -> Order:
+    order = Order.limit(symbol=symbol, side="BUY", quantity=1, price=50)
+    order.order_id = order_id
+    return order
+
+
+def test_cancel_orders_batches_per_symbol(simulator):
+    trader = BinanceFuturesTrader(simulator.client())
+    trader.get_all_symbol_info()
+    btc, eth = _open_limit_orders(trader, ["BTCUSDT", "ETHUSDT"])
+    # 11 BTCUSDT orders take 2 batches, 1 ETHUSDT order 1.
+    unknown = [_unknown_order("BTCUSDT", 10 ** 9 + i) for i in range(10)]
+
+    requests = simulator.requests
+    results = trader.cancel_orders(eth, *unknown[:5], btc, *unknown[5:])
+
+    assert simulator.requests - requests == 3
+    assert [result.order for result in results] == [eth, *unknown[:5], btc, *unknown[5:]]
+    assert [result.ok for result in results] == [True] + [False] * 5 + [True] + [False] * 5
+    assert results[0].order.status == "CANCELED"
+    assert results[1].error.startswith("-2011")
+    assert not simulator.exchange.orders
+
+
+def test_modify_orders_fails_invalid_orders_without_a_request(simulator):
+    trader = BinanceFuturesTrader(simulator.client())
+    trader.get_all_symbol_info()
+    btc, eth = _open_limit_orders(trader, ["BTCUSDT", "ETHUSDT"])
+    btc.price, eth.quantity = 60.123456, 2.5
+
+    market = Order.market(symbol="BTCUSDT", side="BUY", quantity=1)
+    market.order_id = 1
+    no_price = _unknown_order("BTCUSDT", 2)
+    no_price.price = None
+
+    requests = simulator.requests
+    results = trader.modify_orders(market, btc, no_price, eth, _unknown_order("BTCUSDT", 10 ** 9))
+
+    assert simulator.requests - requests == 1
+    assert [result.ok for result in results] == [False, True, False, True, False]
+    assert "LIMIT" in results[0].error and "price" in results[2].error
+    assert results[4].error.startswith("-2013")
+    assert simulator.exchange.orders[btc.order_id].price == 60.12
+    assert simulator.exchange.orders[eth.order_id].quantity == 2.5
+
+
+class _NoBatchModifyClient:
+    """
+    Client without the batch modify endpoint.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def __getattr__(self, name):
+        if name == "futures_v1_put_batch_orders":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+
+def test_modify_orders_falls_back_to_single_amends(simulator):
+    trader = BinanceFuturesTrader(_NoBatchModifyClient(simulator.client()))
+    trader.get_all_symbol_info()
+    btc, eth = _open_limit_orders(trader, ["BTCUSDT", "ETHUSDT"])
+    btc.price = eth.price = 45
+
+    requests = simulator.requests
+    results = trader.modify_orders(btc, eth)
+
+    assert simulator.requests - requests == 2
+    assert all(result.ok for result in results)
+    assert [order.price for order in simulator.exchange.orders.values()] == [45, 45]
+
+
+def test_map_batch_response_sets_ids_and_errors():
+    orders = [_unknown_order("BTCUSDT", None) for _ in range(2)]
+    results = map_batch_response(orders, [{"orderId": 7, "status": "NEW"}, {"code": -2022, "msg": "ReduceOnly"}])
+
+    assert orders[0].order_id == 7 and orders[0].status == "NEW"
+    assert results[0].ok and str(results[0]) == "7: OK"
+    assert results[1].error == "-2022: ReduceOnly"
+    assert list(chunk(list(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
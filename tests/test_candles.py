@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from trader.backtest import BacktestFuturesTrader
+from trader.core.const.candle_index import CLOSE_PRICE_INDEX, OPEN_TIME_INDEX
+from trader.core.model import Balance, Candles, SymbolInfo
+
+
+@pytest.fixture
+def array(make_candles):
+    # Millisecond open times with a fraction, which int64 epoch seconds would truncate.
+    return make_candles(100 + np.arange(10.0), interval_in_seconds=60_000, start=1_600_000_000_000.5)
+
+
+@pytest.fixture
+def candles(array):
+    return Candles.from_array(array)
+
+
+def test_round_trip_keeps_the_open_times(array, candles):
+    assert candles.columns[OPEN_TIME_INDEX].dtype == np.float64
+    assert candles.price_dtype == np.float32
+    assert np.array_equal(candles.to_array(), array)
+    assert np.array_equal(np.asarray(candles), array)
+    assert candles.nbytes == 28 * len(array)
+
+
+def test_integral_open_times_can_be_int64(make_candles):
+    array = make_candles(100 + np.arange(3.0))
+    candles = Candles.from_array(array, price_dtype=np.float64, time_dtype=np.int64)
+
+    assert candles.columns[OPEN_TIME_INDEX].dtype == np.int64
+    assert np.array_equal(candles.to_array(), array)
+
+
+def test_inexact_time_dtype_is_rejected(array):
+    with pytest.raises(ValueError):
+        Candles.from_array(array, time_dtype=np.int64)
+
+
+def test_slices_are_views(candles):
+    head = candles[:4]
+
+    assert isinstance(head, Candles) and len(head) == 4
+    assert all(np.shares_memory(part, column) for part, column in zip(head.columns, candles.columns))
+    assert np.array_equal(candles[2:8:3].to_array(), candles.to_array()[2:8:3])
+
+
+@pytest.mark.parametrize("key", [
+    np.arange(10) % 3 == 0,
+    np.array([7, 1, 1, -1]),
+    [0, 4],
+])
+def test_masks_and_index_arrays_select_candles(array, candles, key):
+    selected = candles[key]
+
+    assert isinstance(selected, Candles)
+    assert np.array_equal(selected.to_array(), array[key])
+
+
+def test_rows_and_columns_index_like_the_array(array, candles):
+    for row in (0, -1, np.int64(3)):
+        assert tuple(candles[row]) == tuple(array[row])
+    assert np.array_equal(candles[:, CLOSE_PRICE_INDEX], array[:, CLOSE_PRICE_INDEX])
+    assert np.array_equal(candles[candles[:, CLOSE_PRICE_INDEX] > 104, OPEN_TIME_INDEX], array[5:, OPEN_TIME_INDEX])
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_backtest_trader_keeps_the_open_times(array, candles, columnar):
+    trader = BacktestFuturesTrader(
+        symbol_info=SymbolInfo("BTCUSDT", quantity_precision=3, price_precision=2),
+        interval="1m",
+        balance=Balance("USDT", total=1000, available=1000),
+    )
+    data = candles if columnar else array
+    trader(data[:1])
+    trader.create_position("BTCUSDT", quantity=1)
+    trader(data[:2])
+
+    assert trader.position.times == [array[1, OPEN_TIME_INDEX]]
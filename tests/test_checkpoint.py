@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from trader.backtest import BacktestFuturesTrader, Checkpoint, run_backtest
+from trader.backtest.backtester import resume_backtest
+from trader.core.model import Balance, SymbolInfo
+from trader.core.strategy import Strategy
+
+
+class Bracket(Strategy):
+    """
+    Opens a long with a 2 % take profit and stop loss whenever it is flat.
+    """
+
+    def __init__(self, trader, candles):
+        super().__init__(trader)
+        self.candles = candles
+
+    def on_candle(self, candles):
+        if self.trader.get_position("BTCUSDT") is None and self.trader.get_take_profit_order() is None:
+            close = candles[-1][4]
+            self.trader.create_position("BTCUSDT", 1, take_profit_price=close * 1.02, stop_loss_price=close * 0.98)
+
+
+@pytest.fixture
+def candles(make_candles):
+    rng = np.random.default_rng(1)
+    return make_candles(100 + np.cumsum(rng.normal(0, 1, 500)), interval_in_seconds=3600, spread=2.0)
+
+
+@pytest.fixture
+def intrabar_candles(make_candles, candles):
+    rng = np.random.default_rng(2)
+    return make_candles(
+        np.repeat(candles[:, 4], 60) + rng.normal(0, 1, 500 * 60),
+        start=candles[0, 0],
+        spread=0.5,
+    )
+
+
+def _strategy(candles, intrabar_candles):
+    trader = BacktestFuturesTrader(
+        symbol_info=SymbolInfo("BTCUSDT", quantity_precision=3, price_precision=2),
+        interval="1h",
+        balance=Balance("USDT", total=1000, available=1000),
+        intrabar_candles=intrabar_candles,
+    )
+    return Bracket(trader, candles)
+
+
+def test_snapshot_leaves_out_the_candles(tmp_path, candles, intrabar_candles):
+    checkpoint = Checkpoint(str(tmp_path / "run.ckpt"), every=100)
+    run_backtest(candles, _strategy(candles, intrabar_candles), show_progress=False, end=250, checkpoint=checkpoint)
+
+    assert (tmp_path / "run.ckpt").stat().st_size < intrabar_candles.nbytes / 100
+    with pytest.raises(ValueError, match="intrabar candles"):
+        checkpoint.load(candles)
+
+
+def test_resume_matches_an_uninterrupted_run(tmp_path, candles, intrabar_candles):
+    full = _strategy(candles, intrabar_candles)
+    run_backtest(candles, full, show_progress=False)
+
+    checkpoint = Checkpoint(str(tmp_path / "run.ckpt"), every=100)
+    run_backtest(candles, _strategy(candles, intrabar_candles), show_progress=False, end=250, checkpoint=checkpoint)
+    resumed = resume_backtest(candles, checkpoint, show_progress=False, intrabar_candles=intrabar_candles)
+
+    assert resumed.candles is candles
+    assert resumed.trader.intrabar_candles is intrabar_candles
+    assert len(resumed.trader.positions) == len(full.trader.positions) > 0
+    assert resumed.trader.balance.total == pytest.approx(full.trader.balance.total)
+
+
+class Remember(Bracket):
+    """
+    Keeps views of the candles it was fed, like strategies keeping their history.
+    """
+
+    def on_candle(self, candles):
+        super().on_candle(candles)
+        self.history = candles
+        self.closes = candles[::-1, 4]
+
+
+@pytest.mark.parametrize("price_dtype", [None, np.float32])
+def test_snapshot_leaves_out_views_of_the_candles(tmp_path, candles, price_dtype):
+    if price_dtype is not None:
+        from trader.core.model import Candles
+
+        candles = Candles.from_array(candles, price_dtype)
+
+    sizes = {}
+    for strategy_type in (Bracket, Remember):
+        checkpoint = Checkpoint(str(tmp_path / f"{strategy_type.__name__}.ckpt"), every=400)
+        strategy = strategy_type(_strategy(None, None).trader, None)
+        run_backtest(candles, strategy, show_progress=False, end=450, checkpoint=checkpoint)
+        sizes[strategy_type] = (tmp_path / f"{strategy_type.__name__}.ckpt").stat().st_size
+
+    # The views add their references, not their data.
+    assert sizes[Remember] - sizes[Bracket] < 500 < candles.nbytes / 10
+    with pytest.raises(ValueError, match="view of the candles"):
+        checkpoint.load()
+
+    strategy, cursor = checkpoint.load(candles)
+    assert cursor == 401 and len(strategy.history) == 400
+    np.testing.assert_array_equal(np.asarray(strategy.history), np.asarray(candles[:400]))
+    np.testing.assert_array_equal(strategy.closes, np.asarray(candles[:400, 4])[::-1])
+    assert np.shares_memory(strategy.closes, candles.columns[4] if price_dtype else candles)
@@ -0,0 +1,48 @@
+import numpy as np
+
+from trader.backtest import BacktestFuturesTrader
+from trader.backtest.hyperparameter_optimizer import EvolutionaryOptimizer
+from trader.core.model import Balance, SymbolInfo
+from trader.core.strategy import Strategy
+
+
+class HoldStrategy(Strategy):
+
+    def __init__(self, trader, entry: int, hold: int):
+        super().__init__(trader)
+        self.entry = entry
+        self.hold = hold
+
+    def on_candle(self, candles):
+        if len(candles) == self.entry:
+            self.trader.create_position("BTCUSDT", quantity=1)
+        elif len(candles) == self.entry + self.hold:
+            self.trader.close_position("BTCUSDT")
+
+
+def hold_strategy(candles, params, indicators):
+    trader = BacktestFuturesTrader(
+        symbol_info=SymbolInfo("BTCUSDT", quantity_precision=3, price_precision=2),
+        interval="1m",
+        balance=Balance("USDT", total=1000, available=1000),
+    )
+    return HoldStrategy(trader, **params)
+
+
+def test_finds_the_best_of_a_rising_market(make_candles):
+    candles = make_candles(100 + np.arange(60.0))
+    optimizer = EvolutionaryOptimizer(
+        candles,
+        hold_strategy,
+        space=dict(entry=range(1, 11), hold=range(1, 41, 2)),
+        population_size=8,
+        max_workers=1,
+        seed=3,
+    )
+
+    assert optimizer.grid_size == 200
+    best = optimizer.run(n_trials=80)
+
+    assert 0 < len(optimizer.trials) <= 80
+    assert best.score == max(trial.score for trial in optimizer.trials) > 1000
+    assert best.params["hold"] >= 30
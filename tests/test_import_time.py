@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("numba", "binance", "aiohttp", "pandas", "plotly", "tqdm", "yaml", "crypto_data")
+
+# Generous budgets (about ten times the measured times), they catch import-time work, not noise.
+OWN_IMPORT_BUDGET_US = 100_000
+IMPORT_TRADER_BUDGET_US = 10_000
+
+STATEMENTS = [
+    "import trader",
+    "from trader.backtest import BacktestFuturesTrader",
+    "from trader.live.binance import PortfolioRisk",
+    "from trader.live.binance.simulator import SimulatedExchange",
+]
+
+
+def import_times(statement: str) -> Dict[str, tuple]:
+    """
+    :return: (self, cumulative) import time in microseconds of every module imported by statement
+             in a new interpreter (from python -X importtime).
+    """
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def imported_modules(statement: str) -> set:
+    """
+    :return: Top-level packages imported by statement in a new interpreter.
+    """
+
+    return {module.split(".")[0] for module in import_times(statement)}
+
+
+@pytest.mark.parametrize("statement", STATEMENTS)
+def test_heavy_dependencies_are_not_imported(statement):
+    modules = imported_modules(statement)
+
+    assert "trader" in modules
+    assert not modules & set(HEAVY_MODULES)
+
+
+def test_import_trader_imports_no_dependencies():
+    assert "numpy" not in imported_modules("import trader")
+
+
+@pytest.mark.parametrize("statement", STATEMENTS)
+def test_own_modules_import_quickly(statement):
+    times = import_times(statement)
+    own_us = sum(self_us for module, (self_us, _) in times.items() if module.split(".")[0] == "trader")
+
+    assert own_us < OWN_IMPORT_BUDGET_US, f"trader modules took {own_us / 1000:.1f}ms to import"
+
+
+def test_import_trader_is_fast():
+    _, cumulative_us = import_times("import trader")["trader"]
+
+    assert cumulative_us < IMPORT_TRADER_BUDGET_US, f"import trader took {cumulative_us / 1000:.1f}ms"
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from trader.core.util import jit
+
+numba = pytest.importorskip("numba")
+
+
+def _double(x):
+    return 2 * x
+
+
+@pytest.fixture
+def restore_cache_dir(monkeypatch):
+    monkeypatch.setattr(jit, "_cache_dir", jit.get_cache_dir())
+    monkeypatch.setattr(numba.config, "CACHE_DIR", numba.config.CACHE_DIR)
+    monkeypatch.delenv(jit.CACHE_DIR_ENV, raising=False)
+
+
+def test_cache_dir_is_applied_to_numba_and_the_environment(tmp_path, restore_cache_dir):
+    jit.set_cache_dir(str(tmp_path))
+
+    assert jit.get_cache_dir() == str(tmp_path)
+    assert os.environ[jit.CACHE_DIR_ENV] == str(tmp_path)
+
+    compiled = jit.Kernel(_double, (), {"nopython": True})
+    assert compiled(21) == 42
+    assert numba.config.CACHE_DIR == str(tmp_path)
+    assert any(name.endswith(".nbi") for _, _, files in os.walk(tmp_path) for name in files)
+
+
+def test_cache_dir_reset(tmp_path, restore_cache_dir):
+    jit.set_cache_dir(str(tmp_path))
+    jit.set_cache_dir(None)
+
+    assert jit.get_cache_dir() is None
+    assert jit.CACHE_DIR_ENV not in os.environ
@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+
+from trader.core.const.candle_index import OPEN_TIME_INDEX
+from trader.live.binance.kline_stream import KlineStream
+from trader.live.binance.simulator import SimulatedExchange, SimulatedWebsocketManager
+
+
+class ClosingClient:
+    """
+    Serves klines from the exchange and closes a candle during the first request, like a slow warm-up.
+    """
+
+    def __init__(self, exchange: SimulatedExchange):
+        self.exchange = exchange
+        self.requests = 0
+
+    def futures_klines(self, **params):
+        self.requests += 1
+        if self.requests == 1:
+            self.exchange.advance()
+        return self.exchange.klines(**params)
+
+
+def _exchange(make_candles) -> SimulatedExchange:
+    # Five closed candles, the sixth one is open now.
+    start = time.time() // 60 * 60 - 5 * 60
+    candles = make_candles(100 + np.arange(10.0), start=start)
+    return SimulatedExchange({"BTCUSDT": candles}, interval="1m", start=5)
+
+
+def test_candle_closed_during_warm_up_is_replayed_in_order(make_candles):
+    exchange = _exchange(make_candles)
+    stream = KlineStream(ClosingClient(exchange), ["BTCUSDT"], "1m", capacity=100)
+    closes = []
+    stream.add_callback(lambda symbol, candles: closes.append(candles[-1][OPEN_TIME_INDEX]))
+
+    stream.start(SimulatedWebsocketManager(exchange))
+
+    open_times = stream.candles("BTCUSDT")[:, OPEN_TIME_INDEX]
+    expected = exchange.candles["BTCUSDT"][:6, OPEN_TIME_INDEX]
+    assert np.array_equal(open_times, expected)
+    assert closes == [expected[-1]]
+
+    exchange.advance()
+    assert stream.candles("BTCUSDT")[-1][OPEN_TIME_INDEX] == exchange.candles["BTCUSDT"][6][OPEN_TIME_INDEX]
+    assert len(closes) == 2
+
+
+def test_start_without_warm_up_streams_directly(make_candles):
+    exchange = _exchange(make_candles)
+    stream = KlineStream(ClosingClient(exchange), ["BTCUSDT"], "1m", capacity=100)
+
+    stream.start(SimulatedWebsocketManager(exchange), warm_up=False)
+    exchange.advance()
+
+    assert len(stream.candles("BTCUSDT")) == 1
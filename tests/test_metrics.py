@@ -0,0 +1,58 @@
+import math
+import random
+
+import pytest
+
+from trader.live.binance.metrics import _BUCKETS, LatencyHistogram, RequestMetrics, _bucket, _bucket_bounds
+
+
+def test_buckets_hold_their_values():
+    previous = 0
+    for microseconds in range(200_000):
+        bucket = _bucket(microseconds)
+        lower, upper = _bucket_bounds(bucket)
+        assert lower <= microseconds < upper
+        assert bucket in (previous, previous + 1)
+        # Exact up to 8 us, then at most a quarter of the lower bound wide.
+        assert upper - lower <= max(1, lower // 4)
+        previous = bucket
+
+
+def test_huge_latencies_go_to_the_last_bucket():
+    assert _bucket(1 << 60) == _BUCKETS - 1
+
+    histogram = LatencyHistogram()
+    histogram.add(1 << 60)
+    assert histogram.percentile(50) == (1 << 60) / 1000
+
+
+@pytest.mark.parametrize("percent", [1, 50, 90, 99, 100])
+def test_percentile_bounds_the_exact_percentile(percent):
+    rng = random.Random(percent)
+    latencies = [int(rng.lognormvariate(8, 1.5)) for _ in range(5000)]
+    histogram = LatencyHistogram()
+    for microseconds in latencies:
+        histogram.add(microseconds)
+
+    exact = sorted(latencies)[max(math.ceil(percent / 100 * len(latencies)) - 1, 0)]
+    estimate = histogram.percentile(percent) * 1000
+    assert exact <= estimate <= max(exact + 1, exact * 1.25)
+    assert histogram.total == len(latencies)
+    assert histogram.max == max(latencies)
+
+
+def test_record_updates_the_endpoint():
+    metrics = RequestMetrics()
+    metrics.record("futures_create_order", weight=1, wait_ns=2_000_000, latency_ns=3_456_789, error=False, rate_limited=False)
+    metrics.record("futures_create_order", weight=1, wait_ns=0, latency_ns=5_000, error=True, rate_limited=True)
+
+    summary = metrics.snapshot()["futures_create_order"]
+    assert summary["calls"] == 2
+    assert summary["weight"] == 2
+    assert summary["error_rate"] == 0.5
+    assert summary["rate_limited"] == 1
+    assert summary["mean_wait_ms"] == 1.0
+    assert summary["max_ms"] == 3.456
+    lower, upper = _bucket_bounds(_bucket(5))
+    assert summary["p50_ms"] == upper / 1000
+    assert summary["p99_ms"] == 3.456
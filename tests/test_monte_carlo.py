@@ -0,0 +1,82 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from trader.backtest.monte_carlo import BOOTSTRAP, RESHUFFLE, SKIP, run_monte_carlo
+from trader.backtest.transform_positions import PROFIT_INDEX
+
+START_CASH = 100.0
+
+
+def _positions(profits):
+    positions = np.zeros((PROFIT_INDEX + 1, len(profits)))
+    positions[PROFIT_INDEX] = profits
+    return positions
+
+
+def _max_drawdown(profits, compounding=False):
+    equity, peak, drawdown = START_CASH, START_CASH, 0.0
+    for profit in profits:
+        equity = equity * (1 + profit) if compounding else equity + profit
+        peak = max(peak, equity)
+        drawdown = max(drawdown, (peak - equity) / peak)
+    return drawdown
+
+
+def test_reshuffle_paths_are_permutations():
+    profits = [10.0, -30.0, 5.0, -20.0]
+    result = run_monte_carlo(_positions(profits), START_CASH, RESHUFFLE, paths=2000, max_workers=1, seed=1)
+
+    assert result.final_equity == pytest.approx(np.full(2000, START_CASH + sum(profits)))
+    expected = {round(_max_drawdown(order), 9) for order in itertools.permutations(profits)}
+    assert {round(drawdown, 9) for drawdown in result.max_drawdown.tolist()} == expected
+
+
+def test_compounding_reshuffle_ends_at_the_product_of_the_returns():
+    profits = [10.0, -30.0, 5.0, -20.0]
+    returns = [10 / 100, -30 / 110, 5 / 80, -20 / 85]
+    result = run_monte_carlo(
+        _positions(profits), START_CASH, RESHUFFLE, paths=500, compounding=True, max_workers=1, seed=2,
+    )
+
+    assert result.final_equity == pytest.approx(np.full(500, START_CASH + sum(profits)))
+    expected = {round(_max_drawdown(order, compounding=True), 9) for order in itertools.permutations(returns)}
+    assert {round(drawdown, 9) for drawdown in result.max_drawdown.tolist()} <= expected
+
+
+def test_bootstrap_mean_and_ruin():
+    # A path is ruined (equity down to 50) exactly when it drew the big loss: before it, it gained at most 6.
+    profits = np.array([1.0, -1.0, 2.0, -60.0])
+    result = run_monte_carlo(_positions(profits), START_CASH, BOOTSTRAP, paths=20_000, ruin_ratio=0.5, max_workers=1, seed=3)
+
+    standard_error = profits.std() * np.sqrt(len(profits) / result.paths)
+    assert result.final_equity.mean() == pytest.approx(START_CASH + len(profits) * profits.mean(), abs=5 * standard_error)
+    assert result.ruined.tolist() == (result.final_equity < 50.0).tolist()
+    assert result.ruin_probability == pytest.approx(1 - 0.75 ** 4, abs=5 * result.summary()["ruin_probability_error"])
+    assert np.all(result.max_drawdown[result.ruined] >= 0.5)
+
+
+def test_skip_keeps_the_order():
+    profits = [10.0, -5.0, 20.0]
+    result = run_monte_carlo(_positions(profits), START_CASH, SKIP, paths=4000, skip_ratio=0.5, max_workers=1, seed=4)
+
+    subsets = {
+        round(sum(kept), 9)
+        for mask in itertools.product([False, True], repeat=3)
+        for kept in [[profit for profit, keep in zip(profits, mask) if keep]]
+    }
+    assert {round(equity - START_CASH, 9) for equity in result.final_equity.tolist()} == subsets
+    assert result.summary()["profitable_ratio"] == pytest.approx(6 / 8, abs=0.03)
+
+
+def test_results_do_not_depend_on_the_workers(monkeypatch):
+    from trader.backtest import monte_carlo
+
+    monkeypatch.setattr(monte_carlo, "MAX_CHUNK_ELEMENTS", 400)
+    positions = _positions(np.linspace(-5, 6, 40))
+    single = run_monte_carlo(positions, START_CASH, RESHUFFLE, paths=100, max_workers=1, seed=5)
+    pooled = run_monte_carlo(positions, START_CASH, RESHUFFLE, paths=100, max_workers=2, seed=5)
+
+    assert np.array_equal(single.max_drawdown, pooled.max_drawdown)
+    assert np.array_equal(single.final_equity, pooled.final_equity)
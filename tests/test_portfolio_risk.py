@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+import pytest
+
+from trader.core.const.trade_actions import BUY, SELL
+from trader.core.util.trade import calculate_pnl
+from trader.live.binance.portfolio_risk import PortfolioRisk
+
+
+def test_snapshot_matches_calculate_pnl_per_position():
+    risk = PortfolioRisk(capacity=2)
+    positions = [("BTCUSDT", 2.0, 100.0, 110.0, 5), ("ETHUSDT", -3.0, 50.0, 45.0, 2), ("SOLUSDT", 1.5, 20.0, 18.0, 1)]
+    for symbol, quantity, entry_price, mark_price, leverage in positions:
+        risk.set_position(symbol, quantity, entry_price)
+        risk.set_leverage(symbol, leverage)
+        risk.set_mark_price(symbol, mark_price)
+    risk.set_position("XRPUSDT", 0.0, 0.0)
+
+    snapshot = risk.snapshot()
+    assert snapshot.symbols == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    for i, (symbol, quantity, entry_price, mark_price, leverage) in enumerate(positions):
+        side = BUY if quantity > 0 else SELL
+        margin, pnl, roe = calculate_pnl(entry_price, mark_price, abs(quantity), side, leverage)
+        assert snapshot.initial_margin[i] == pytest.approx(margin)
+        assert snapshot.unrealized_profit[i] == pytest.approx(pnl) == risk.unrealized_profit(symbol)
+        assert snapshot.roe[i] == pytest.approx(roe)
+
+    assert snapshot.total_unrealized_profit == pytest.approx(20 + 15 - 3)
+    # Long 5x: liquidated about 20% below the entry, short 2x: about 50% above.
+    assert snapshot.liquidation_price[0] == pytest.approx(100 * 0.8 / 0.996)
+    assert snapshot.liquidation_price[1] == pytest.approx(50 * 1.5 / 1.004)
+    assert snapshot.closest_to_liquidation == "BTCUSDT"
+
+
+def test_vectorized_calculate_pnl_rejects_unknown_sides():
+    with pytest.raises(ValueError):
+        calculate_pnl(np.ones(2), np.ones(2), np.ones(2), np.array([BUY, 7]))
+
+
+def test_mark_prices_survive_growth():
+    risk = PortfolioRisk(capacity=1)
+    symbols = [f"S{i}USDT" for i in range(100)]
+    for i, symbol in enumerate(symbols):
+        risk.set_mark_price(symbol, 10.0 + i)
+        risk.set_position(symbol, 1.0, 10.0)
+
+    assert risk.snapshot().mark_price.tolist() == [10.0 + i for i in range(len(symbols))]
+
+
+def test_set_mark_price_waits_for_reallocation():
+    risk = PortfolioRisk(capacity=1)
+    risk.set_position("BTCUSDT", 1.0, 100.0)
+
+    # Holding the lock stands in for another thread growing the arrays,
+    # a write to the old arrays during the copy would be lost.
+    with risk._lock:
+        writer = threading.Thread(target=risk.set_mark_price, args=("BTCUSDT", 110.0))
+        writer.start()
+        writer.join(0.1)
+        assert writer.is_alive()
+        risk._allocate(4)
+    writer.join()
+
+    assert risk.unrealized_profit("BTCUSDT") == pytest.approx(10.0)
+
+
+def test_hedge_sides_share_the_mark_price():
+    risk = PortfolioRisk()
+    risk.set_position("BTCUSDT", 1.0, 100.0, position_side="LONG")
+    risk.set_position("BTCUSDT", -2.0, 120.0, position_side="SHORT")
+    risk.set_mark_price("BTCUSDT", 110.0)
+
+    assert risk.unrealized_profit("BTCUSDT", "LONG") == pytest.approx(10.0)
+    assert risk.unrealized_profit("BTCUSDT", "SHORT") == pytest.approx(20.0)
+    assert risk.snapshot().total_unrealized_profit == pytest.approx(30.0)
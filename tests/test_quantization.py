@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+from trader.core.const.trade_actions import BUY, SELL
+from trader.core.util.quantization import Quantizer
+
+
+@pytest.fixture
+def quantizer():
+    return Quantizer(tick_size="0.10", step_size="0.001", min_quantity="0.001", max_quantity="1000", min_notional=5)
+
+
+def test_float_noise_does_not_drop_a_tick(quantizer):
+    assert quantizer.prices(0.1 + 0.2) == pytest.approx(0.3)
+    assert quantizer.format_price(0.1 + 0.2) == "0.3"
+    assert quantizer.format_quantity(0.3 / 0.1 * 0.001) == "0.003"
+
+
+def test_rounding_modes(quantizer):
+    assert quantizer.format_price(100.19) == "100.1"
+    assert quantizer.format_price(100.11, mode="ceil") == "100.2"
+    assert quantizer.format_price(100.16, mode="round") == "100.2"
+    assert quantizer.quantities(-1.23456) == pytest.approx(-1.234)
+    assert quantizer.format_quantities(np.array([0.0015, 2.0])) == ["0.001", "2.000"]
+
+
+@pytest.mark.parametrize("max_price", ["0", 0, None])
+def test_disabled_maximum_is_no_limit(max_price):
+    quantizer = Quantizer(tick_size="0.01", step_size="1", max_price=max_price, max_quantity="0")
+
+    assert quantizer.max_price == quantizer.max_quantity == math.inf
+    quantizer.check(123456.0, 10.0)
+
+
+def test_filters(quantizer):
+    assert quantizer.valid([10.0, 1.0], [1.0, 1.0]).tolist() == [True, False]
+    with pytest.raises(ValueError, match="Notional"):
+        quantizer.check(1.0, 1.0)
+
+
+def test_ladder_does_not_cross_its_levels(quantizer):
+    buy_prices, _, _ = quantizer.ladder(BUY, 100.05, 99.05, 3, 3.0)
+    sell_prices, quantities, valid = quantizer.ladder(SELL, 100.05, 101.05, 3, 3.0)
+
+    assert buy_prices.tolist() == pytest.approx([100.0, 99.5, 99.0])
+    assert sell_prices.tolist() == pytest.approx([100.1, 100.6, 101.1])
+    assert quantities.tolist() == [1.0, 1.0, 1.0]
+    assert valid.all()
@@ -0,0 +1,67 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from trader.live.binance.rate_limit import RequestScheduler, ScheduledClient
+
+
+def test_headers_are_read_from_the_call_response(simulator):
+    client = simulator.client()
+    scheduler = RequestScheduler()
+    ScheduledClient(client, scheduler)
+
+    def racing(**kwargs):
+        result = client.futures_time(**kwargs)
+        # Another thread's response, stored on the shared client after this call's one.
+        client.response = SimpleNamespace(headers={"X-MBX-USED-WEIGHT-1M": "2000"})
+        return result
+
+    client.futures_time()
+    simulator.weight.used = 100
+    scheduler.call(client, "futures_time", racing)
+
+    assert scheduler.weight.used == 101
+
+
+def test_coalesced_reads_get_copies(simulator):
+    simulator.latency = 0.2
+    client = ScheduledClient(simulator.client(), RequestScheduler())
+    first = {}
+    reader = threading.Thread(target=lambda: first.update(result=client.futures_account()))
+    reader.start()
+    threading.Event().wait(0.05)
+    second = client.futures_account()
+    reader.join()
+
+    assert client.scheduler.coalesced == 1
+    assert second == first["result"]
+    assert second is not first["result"]
+    assert second["positions"][0] is not first["result"]["positions"][0]
+
+
+def test_load_stays_under_the_limits(simulator):
+    """
+    24 threads sending orders and state queries at once through one scheduler keep under the server's limits.
+    """
+
+    simulator.latency = 0.005
+    simulator.weight.limit = 400
+    simulator.orders_10s.limit = 120
+    scheduler = RequestScheduler(weight_limit=400, order_limit_10s=120, max_in_flight=8)
+    client = ScheduledClient(simulator.client(), scheduler)
+
+    def trade(i: int):
+        symbol = ("BTCUSDT", "ETHUSDT")[i % 2]
+        client.futures_create_order(symbol=symbol, side="BUY", type="LIMIT", quantity="0.01", price="10")
+        client.futures_account()
+        client.futures_get_open_orders(symbol=symbol)
+        client.futures_position_information(symbol=symbol)
+
+    with ThreadPoolExecutor(max_workers=24) as executor:
+        list(executor.map(trade, range(24)))
+
+    assert simulator.rejected == 0
+    assert scheduler.orders_10s.used >= simulator.orders_10s.used
+    assert scheduler.weight.used >= simulator.weight.used
+    assert scheduler.coalesced > 0
+    assert not any(endpoint["rate_limited"] for endpoint in scheduler.metrics.snapshot().values())
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from trader.core.model import Candles
+from trader.core.util.resample import Resampler
+
+
+def _naive(rows, interval_in_seconds, base_in_seconds, origin=0):
+    """
+    :return: Higher candles, higher candle index, last closed index and in-progress candle of every base candle,
+             computed candle by candle.
+    """
+
+    higher, index = [], []
+    for open_time, open_price, high, low, close, volume in rows:
+        open_time = int(open_time)
+        start = (open_time - origin) // interval_in_seconds * interval_in_seconds + origin
+        if not higher or higher[-1][0] != start:
+            higher.append([start, open_price, high, low, close, volume])
+        else:
+            candle = higher[-1]
+            candle[2], candle[3] = max(candle[2], high), min(candle[3], low)
+            candle[4] = close
+            candle[5] += volume
+        index.append(len(higher) - 1)
+
+    last_closed, in_progress = [], []
+    for i, row in enumerate(rows):
+        close_time = int(row[0]) + base_in_seconds
+        closed = [j for j, candle in enumerate(higher) if candle[0] + interval_in_seconds <= close_time]
+        last_closed.append(closed[-1] if closed else -1)
+
+        if higher[index[i]][0] + interval_in_seconds <= close_time:
+            in_progress.append(None)
+        else:
+            group = [other for j, other in enumerate(rows[:i + 1]) if index[j] == index[i]]
+            in_progress.append((
+                higher[index[i]][0],
+                group[0][1],
+                max(other[2] for other in group),
+                min(other[3] for other in group),
+                group[-1][4],
+                sum(other[5] for other in group),
+            ))
+    return higher, index, last_closed, in_progress
+
+
+def _random_candles(make_candles, size, interval_in_seconds, start, drop=()):
+    rng = np.random.default_rng(size)
+    candles = make_candles(100 + rng.normal(size=size).cumsum(), interval_in_seconds=interval_in_seconds, start=start)
+    candles[:, 5] = rng.integers(1, 100, size=size)
+    return np.delete(candles, list(drop), axis=0)
+
+
+CASES = [
+    # Minutes into 5 minutes, with missing candles and a partial last bar.
+    dict(size=53, base="1m", interval="5m", base_in_seconds=60, start=1_600_000_020 // 60 * 60, drop=(3, 4, 11, 30, 31, 32)),
+    # Days into Monday-aligned weeks, starting mid-week.
+    dict(size=40, base="1d", interval="1w", base_in_seconds=86400, start=1_600_000_000 // 86400 * 86400, drop=(9,)),
+]
+
+
+@pytest.mark.parametrize("case", CASES)
+@pytest.mark.parametrize("columnar", [False, True])
+def test_resampler_matches_a_naive_reference(make_candles, case, columnar):
+    array = _random_candles(make_candles, case["size"], case["base_in_seconds"], case["start"], case["drop"])
+    candles = Candles.from_array(array, price_dtype=np.float64) if columnar else array
+    resampler = Resampler(candles, case["interval"], base_interval=case["base"])
+
+    interval_in_seconds = resampler.interval_in_seconds
+    origin = 4 * 86400 if case["interval"] == "1w" else 0
+    higher, index, last_closed, in_progress = _naive(array.tolist(), interval_in_seconds, case["base_in_seconds"], origin)
+
+    assert np.asarray(resampler.candles).tolist() == higher
+    assert resampler.index.tolist() == index
+    assert resampler.last_closed_index.tolist() == last_closed
+    assert resampler.closed.tolist() == [value is None for value in in_progress]
+    for i in range(len(array)):
+        assert len(resampler.closed_candles(i)) == last_closed[i] + 1
+        expected_last = None if last_closed[i] < 0 else tuple(higher[last_closed[i]])
+        assert resampler.last_closed(i) == pytest.approx(expected_last)
+        assert resampler.in_progress(i) == pytest.approx(in_progress[i])
+
+    if case["interval"] == "1w":
+        weekdays = (np.asarray(resampler.candles)[:, 0] // 86400 + 3) % 7
+        assert not weekdays.any(), "weeks must open on Monday"
+
+
+def test_running_high_low_restarts_at_every_group():
+    from trader.core.util.resample import running_high_low
+
+    high = np.array([1.0, 3.0, 2.0, 5.0, 4.0, 6.0])
+    low = np.array([0.5, 0.2, 0.4, 3.0, 1.0, 2.0])
+    group = np.array([0, 0, 0, 1, 1, 2], dtype=np.int64)
+
+    running_high, running_low = running_high_low(high, low, group)
+    assert running_high.tolist() == [1.0, 3.0, 3.0, 5.0, 5.0, 6.0]
+    assert running_low.tolist() == [0.5, 0.2, 0.2, 3.0, 1.0, 2.0]
+
+
+def test_float32_candles_keep_their_dtypes(make_candles):
+    array = _random_candles(make_candles, 20, 60, 1_600_000_020 // 60 * 60)
+    candles = Candles.from_array(array)
+    resampler = Resampler(candles, "5m")
+
+    assert resampler.candles.price_dtype == np.float32
+    assert resampler.candles.columns[0].dtype == candles.columns[0].dtype
+    assert resampler.in_progress(1)[2].dtype == np.float32
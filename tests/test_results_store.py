@@ -0,0 +1,75 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from trader.backtest import BacktestPosition, ResultsStore
+from trader.backtest.transform_positions import PROFIT_INDEX, positions_to_array
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultsStore(str(tmp_path / "results.db")) as store:
+        yield store
+
+
+def _position(entry_price: float, exit_price: float) -> BacktestPosition:
+    position = BacktestPosition("BTCUSDT", entry_time=0, entry_price=entry_price, entry_quantity=1, leverage=1)
+    position.close(time=60, price=exit_price)
+    return position
+
+
+def test_params_keep_their_type(store):
+    params = dict(flag=True, off=False, period=14, ratio=0.5, name="rsi", missing=None, levels=[30, 70])
+    run_id = store.add(params, dict(profit=1.5))
+
+    loaded = store.find()[0]
+    assert loaded.run_id == run_id
+    assert loaded.params == params
+    assert {key: type(value) for key, value in loaded.params.items()} == {
+        key: type(value) for key, value in params.items()
+    }
+
+
+def test_bool_and_int_params_are_filtered_apart(store):
+    store.add(dict(flag=True), dict(profit=1))
+    store.add(dict(flag=1), dict(profit=2))
+    store.add(dict(flag=np.bool_(False)), dict(profit=3))
+
+    assert [run.params["flag"] for run in store.find(flag=True)] == [True]
+    assert [run.params["flag"] for run in store.find(flag=1)] == [1]
+    assert [run.params["flag"] for run in store.find(flag=False)] == [False]
+
+
+def test_top_orders_by_metric(store):
+    for period in range(10):
+        store.add(dict(period=period, fast=period % 2 == 0), dict(profit=float(period)))
+
+    assert [run.params["period"] for run in store.top("profit", k=3)] == [9, 8, 7]
+    assert [run.params["period"] for run in store.top("profit", k=2, ascending=True, fast=True)] == [0, 2]
+
+
+def test_ledger_round_trip(store):
+    positions = [_position(100, 110), _position(110, 105)]
+    run_id = store.add(dict(period=1), dict(profit=5), positions=positions)
+
+    ledger = store.ledger(run_id)
+    np.testing.assert_array_equal(ledger, positions_to_array(positions))
+    assert ledger[PROFIT_INDEX].tolist() == [10, -5]
+    assert store.ledger(store.add(dict(period=2), dict(profit=0))) is None
+
+
+def test_opens_stores_without_the_kind_column(tmp_path):
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE runs (run_id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, created REAL NOT NULL, has_ledger INTEGER NOT NULL);
+        CREATE TABLE params (run_id INTEGER NOT NULL, name TEXT NOT NULL, value, PRIMARY KEY (run_id, name));
+        INSERT INTO runs (name, created, has_ledger) VALUES ('old', 0, 0);
+        INSERT INTO params VALUES (1, 'period', 14);
+    """)
+    connection.commit()
+    connection.close()
+
+    with ResultsStore(path) as store:
+        assert store.find(period=14)[0].params == dict(period=14)
@@ -0,0 +1,90 @@
+import pytest
+
+from trader.backtest import BacktestFuturesTrader
+from trader.backtest.run_cache import RunCache, describe
+from trader.core.model import Balance, SymbolInfo
+from trader.core.strategy import Strategy
+
+
+class FlipStrategy(Strategy):
+
+    def __init__(self, trader, hold=2):
+        super().__init__(trader)
+        self.hold = hold
+
+    def on_candle(self, candles):
+        if self.trader.get_position("BTCUSDT") is None:
+            self.trader.create_position("BTCUSDT", quantity=1)
+        elif len(candles) % self.hold == 0:
+            self.trader.close_position("BTCUSDT")
+
+
+def _strategy(hold=2):
+    trader = BacktestFuturesTrader(
+        symbol_info=SymbolInfo("BTCUSDT", quantity_precision=3, price_precision=2),
+        interval="1m",
+        balance=Balance("USDT", total=1000, available=1000),
+    )
+    return FlipStrategy(trader, hold)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RunCache(str(tmp_path))
+
+
+@pytest.fixture
+def candles(make_candles):
+    return make_candles([100, 101, 103, 102, 105, 104, 108, 107])
+
+
+def test_same_run_same_key(cache, candles):
+    assert cache.key(candles, _strategy()) == cache.key(candles, _strategy())
+    assert cache.key(candles, _strategy()) != cache.key(candles, _strategy(hold=3))
+
+
+def test_traded_state_changes_key(cache, candles):
+    fresh = _strategy()
+    key = cache.key(candles, fresh)
+
+    partial = _strategy()
+    cache.run(candles, partial, end=4, show_progress=False)
+    assert cache.key(candles, partial) != key
+
+    partial.trader.positions.clear()
+    partial.trader.position = None
+    assert cache.key(candles, partial) != key
+
+
+def test_hit_returns_stored_run(cache, candles):
+    first = cache.run(candles, _strategy(), show_progress=False)
+    second = cache.run(candles, _strategy(), show_progress=False)
+
+    assert second.balance.total == first.balance.total
+    assert len(second.positions) == len(first.positions) > 0
+
+
+def _nested(depth: int, leaf):
+    config = leaf
+    for _ in range(depth):
+        config = dict(inner=config)
+    return config
+
+
+def test_deep_configs_fall_back_to_a_digest(cache, candles):
+    key = cache.key(candles, FlipStrategy(_strategy().trader, _nested(12, 1)))
+    assert key == cache.key(candles, FlipStrategy(_strategy().trader, _nested(12, 1)))
+    assert key != cache.key(candles, FlipStrategy(_strategy().trader, _nested(12, 2)))
+
+
+def test_callables_are_described_by_name(cache, candles):
+    by_function = cache.key(candles, FlipStrategy(_strategy().trader, hold=_nested))
+    assert "0x" not in repr(describe(_nested))
+    assert by_function == cache.key(candles, FlipStrategy(_strategy().trader, hold=_nested))
+    assert by_function != cache.key(candles, FlipStrategy(_strategy().trader, hold=_strategy))
+
+    method = FlipStrategy(_strategy().trader).on_candle
+    assert describe(method) == describe(FlipStrategy(_strategy().trader).on_candle)
+
+    with pytest.raises(ValueError, match="can not be described"):
+        cache.key(candles, FlipStrategy(_strategy().trader, hold=lambda: 2))
@@ -0,0 +1,112 @@
+import threading
+
+import numpy as np
+import pytest
+
+from trader.core.strategy import Strategy
+from trader.live.runner import LiveRunner, ReplayFeed, SimulatedClock
+
+# Open time of the first candle, aligned to the minute like Binance candles.
+START = 26_666_667 * 60
+
+
+class RecordingTrader:
+
+    def __init__(self):
+        self.orders = []
+
+    def create_position(self, symbol, quantity):
+        self.orders.append((symbol, quantity))
+
+
+class EveryOtherCandle(Strategy):
+
+    def __init__(self, symbol):
+        super().__init__(RecordingTrader())
+        self.symbol = symbol
+        self.seen = []
+
+    def on_candle(self, candles):
+        self.seen.append(candles.shape[0])
+        if candles.shape[0] % 2 == 0:
+            self.trader.create_position(self.symbol, 1)
+
+
+@pytest.fixture
+def candles(make_candles):
+    return make_candles(100 + np.arange(10.0), start=START)
+
+
+def _runner(candles, symbols=("BTCUSDT", "ETHUSDT"), feed_candles=None, **kwargs):
+    strategies = {symbol: EveryOtherCandle(symbol) for symbol in symbols}
+    feed = ReplayFeed(feed_candles or {symbol: candles for symbol in symbols}, "1m")
+    # Three candles are closed at the start.
+    clock = SimulatedClock(START + 4 * 60 - 30)
+    return LiveRunner(strategies, feed, "1m", clock=clock, **kwargs), strategies
+
+
+def test_evaluates_every_symbol_on_each_close(candles):
+    runner, strategies = _runner(candles)
+    runner.run(closes=4)
+
+    for strategy in strategies.values():
+        assert strategy.seen == [4, 5, 6, 7]
+        assert strategy.trader.trader.orders == [(strategy.symbol, 1)] * 2
+    assert [decision.close_time for decision in list(runner.decisions)[::2]] == [START + i * 60 for i in range(4, 8)]
+    assert runner.latency_percentiles((50,)) == {50: 0.0}
+
+
+def test_keeps_only_the_latest_decisions(candles):
+    runner, _ = _runner(candles, max_decisions=3)
+    runner.run(closes=4)
+
+    assert [(decision.symbol, decision.close_time) for decision in runner.decisions] == [
+        ("ETHUSDT", START + 6 * 60), ("BTCUSDT", START + 7 * 60), ("ETHUSDT", START + 7 * 60),
+    ]
+    # Only the ETHUSDT decision on the close at 6 traded among the kept decisions.
+    assert [decision.order_latency for decision in runner.decisions] == [0.0, None, None]
+
+
+def test_close_restores_the_traders(candles):
+    runner, strategies = _runner(candles)
+    traders = {symbol: strategy.trader.trader for symbol, strategy in strategies.items()}
+
+    with runner:
+        runner.run(closes=1)
+
+    assert {symbol: strategy.trader for symbol, strategy in strategies.items()} == traders
+
+
+def test_missing_candle_is_skipped_after_the_timeout(candles):
+    runner, strategies = _runner(
+        candles,
+        feed_candles={"BTCUSDT": candles, "ETHUSDT": candles[:4]},
+        feed_timeout=1.0,
+        poll_interval=0.25,
+        max_workers=1,
+    )
+    runner.run(closes=2)
+
+    assert strategies["BTCUSDT"].seen == [4, 5]
+    assert strategies["ETHUSDT"].seen == [4]
+    skipped = runner.decisions[-1]
+    assert skipped.symbol == "ETHUSDT" and skipped.start_latency is None
+    # The skipped symbol waited for the whole timeout on the simulated clock.
+    assert runner.clock.time() == START + 5 * 60 + 1.0
+
+
+def test_simulated_clock_waits_from_many_threads():
+    clock = SimulatedClock()
+    stop = threading.Event()
+
+    def wait():
+        for _ in range(1000):
+            clock.wait(0.5, stop)
+
+    threads = [threading.Thread(target=wait) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert clock.time() == 8 * 1000 * 0.5
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from trader.live.binance.simulator import SimulatedExchange
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+def _exchange(make_candles, prices, events, leverage=1, balance=1000.0):
+    exchange = SimulatedExchange({"BTCUSDT": make_candles(prices)}, interval="1m", balance=balance, leverage=leverage)
+    exchange.user_subscribers.append(events.append)
+    return exchange
+
+
+def _account_updates(events):
+    return [event["a"] for event in events if event["e"] == "ACCOUNT_UPDATE"]
+
+
+def test_market_order_fills_at_next_close(make_candles, events):
+    exchange = _exchange(make_candles, [100, 100, 110, 110], events)
+    exchange.create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity="1")
+    exchange.advance()
+
+    position = exchange.position_risk("BTCUSDT")[0]
+    assert float(position["positionAmt"]) == 1.0
+    assert float(position["entryPrice"]) == 100.0
+    assert exchange.balance.available == 900.0
+
+
+def test_liquidation_charges_margin_and_fee(make_candles, events):
+    # At 10x, the 50 % drop of the next candle loses more than the wallet balance.
+    exchange = _exchange(make_candles, [100, 100, 50, 50], events, leverage=10, balance=100.0)
+    exchange.create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity="0.5")
+    exchange.advance()
+    exchange.advance()
+
+    margin, fee = 50.0, 50.0 * 10 * 0.001
+    assert exchange.traders["BTCUSDT"].position is None
+    assert exchange.balance.total == pytest.approx(100.0 - margin - fee)
+    assert exchange.balance.available == pytest.approx(exchange.balance.total)
+
+    update = _account_updates(events)[-1]
+    assert float(update["B"][0]["wb"]) == pytest.approx(100.0 - margin - fee)
+    assert update["P"][0]["pa"] == "0.0"
+
+
+def test_cross_wallet_balance_is_wallet_balance(make_candles, events):
+    exchange = _exchange(make_candles, [100, 100, 110, 110], events)
+    exchange.create_order(symbol="BTCUSDT", side="BUY", type="MARKET", quantity="1")
+    exchange.advance()
+
+    balance = _account_updates(events)[-1]["B"][0]
+    assert balance["cw"] == balance["wb"] == "1000.0"
+    assert np.isclose(exchange.balance.available, 900.0)
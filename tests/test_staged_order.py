@@ -0,0 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from trader.core.model import Order
+from trader.live.binance import BinanceFuturesTrader
+
+
+def test_staged_orders_are_sent_concurrently(simulator):
+    trader = BinanceFuturesTrader(simulator.client())
+    staged = [
+        trader.stager.stage(Order.limit(symbol="BTCUSDT", side="BUY", quantity=0.0101, price=100.019 - i))
+        for i in range(8)
+    ] + [trader.stage_position("ETHUSDT", quantity=-1, take_profit_price=40, stop_loss_price=60)]
+
+    with ThreadPoolExecutor(max_workers=len(staged)) as executor:
+        results = [result for results in executor.map(trader.stager.send, staged) for result in results]
+
+    assert all(result.order.order_id is not None for result in results)
+    assert len({result.order.order_id for result in results}) == len(results) == 11
+    assert {result.response["price"] for result in results[:8]} == {f"{100.01 - i:.2f}" for i in range(8)}
+    assert trader.scheduler.weight.used >= simulator.weight.used
@@ -0,0 +1,76 @@
+import numpy as np
+
+from trader.backtest import BacktestFuturesTrader, SuccessiveHalving
+from trader.core.model import Balance, SymbolInfo
+from trader.core.strategy import Strategy
+
+# Candles processed per candidate, counted in this process (max_workers=1).
+SEEN = {}
+
+
+class RoundTripStrategy(Strategy):
+    """
+    Opens a long every `every` candles and closes it on the next one.
+    """
+
+    def __init__(self, trader, every: int):
+        super().__init__(trader)
+        self.every = every
+
+    def on_candle(self, candles):
+        SEEN[self.every] = SEEN.get(self.every, 0) + 1
+        if len(candles) % self.every == 0:
+            self.trader.create_position("BTCUSDT", quantity=1)
+        elif self.trader.get_position("BTCUSDT") is not None:
+            self.trader.close_position("BTCUSDT")
+
+
+def round_trip_strategy(candles, params, indicators):
+    trader = BacktestFuturesTrader(
+        symbol_info=SymbolInfo("BTCUSDT", quantity_precision=3, price_precision=2),
+        interval="1m",
+        balance=Balance("USDT", total=1000, available=1000),
+    )
+    return RoundTripStrategy(trader, **params)
+
+
+def test_promotes_the_best_and_resumes_survivors(make_candles):
+    SEEN.clear()
+    candles = make_candles(100 + np.arange(64.0))
+    search = SuccessiveHalving(
+        candles,
+        round_trip_strategy,
+        candidates=[dict(every=every) for every in range(2, 10)],
+        keep_ratio=0.5,
+        max_workers=1,
+    )
+
+    assert len(search.rungs) == 4
+    assert search.rungs[-1] == len(candles)
+
+    best = search.run()
+    assert best.params == dict(every=2)
+
+    # The winner was resumed on every rung instead of starting over.
+    assert SEEN[2] == len(candles) - 1
+    assert [candidate.strategy is None for candidate in search.candidates] == [False] + [True] * 7
+
+    # Every rung ran only its survivors, on the candles added since the previous rung.
+    survivors_per_rung = [8, 4, 2, 1]
+    budget = sum(
+        survivors * (end - start)
+        for survivors, start, end in zip(survivors_per_rung, [1] + search.rungs[:-1], search.rungs)
+    )
+    assert sum(SEEN.values()) == budget < len(search.candidates) * (len(candles) - 1) / 2
+
+
+def test_ships_the_factory_to_worker_processes(make_candles):
+    candles = make_candles(100 + np.arange(32.0))
+    search = SuccessiveHalving(
+        candles,
+        round_trip_strategy,
+        candidates=[dict(every=every) for every in (2, 5)],
+        max_workers=2,
+    )
+
+    assert search.run().params == dict(every=2)
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from trader.live.binance import BinanceFuturesTrader
+from trader.live.binance.simulator.exchange import default_symbol_info
+from trader.live.binance.symbol_info_cache import SymbolInfoCache
+
+
+class ExchangeInfoClient:
+    """
+    Answers futures_exchange_info slowly and counts the calls.
+    """
+
+    def __init__(self, symbols=("BTCUSDT", "ETHUSDT"), latency=0.05):
+        self.symbols = list(symbols)
+        self.latency = latency
+        self.calls = 0
+
+    def futures_exchange_info(self):
+        self.calls += 1
+        time.sleep(self.latency)
+        return dict(symbols=[default_symbol_info(symbol) for symbol in self.symbols])
+
+
+def _refresh_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "symbol-info-refresh"]
+
+
+def test_concurrent_first_calls_load_once():
+    client = ExchangeInfoClient()
+    cache = SymbolInfoCache(client)
+    before = len(_refresh_threads())
+
+    threads = [threading.Thread(target=cache.get, args=("BTCUSDT",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        assert client.calls == 1
+        assert len(_refresh_threads()) == before + 1
+    finally:
+        cache.stop()
+
+
+def test_fresh_file_needs_no_rest_call(tmp_path):
+    path = str(tmp_path / "exchange_info.json")
+    first = SymbolInfoCache(ExchangeInfoClient(), path=path, background_refresh=False)
+    first.load()
+
+    client = ExchangeInfoClient()
+    second = SymbolInfoCache(client, path=path, background_refresh=False)
+    assert [info.symbol for info in second.get_all()] == ["BTCUSDT", "ETHUSDT"]
+    assert client.calls == 0
+
+    expired = SymbolInfoCache(client, ttl=0.0, path=path, background_refresh=False)
+    expired.get_all()
+    assert client.calls == 1
+
+
+def test_unknown_symbols_refresh_at_most_once_a_minute():
+    client = ExchangeInfoClient(latency=0.0)
+    cache = SymbolInfoCache(client, background_refresh=False)
+    cache.load()
+    cache.updated_at -= 120
+
+    client.symbols.append("SOLUSDT")
+    assert cache.get("solusdt").symbol == "SOLUSDT"
+    assert client.calls == 2
+
+    with pytest.raises(ValueError, match="Invalid symbol"):
+        cache.get("XRPUSDT")
+    assert client.calls == 2
+    assert cache.lookup("XRPUSDT") is None
+
+
+def test_trader_serves_all_symbol_info_from_the_cache(simulator):
+    trader = BinanceFuturesTrader(simulator.client())
+    trader.symbol_info_cache.background_refresh = False
+
+    first = trader.get_all_symbol_info()
+    requests = simulator.requests
+    second = trader.get_all_symbol_info()
+
+    assert sorted(info.symbol for info in first) == ["BTCUSDT", "ETHUSDT"]
+    assert [info.symbol for info in second] == [info.symbol for info in first]
+    assert simulator.requests == requests
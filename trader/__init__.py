@@ -1,3 +1,15 @@
-from . import core
-from . import backtest
-from . import live
+import importlib
+
+# Subpackages are imported on first access (trader.backtest, trader.live, ...),
+# so a process only pays for the dependencies of the parts it uses.
+_SUBPACKAGES = ("core", "backtest", "live")
+
+
+def __getattr__(name: str):
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_SUBPACKAGES))
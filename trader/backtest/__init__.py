@@ -2,6 +2,9 @@
 
 from .futures_trader import BacktestFuturesTrader
 from .indicator_optimizer import IndicatorOptimizer
+from .hyperparameter_optimizer import EvolutionaryOptimizer, Trial
+from .search_worker import IndicatorCache
+from .successive_halving import SuccessiveHalving
 from .position import BacktestPosition
 from .transform_positions import (
     positions_to_array,
@@ -16,6 +19,11 @@ from .transform_positions import (
     LEVERAGE_INDEX,
 )
 
-from .exceptions import NotEnoughFundsError
-from .backtester import run_backtest
+from .exceptions import NotEnoughFundsError, BacktestAbortedError
+from .abort_rules import AbortRules, AbortState
+from .backtester import run_backtest, resume_backtest
+from .checkpoint import Checkpoint
+from .results_store import ResultsStore, RunResult
+from .run_cache import RunCache, CachedRun
+from .monte_carlo import run_monte_carlo, MonteCarloResult
 from .log import logger
@@ -0,0 +1,113 @@
+import time
+from typing import Optional
+
+from .exceptions import BacktestAbortedError
+
+
+class AbortRules:
+    """
+    Stops hopeless backtests early. Every limit is optional.
+
+    Only holds the limits, so one instance can be shared by many traders and optimizer trials.
+    The state of a run lives in the AbortState returned by start.
+
+    Equity based rules are evaluated after every candle on the mark-to-market equity:
+    the balance plus the unrealized profit of the open position at the close price.
+
+    :param max_drawdown: Maximum drop from the peak equity as a ratio (0.6 means 60%).
+    :param min_equity: Minimum equity.
+    :param max_trades: Maximum number of entered positions.
+    :param max_consecutive_losses: Maximum number of losing positions in a row.
+    :param max_seconds: Wall-clock budget of the run.
+    """
+
+    __slots__ = (
+        "max_drawdown",
+        "min_equity",
+        "max_trades",
+        "max_consecutive_losses",
+        "max_seconds",
+    )
+
+    def __init__(
+            self,
+            max_drawdown: float = None,
+            min_equity: float = None,
+            max_trades: int = None,
+            max_consecutive_losses: int = None,
+            max_seconds: float = None,
+    ):
+        self.max_drawdown = max_drawdown
+        self.min_equity = min_equity
+        self.max_trades = max_trades
+        self.max_consecutive_losses = max_consecutive_losses
+        self.max_seconds = max_seconds
+
+    def start(self, equity: float) -> 'AbortState':
+        """
+        :return: Fresh state of a run starting with equity, its wall-clock budget starts now.
+        """
+
+        return AbortState(self, equity)
+
+
+class AbortState:
+    """
+    Peak equity, losing streak and deadline of one run checked against its AbortRules.
+    """
+
+    __slots__ = "rules", "peak_equity", "consecutive_losses", "deadline"
+
+    def __init__(self, rules: AbortRules, equity: float):
+        self.rules = rules
+        self.peak_equity = equity
+        self.consecutive_losses = 0
+        self.deadline: Optional[float] = None
+        self.start_clock()
+
+    def start_clock(self):
+        """
+        Restarts the wall-clock budget, e.g. when a run is resumed from a checkpoint.
+        """
+
+        if self.rules.max_seconds is None:
+            self.deadline = None
+        else:
+            self.deadline = time.monotonic() + self.rules.max_seconds
+
+    def check_time(self):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BacktestAbortedError(f"Wall-clock budget of {self.rules.max_seconds}s exceeded.")
+
+    def check_entry(self, trades: int):
+        max_trades = self.rules.max_trades
+        if max_trades is not None and trades > max_trades:
+            raise BacktestAbortedError(f"Maximum number of trades ({max_trades}) exceeded.")
+
+    def check_exit(self, profit: float):
+        if profit < 0:
+            self.consecutive_losses += 1
+        else:
+            self.consecutive_losses = 0
+
+        max_consecutive_losses = self.rules.max_consecutive_losses
+        if max_consecutive_losses is not None and self.consecutive_losses > max_consecutive_losses:
+            raise BacktestAbortedError(
+                f"Maximum number of consecutive losses ({max_consecutive_losses}) exceeded."
+            )
+
+    def check_equity(self, equity: float):
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+
+        min_equity = self.rules.min_equity
+        if min_equity is not None and equity < min_equity:
+            raise BacktestAbortedError(f"Equity {equity:.3f} fell below {min_equity}.")
+
+        max_drawdown = self.rules.max_drawdown
+        if max_drawdown is not None and self.peak_equity > 0:
+            drawdown = (self.peak_equity - equity) / self.peak_equity
+            if drawdown > max_drawdown:
+                raise BacktestAbortedError(
+                    f"Drawdown {drawdown * 100:.3f}% exceeded {max_drawdown * 100:.3f}%."
+                )
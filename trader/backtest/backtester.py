@@ -1,26 +1,97 @@
+from typing import Union
+
 import numpy as np
-from tqdm import tqdm
 
+from trader.core.model import Candles
 from trader.core.strategy import Strategy
 
+from .checkpoint import Checkpoint
+from .exceptions import BacktestAbortedError
 from .futures_trader import BacktestFuturesTrader
 from .log import logger
 
 
 def run_backtest(
-    candles: np.ndarray,
+    candles: Union[np.ndarray, Candles],
     strategy: Strategy,
+    show_progress=True,
+    start=1,
+    end: int = None,
+    checkpoint: Checkpoint = None,
+    price_dtype=None,
 ):
+    """
+    Feeds candles[:i] to the strategy and the trader for every i in [start, end).
+
+    Calling it again with start set to the previous end resumes the run
+    with the existing strategy and trader state.
+
+    If the trader's abort rules stop the run, the partial result is kept
+    and the reason is stored in trader.abort_reason.
+    A run starting at the first candle starts the abort rules anew.
+
+    With a checkpoint, a snapshot is saved after every checkpoint.every candles.
+
+    With price_dtype (e.g. np.float32), candle arrays are converted to columnar Candles
+    first, so the strategy and the trader receive Candles.
+    """
+
+    if price_dtype is not None and not isinstance(candles, Candles):
+        candles = Candles.from_array(candles, price_dtype)
+
     if not isinstance(strategy.trader, BacktestFuturesTrader):
         raise ValueError("Trader is not an instance of BacktestFuturesTrader!")
 
-    logger.info(f"Running backtest on {len(candles)} candles.")
-    for i in tqdm(range(1, len(candles))):
-        candles_head = candles[:i]
-        strategy(candles_head)
-        strategy.trader(candles_head)
+    if end is None:
+        end = len(candles)
+    if start == 1:
+        strategy.trader.start_abort_rules()
+
+    logger.info(f"Running backtest on {end - start} candles.")
+    steps = range(start, end)
+    if show_progress:
+        from tqdm import tqdm
+
+        steps = tqdm(steps)
+
+    try:
+        for i in steps:
+            candles_head = candles[:i]
+            strategy(candles_head)
+            strategy.trader(candles_head)
+
+            if checkpoint is not None and i % checkpoint.every == 0:
+                checkpoint.save(strategy, candles, i + 1)
+    except BacktestAbortedError as e:
+        strategy.trader.abort_reason = str(e)
+        logger.info(f"Aborted at candle {i}: {e}")
 
     logger.info(
         f"Finished. Entered {len(strategy.trader.positions)} positions. "
         f"Final balance: {strategy.trader.balance.total:.3f}"
     )
+
+
+def resume_backtest(
+    candles: Union[np.ndarray, Candles],
+    checkpoint: Checkpoint,
+    show_progress=True,
+    intrabar_candles: Union[np.ndarray, Candles] = None,
+) -> Strategy:
+    """
+    Continues a backtest from the latest snapshot and keeps saving new ones.
+
+    :param intrabar_candles: Lower interval candles of the trader, if it had any (see Checkpoint.load).
+    :return: The restored strategy after processing the remaining candles.
+    """
+
+    strategy, cursor = checkpoint.load(candles, intrabar_candles)
+    logger.info(f"Resuming backtest from candle {cursor}.")
+    run_backtest(
+        candles,
+        strategy,
+        show_progress=show_progress,
+        start=cursor,
+        checkpoint=checkpoint,
+    )
+    return strategy
@@ -0,0 +1,175 @@
+import os
+from typing import Dict, Tuple
+
+try:
+    import cPickle as pickle
+except ModuleNotFoundError:
+    import pickle
+
+import numpy as np
+
+from trader.core.const.candle_index import OPEN_TIME_INDEX
+from trader.core.model import Candles
+from trader.core.strategy import Strategy
+
+_MAGIC = b"TRCKPT1\n"
+
+CANDLES = "candles"
+INTRABAR_CANDLES = "intrabar_candles"
+INTRABAR_OPEN_TIME = "intrabar_open_time"
+
+
+def _sources(arrays: Dict[str, object]) -> Dict[str, np.ndarray]:
+    """
+    :return: The C-contiguous arrays holding the data of arrays (the columns of Candles), by name.
+    """
+
+    sources = {}
+    for name, array in arrays.items():
+        columns = array.columns if isinstance(array, Candles) else (array,)
+        for i, column in enumerate(columns):
+            if isinstance(column, np.ndarray) and column.flags.c_contiguous and column.size:
+                sources[f"{name}.{i}" if isinstance(array, Candles) else name] = column
+    return sources
+
+
+def _byte_range(array: np.ndarray) -> Tuple[int, int]:
+    low = high = array.__array_interface__["data"][0]
+    for size, stride in zip(array.shape, array.strides):
+        if stride < 0:
+            low += (size - 1) * stride
+        else:
+            high += (size - 1) * stride
+    return low, high + array.itemsize
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """
+    Pickles the candle arrays, and the views of them a strategy holds (like candles[:i]),
+    as named references instead of their data.
+    """
+
+    def __init__(self, file, arrays: Dict[str, object]):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.names = {id(array): name for name, array in arrays.items() if array is not None}
+        self.sources = [(name, source, _byte_range(source)) for name, source in _sources(arrays).items()]
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Candles):
+            return self.names.get(id(obj))
+        if not isinstance(obj, np.ndarray):
+            return None
+
+        name = self.names.get(id(obj))
+        if name is not None or obj.size == 0:
+            return name
+
+        low, high = _byte_range(obj)
+        for name, source, (source_low, source_high) in self.sources:
+            if obj.dtype == source.dtype and source_low <= low and high <= source_high:
+                offset = obj.__array_interface__["data"][0] - source_low
+                return name, offset, obj.shape, obj.strides
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, arrays: Dict[str, object]):
+        super().__init__(file)
+        self.arrays = arrays
+        self.sources = _sources(arrays)
+
+    def persistent_load(self, pid):
+        if isinstance(pid, tuple):
+            name, offset, shape, strides = pid
+            source = self.sources.get(name)
+            if source is None:
+                array_name = name.split(".")[0].replace("_", " ")
+                raise ValueError(f"Checkpoint references a view of the {array_name}, pass them to load!")
+            return np.ndarray(shape, source.dtype, buffer=source, offset=offset, strides=strides)
+
+        array = self.arrays.get(pid)
+        if array is None:
+            raise ValueError(f"Checkpoint references the {pid.replace('_', ' ')}, pass them to load!")
+        return array
+
+
+class Checkpoint:
+    """
+    Snapshot of a running backtest: the strategy with everything it references
+    (trader balance, position, orders, closed positions, indicators, abort rules)
+    and the index of the next candle to process.
+
+    Snapshots are pickled with the highest protocol and replaced atomically,
+    so a crash while saving keeps the previous snapshot.
+    The candles and the trader's intrabar candles, and any views of them, are saved as references
+    and re-attached from the arrays passed to load.
+
+    :param every: run_backtest saves a snapshot after every this many candles.
+    """
+
+    def __init__(self, path: str, every=100_000):
+        if every <= 0:
+            raise ValueError("every must be positive!")
+
+        self.path = path
+        self.every = every
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def save(self, strategy: Strategy, candles: np.ndarray, cursor: int):
+        """
+        :param cursor: Index of the next candle to process.
+        """
+
+        state = dict(
+            cursor=cursor,
+            last_open_time=candles[cursor - 1][OPEN_TIME_INDEX],
+            strategy=strategy,
+        )
+        arrays = {
+            CANDLES: candles,
+            INTRABAR_CANDLES: getattr(strategy.trader, "intrabar_candles", None),
+            INTRABAR_OPEN_TIME: getattr(strategy.trader, "_intrabar_open_time", None),
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC)
+            _SnapshotPickler(f, arrays).dump(state)
+        os.replace(tmp_path, self.path)
+
+    def load(self, candles: np.ndarray = None, intrabar_candles: np.ndarray = None) -> Tuple[Strategy, int]:
+        """
+        Every call returns an independent copy,
+        so many variants can be forked from one warm-up snapshot.
+
+        :param candles: If given, the snapshot is validated against them.
+            Required if the strategy references the candles array itself.
+        :param intrabar_candles: Lower interval candles of the trader, required if it had any when saved.
+        :return: Tuple of 2: (strategy, cursor)
+        """
+
+        arrays = {CANDLES: candles, INTRABAR_CANDLES: intrabar_candles}
+        if intrabar_candles is not None:
+            arrays[INTRABAR_OPEN_TIME] = np.asarray(intrabar_candles[:, OPEN_TIME_INDEX])
+
+        with open(self.path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{self.path!r} is not a backtest checkpoint!")
+            state = _SnapshotUnpickler(f, arrays).load()
+
+        cursor = state["cursor"]
+        if candles is not None and (
+            len(candles) < cursor
+            or candles[cursor - 1][OPEN_TIME_INDEX] != state["last_open_time"]
+        ):
+            raise ValueError("Checkpoint does not belong to these candles!")
+
+        strategy: Strategy = state["strategy"]
+        abort_state = getattr(strategy.trader, "abort_state", None)
+        if abort_state is not None:
+            abort_state.start_clock()
+
+        return strategy, cursor
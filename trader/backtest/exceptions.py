@@ -7,4 +7,8 @@ class NotEnoughFundsError(Exception):
 class LiquidationError(Exception):
     def __init__(self, msg):
         super().__init__(msg)
-    
\ No newline at end of file
+    
+
+class BacktestAbortedError(Exception):
+    def __init__(self, msg):
+        super().__init__(msg)
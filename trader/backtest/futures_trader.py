@@ -1,9 +1,18 @@
 import copy
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Union
 
 import numpy as np
 
-from trader.core.model import Balance, LimitOrder, MarketOrder, StopMarketOrder, TakeProfitMarketOrder, SymbolInfo
+from trader.core.model import (
+    Balance,
+    Candles,
+    LimitOrder,
+    MarketOrder,
+    Order,
+    StopMarketOrder,
+    TakeProfitMarketOrder,
+    SymbolInfo,
+)
 from trader.core.interface import FuturesTrader
 from trader.core.const.trade_actions import SELL, BUY
 from trader.core.const.candle_index import (
@@ -16,11 +25,21 @@ from trader.core.const.candle_index import (
 from trader.core.util.common import interval_to_seconds
 from trader.core.util.trade import create_position
 
+from .abort_rules import AbortRules, AbortState
 from .exceptions import LiquidationError
-from .position import BacktestPosition
+from .position import BacktestPosition, calculate_profit
+
+
+def _signed_quantity(order: Order) -> float:
+    return order.quantity if order.side == BUY else -order.quantity
 
 
 class BacktestFuturesTrader(FuturesTrader, Callable):
+    """
+    :param intrabar_candles: Optional candles of a lower interval (e.g. 1m for a 1h backtest).
+        When a candle hits both the take profit and the stop loss, its lower interval candles
+        are replayed to find which one was hit first, instead of guessing from the candle.
+    """
 
     def __init__(
         self,
@@ -29,10 +48,13 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
         balance: Balance = Balance("USDT", total=1_000, available=1_000),
         fee_ratio=0.001,
         leverage=1,
+        abort_rules: AbortRules = None,
+        intrabar_candles: Union[np.ndarray, Candles] = None,
     ):
         super().__init__()
         self.fee_ratio = fee_ratio
         self.symbol_info = symbol_info
+        self.interval = interval
         self.interval_in_seconds = interval_to_seconds(interval)
 
         self._leverage = leverage
@@ -40,6 +62,15 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
         self.initial_balance = copy.deepcopy(balance)
         self.balance = balance
 
+        self.intrabar_candles = intrabar_candles
+        self._intrabar_open_time = None
+        if intrabar_candles is not None:
+            self._intrabar_open_time = np.asarray(intrabar_candles[:, OPEN_TIME_INDEX])
+
+        self.abort_rules = abort_rules
+        self.abort_state: Optional[AbortState] = None
+        self.abort_reason: Optional[str] = None
+
         self.positions: List[BacktestPosition] = []
         self.position: Optional[BacktestPosition] = None
 
@@ -53,6 +84,35 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
         self.latest_low_price: float
         self.latest_close_price: float
 
+        self.start_abort_rules()
+
+    @property
+    def aborted(self):
+        return self.abort_reason is not None
+
+    @property
+    def equity(self) -> float:
+        """
+        Total balance plus the unrealized profit of the open position at the latest close price.
+        """
+
+        if self.position is None:
+            return self.balance.total
+        return self.balance.total + calculate_profit(self.latest_close_price, self.position)
+
+    def start_abort_rules(self):
+        """
+        Starts a new run of the abort rules: resets the peak equity and the losing streak
+        and starts the wall-clock budget. Called by run_backtest when a run starts.
+        """
+
+        if self.abort_rules is not None:
+            self.abort_state = self.abort_rules.start(self.balance.total)
+
+    def _on_position_closed(self, position: BacktestPosition):
+        if self.abort_state is not None:
+            self.abort_state.check_exit(position.profit())
+
     def _is_limit_buy_hit(self):
         return (
             self.limit_order.side == BUY
@@ -95,6 +155,9 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
         )
         self.balance.available -= price * abs(quantity)
 
+        if self.abort_state is not None:
+            self.abort_state.check_entry(len(self.positions) + 1)
+
     def _adjust_position(self, price: float, quantity: float):
         self.position.adjust(
             time=self.latest_open_time,
@@ -107,6 +170,7 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
             self.balance.available = self.balance.total
             self.positions.append(self.position)
             self.position = None
+            self._on_position_closed(self.positions[-1])
         else:
             self.balance.available += price * quantity * self._leverage
 
@@ -120,6 +184,7 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
         return self.stop_order
 
     def create_or_adjust_position(self, price: float, quantity: float):
+        price, quantity = float(price), float(quantity)
         if self.position is None:
             self._create_position(
                 price=price,
@@ -131,18 +196,23 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
                 quantity=quantity,
             )
 
-    def __call__(self, candles: np.ndarray):
+    def __call__(self, candles: Union[np.ndarray, Candles]):
+        if self.abort_state is not None:
+            self.abort_state.check_time()
+
+        # Python scalars, so float32 candles do not lower the precision of the balance and positions.
+        # item keeps open times exact, whatever their unit and precision.
         latest_candle = candles[-1]
-        self.latest_open_time = latest_candle[OPEN_TIME_INDEX]
-        self.latest_high_price = latest_candle[HIGH_PRICE_INDEX]
-        self.latest_low_price = latest_candle[LOW_PRICE_INDEX]
-        self.latest_close_price = latest_candle[CLOSE_PRICE_INDEX]
+        self.latest_open_time = latest_candle[OPEN_TIME_INDEX].item()
+        self.latest_high_price = float(latest_candle[HIGH_PRICE_INDEX])
+        self.latest_low_price = float(latest_candle[LOW_PRICE_INDEX])
+        self.latest_close_price = float(latest_candle[CLOSE_PRICE_INDEX])
 
         just_entered = False
         if self.market_order is not None:
             self.create_or_adjust_position(
                 price=self.latest_close_price,
-                quantity=self.market_order.quantity,
+                quantity=_signed_quantity(self.market_order),
             )
             self.market_order = None
             just_entered = True
@@ -151,7 +221,7 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
             if self._is_limit_sell_hit() or self._is_limit_buy_hit():
                 self.create_or_adjust_position(
                     price=self.limit_order.price,
-                    quantity=self.limit_order.quantity,
+                    quantity=_signed_quantity(self.limit_order),
                 )
 
                 self.limit_order = None
@@ -171,26 +241,18 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
             stop_hit = self._is_stop_loss_hit()
 
             if take_profit_hit and stop_hit:
-                open_price = latest_candle[OPEN_PRICE_INDEX]
-
-                high_distance = self.latest_high_price - open_price
-                low_distance = open_price - self.latest_low_price
-
-                take_profit_distance = abs(open_price - self.take_profit_order.stop_price)
-                stop_loss_distance = abs(open_price - self.stop_order.stop_price)
-
-                if high_distance / take_profit_distance > low_distance / stop_loss_distance:
+                if self._is_take_profit_hit_first(float(latest_candle[OPEN_PRICE_INDEX])):
                     stop_hit = False
                 else:
                     take_profit_hit = False
 
             if take_profit_hit:
                 self._close_position(self.take_profit_order.stop_price)
-                self.take_profit = None
+                self.take_profit_order = None
                 self.stop_order = None
             elif stop_hit:
                 self._close_position(self.stop_order.stop_price)
-                self.take_profit = None
+                self.take_profit_order = None
                 self.stop_order = None
 
                 if self.balance.total <= 0:
@@ -199,6 +261,62 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
                         f"You got liquidated! Final balance: {self.balance}"
                     )
 
+        if self.abort_state is not None:
+            self.abort_state.check_equity(self.equity)
+
+    def _is_take_profit_hit_first_by_distance(self, open_price: float, high_price: float, low_price: float):
+        high_distance = high_price - open_price
+        low_distance = open_price - low_price
+        if self.position.side != BUY:
+            high_distance, low_distance = low_distance, high_distance
+
+        take_profit_distance = abs(open_price - self.take_profit_order.stop_price)
+        stop_loss_distance = abs(open_price - self.stop_order.stop_price)
+
+        return high_distance / take_profit_distance > low_distance / stop_loss_distance
+
+    def _is_take_profit_hit_first(self, open_price: float):
+        """
+        Called when the latest candle hit both the take profit and the stop loss.
+        Finds the lower interval candles of the latest candle by binary search on their open times
+        and replays them. Falls back to the distances from the open if there are none,
+        or if one lower interval candle hit both too.
+        """
+
+        if self._intrabar_open_time is not None:
+            start, end = np.searchsorted(
+                self._intrabar_open_time,
+                (self.latest_open_time, self.latest_open_time + self.interval_in_seconds),
+            )
+            if start < end:
+                high = np.asarray(self.intrabar_candles[start:end, HIGH_PRICE_INDEX])
+                low = np.asarray(self.intrabar_candles[start:end, LOW_PRICE_INDEX])
+                take_profit_price = self.take_profit_order.stop_price
+                stop_price = self.stop_order.stop_price
+
+                if self.position.side == BUY:
+                    take_profit_mask = high > take_profit_price
+                    stop_mask = low < stop_price
+                else:
+                    take_profit_mask = low < take_profit_price
+                    stop_mask = high > stop_price
+
+                size = end - start
+                first_take_profit = take_profit_mask.argmax() if take_profit_mask.any() else size
+                first_stop = stop_mask.argmax() if stop_mask.any() else size
+                if first_take_profit != first_stop:
+                    return first_take_profit < first_stop
+
+                if first_take_profit < size:
+                    index = start + first_take_profit
+                    return self._is_take_profit_hit_first_by_distance(
+                        float(self.intrabar_candles[index, OPEN_PRICE_INDEX]),
+                        float(high[first_take_profit]),
+                        float(low[first_take_profit]),
+                    )
+
+        return self._is_take_profit_hit_first_by_distance(open_price, self.latest_high_price, self.latest_low_price)
+
     def cancel_orders(self, symbol: str):
         self.limit_order = None
         self.take_profit_order = None
@@ -238,12 +356,13 @@ class BacktestFuturesTrader(FuturesTrader, Callable):
         if self.position is not None:
             self.position.close(
                 time=self.latest_open_time,
-                price=price,
+                price=float(price),
             )
             self.balance.total += self.position.profit()
             self.balance.available = self.balance.total
             self.positions.append(self.position)
             self.position = None
+            self._on_position_closed(self.positions[-1])
 
     def close_position(self, symbol: str):
         self._close_position(self.latest_close_price)
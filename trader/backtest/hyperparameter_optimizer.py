@@ -0,0 +1,216 @@
+import functools
+import math
+import operator
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from trader.core.strategy import Strategy
+
+from .backtester import run_backtest
+from .exceptions import LiquidationError, NotEnoughFundsError
+from .log import logger
+from .results_store import ResultsStore
+from .search_worker import IndicatorCache, create_executor, worker_context
+
+
+class Trial:
+
+    __slots__ = "params", "score"
+
+    def __init__(self, params: dict, score: float):
+        self.params = params
+        self.score = score
+
+    def __str__(self):
+        return f"{self.params}: {self.score}"
+
+
+StrategyFactory = Callable[[np.ndarray, dict, IndicatorCache], Strategy]
+ScoreFunction = Callable[[Strategy], float]
+
+
+def final_balance(strategy: Strategy) -> float:
+    return strategy.trader.balance.total
+
+
+def evaluate(
+        candles: np.ndarray,
+        indicators: IndicatorCache,
+        strategy_factory: StrategyFactory,
+        score: ScoreFunction,
+        params: dict,
+) -> float:
+    strategy = strategy_factory(candles, params, indicators)
+    try:
+        run_backtest(candles, strategy, show_progress=False)
+    except (LiquidationError, NotEnoughFundsError):
+        return -math.inf
+
+    if strategy.trader.aborted:
+        return -math.inf
+    return score(strategy)
+
+
+def _evaluate_group(params_group: List[dict]) -> List[float]:
+    context = worker_context()
+    return [
+        evaluate(context.candles, context.indicators, context.strategy_factory, context.score, params)
+        for params in params_group
+    ]
+
+
+class EvolutionaryOptimizer:
+    """
+    Searches a discrete parameter space with a genetic algorithm instead of an exhaustive grid.
+
+    Every generation is a batch of unseen candidates evaluated in parallel by run_backtest.
+    Candidates that agree on indicator_params are sent to the same worker,
+    which reuses one IndicatorOptimizer precomputation for all of them.
+
+    :param strategy_factory: Picklable callable (candles, params, indicators) -> Strategy.
+    :param space: Parameter name -> possible values (ordered, mutation steps to neighbours).
+    :param indicator_params: Names of the parameters the indicators depend on.
+    :param score: Picklable callable, higher is better. Defaults to the final balance.
+    :param store: If given, every evaluated candidate is recorded with its score.
+    """
+
+    def __init__(
+            self,
+            candles: np.ndarray,
+            strategy_factory: StrategyFactory,
+            space: Dict[str, Sequence],
+            indicator_params: Iterable[str] = (),
+            score: ScoreFunction = final_balance,
+            population_size=16,
+            elite_ratio=0.25,
+            mutation_rate=0.2,
+            max_workers: Optional[int] = None,
+            seed: Optional[int] = None,
+            store: ResultsStore = None,
+    ):
+        if not space:
+            raise ValueError("Parameter space must not be empty!")
+        if any(len(values) == 0 for values in space.values()):
+            raise ValueError("Every parameter must have at least one value!")
+
+        self.candles = candles
+        self.strategy_factory = strategy_factory
+        self.names = tuple(space.keys())
+        self.values = tuple(tuple(space[name]) for name in self.names)
+        self.indicator_params = tuple(indicator_params)
+        self.score = score
+        self.population_size = population_size
+        self.elite_ratio = elite_ratio
+        self.mutation_rate = mutation_rate
+        self.max_workers = max_workers
+        self.random = random.Random(seed)
+        self.store = store
+
+        self._scores: Dict[Tuple[int, ...], float] = {}
+
+    @property
+    def grid_size(self):
+        return functools.reduce(operator.mul, (len(values) for values in self.values), 1)
+
+    @property
+    def trials(self) -> List[Trial]:
+        trials = [Trial(self._to_params(genome), score) for genome, score in self._scores.items()]
+        return sorted(trials, key=lambda trial: trial.score, reverse=True)
+
+    @property
+    def best(self) -> Trial:
+        return self.trials[0]
+
+    def _to_params(self, genome: Tuple[int, ...]) -> dict:
+        return {name: values[i] for name, values, i in zip(self.names, self.values, genome)}
+
+    def _random_genome(self) -> Tuple[int, ...]:
+        return tuple(self.random.randrange(len(values)) for values in self.values)
+
+    def _crossover(self, left: Tuple[int, ...], right: Tuple[int, ...]) -> Tuple[int, ...]:
+        return tuple(self.random.choice(genes) for genes in zip(left, right))
+
+    def _mutate(self, genome: Tuple[int, ...]) -> Tuple[int, ...]:
+        mutated = list(genome)
+        for i, values in enumerate(self.values):
+            if len(values) > 1 and self.random.random() < self.mutation_rate:
+                step = self.random.choice((-2, -1, 1, 2))
+                mutated[i] = min(max(mutated[i] + step, 0), len(values) - 1)
+        return tuple(mutated)
+
+    def _propose(self, size: int) -> List[Tuple[int, ...]]:
+        ranked = sorted(self._scores, key=self._scores.get, reverse=True)
+        elite = ranked[:max(2, int(len(ranked) * self.elite_ratio))]
+
+        proposed = set()
+        attempts = 0
+        while len(proposed) < size and attempts < size * 100:
+            attempts += 1
+            if len(elite) < 2:
+                genome = self._random_genome()
+            else:
+                genome = self._mutate(self._crossover(*self.random.sample(elite, 2)))
+                if genome in self._scores or genome in proposed:
+                    genome = self._mutate(genome)
+            if genome not in self._scores:
+                proposed.add(genome)
+
+        return list(proposed)
+
+    def _group(self, genomes: List[Tuple[int, ...]]) -> List[List[Tuple[int, ...]]]:
+        indices = [self.names.index(name) for name in self.indicator_params]
+        groups: Dict[Tuple[int, ...], List[Tuple[int, ...]]] = {}
+        for genome in genomes:
+            groups.setdefault(tuple(genome[i] for i in indices), []).append(genome)
+        return list(groups.values())
+
+    def _evaluate_batch(self, executor: Optional[ProcessPoolExecutor], genomes: List[Tuple[int, ...]]):
+        groups = self._group(genomes)
+        param_groups = [[self._to_params(genome) for genome in group] for group in groups]
+
+        if executor is None:
+            results = [_evaluate_group(params) for params in param_groups]
+        else:
+            futures = [executor.submit(_evaluate_group, params) for params in param_groups]
+            results = [future.result() for future in futures]
+
+        for group, scores in zip(groups, results):
+            for genome, score in zip(group, scores):
+                self._scores[genome] = score
+                if self.store is not None:
+                    self.store.add(params=self._to_params(genome), metrics=dict(score=score))
+
+    def run(self, n_trials: int = None) -> Trial:
+        """
+        :param n_trials: Backtest budget. Defaults to 5% of the full grid.
+        :return: Best trial found.
+        """
+
+        if n_trials is None:
+            n_trials = max(self.population_size, math.ceil(self.grid_size * 0.05))
+        n_trials = min(n_trials, self.grid_size)
+
+        logger.info(f"Searching {n_trials} of {self.grid_size} parameter combinations.")
+
+        executor = create_executor(self.max_workers, self.candles, self.strategy_factory, self.score)
+        try:
+            generation = 0
+            while len(self._scores) < n_trials:
+                batch_size = min(self.population_size, n_trials - len(self._scores))
+                genomes = self._propose(batch_size)
+                if not genomes:
+                    break
+
+                self._evaluate_batch(executor, genomes)
+                generation += 1
+                logger.info(
+                    f"Generation {generation}: {len(self._scores)} trials. Best: {self.best}"
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return self.best
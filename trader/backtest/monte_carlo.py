@@ -0,0 +1,189 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .log import logger
+from .transform_positions import PROFIT_INDEX
+
+RESHUFFLE = "reshuffle"
+BOOTSTRAP = "bootstrap"
+SKIP = "skip"
+METHODS = (RESHUFFLE, BOOTSTRAP, SKIP)
+
+# Upper bound of the (paths x trades) elements simulated at once per worker (16 MB per float64 array).
+MAX_CHUNK_ELEMENTS = 2_000_000
+
+
+def _simulate_chunk(
+        steps: np.ndarray,
+        start_cash: float,
+        method: str,
+        paths: int,
+        skip_ratio: float,
+        compounding: bool,
+        ruin_equity: float,
+        seed: np.random.SeedSequence,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    trades = steps.shape[0]
+
+    if method == RESHUFFLE:
+        # Independent permutation per path (Generator.permuted needs numpy 1.20).
+        path_steps = steps[np.argsort(rng.random((paths, trades)), axis=1)]
+    elif method == BOOTSTRAP:
+        path_steps = steps[rng.integers(0, trades, (paths, trades))]
+    else:
+        path_steps = np.tile(steps, (paths, 1))
+
+    if skip_ratio > 0.0:
+        path_steps[rng.random((paths, trades)) < skip_ratio] = 0.0
+
+    if compounding:
+        np.log1p(path_steps, out=path_steps)
+        np.cumsum(path_steps, axis=1, out=path_steps)
+        np.exp(path_steps, out=path_steps)
+        path_steps *= start_cash
+    else:
+        np.cumsum(path_steps, axis=1, out=path_steps)
+        path_steps += start_cash
+    equity = path_steps
+
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, start_cash, out=peak)
+    drawdown = np.divide(peak - equity, peak, out=peak)
+
+    return drawdown.max(axis=1), equity[:, -1].copy(), equity.min(axis=1) <= ruin_equity
+
+
+class MonteCarloResult:
+    """
+    Maximum drawdown (ratio of the peak), final equity and ruin of every simulated equity path.
+    """
+
+    __slots__ = "method", "start_cash", "ruin_equity", "max_drawdown", "final_equity", "ruined"
+
+    def __init__(
+            self,
+            method: str,
+            start_cash: float,
+            ruin_equity: float,
+            max_drawdown: np.ndarray,
+            final_equity: np.ndarray,
+            ruined: np.ndarray,
+    ):
+        self.method = method
+        self.start_cash = start_cash
+        self.ruin_equity = ruin_equity
+        self.max_drawdown = max_drawdown
+        self.final_equity = final_equity
+        self.ruined = ruined
+
+    @property
+    def paths(self) -> int:
+        return self.final_equity.shape[0]
+
+    @property
+    def ruin_probability(self) -> float:
+        return float(self.ruined.mean())
+
+    def ruin_probability_at(self, max_drawdown: float) -> float:
+        """
+        :return: Share of the paths whose maximum drawdown reached max_drawdown (0.5 means 50%).
+        """
+
+        return float((self.max_drawdown >= max_drawdown).mean())
+
+    def percentiles(self, percents: Sequence[float] = (1, 5, 25, 50, 75, 95, 99)) -> Dict[str, Dict[float, float]]:
+        return dict(
+            max_drawdown=dict(zip(percents, np.percentile(self.max_drawdown, percents).tolist())),
+            final_equity=dict(zip(percents, np.percentile(self.final_equity, percents).tolist())),
+        )
+
+    def summary(self, percents: Sequence[float] = (5, 50, 95)) -> dict:
+        ruin_probability = self.ruin_probability
+        return dict(
+            method=self.method,
+            paths=self.paths,
+            ruin_probability=ruin_probability,
+            ruin_probability_error=float(np.sqrt(ruin_probability * (1 - ruin_probability) / self.paths)),
+            profitable_ratio=float((self.final_equity > self.start_cash).mean()),
+            **self.percentiles(percents),
+        )
+
+
+def run_monte_carlo(
+        positions: np.ndarray,
+        start_cash: float,
+        method=RESHUFFLE,
+        paths=100_000,
+        skip_ratio=0.0,
+        compounding=False,
+        ruin_ratio=0.5,
+        max_workers: Optional[int] = None,
+        seed: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    Simulates equity paths from the trades of a backtest without running it again.
+
+    - reshuffle: the trades in random order,
+    - bootstrap: as many trades drawn with replacement,
+    - skip: the trades in their order.
+
+    With skip_ratio, every trade of a path is skipped with that probability (any method).
+    Paths are simulated in chunks of at most MAX_CHUNK_ELEMENTS steps, on max_workers processes
+    (in this process if 1). Results only depend on the seed, not on the number of workers.
+
+    :param positions: Trade ledger, the output of positions_to_array.
+    :param compounding: Replay the trades as returns of the balance before them instead of fixed profits.
+    :param ruin_ratio: A path is ruined once its equity falls to start_cash * (1 - ruin_ratio).
+    """
+
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {', '.join(METHODS)}.")
+    if method == SKIP and skip_ratio <= 0.0:
+        raise ValueError("Method skip requires a positive skip_ratio!")
+
+    profits = np.asarray(positions[PROFIT_INDEX], dtype=np.float64)
+    if profits.shape[0] == 0:
+        raise ValueError("There are no trades to simulate!")
+
+    if compounding:
+        balance_before = start_cash + np.concatenate(([0.0], np.cumsum(profits)[:-1]))
+        if np.any(balance_before <= 0):
+            raise ValueError("Balance went to zero, trades can not be replayed as returns!")
+        steps = np.maximum(profits / balance_before, -1.0)
+    else:
+        steps = profits
+
+    ruin_equity = start_cash * (1 - ruin_ratio)
+    chunk_paths = max(1, MAX_CHUNK_ELEMENTS // profits.shape[0])
+    chunks = [min(chunk_paths, paths - start) for start in range(0, paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    arguments = [
+        (steps, start_cash, method, size, skip_ratio, compounding, ruin_equity, chunk_seed)
+        for size, chunk_seed in zip(chunks, seeds)
+    ]
+
+    started = time.perf_counter()
+    if max_workers == 1 or len(chunks) == 1:
+        results = [_simulate_chunk(*args) for args in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_simulate_chunk, *zip(*arguments)))
+
+    result = MonteCarloResult(
+        method,
+        start_cash,
+        ruin_equity,
+        np.concatenate([chunk[0] for chunk in results]),
+        np.concatenate([chunk[1] for chunk in results]),
+        np.concatenate([chunk[2] for chunk in results]),
+    )
+    logger.info(
+        f"Simulated {paths} {method} paths of {profits.shape[0]} trades in {time.perf_counter() - started:.2f} s. "
+        f"Ruin probability: {result.ruin_probability:.2%}"
+    )
+    return result
@@ -1,11 +1,7 @@
 import importlib
-from typing import List
+from typing import List, Union
 
 import numpy as np
-import pandas as pd
-
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
 from .transform_positions import (
     TIME_INDEX,
@@ -31,6 +27,7 @@ from trader.core.const.candle_index import (
 )
 from trader.core.const.trade_actions import BUY
 from trader.core.enum import CandlestickType
+from trader.core.model import Candles
 from trader.core.util.np import assign_where_not_zero
 
 from trader.core.util.np import map_match
@@ -38,7 +35,7 @@ from trader.core.util.trade import to_heikin_ashi
 
 
 def plot_backtest_results(
-        candles: np.ndarray,
+        candles: Union[np.ndarray, Candles],
         positions: np.ndarray,
         add_or_reduce_positions: np.ndarray,
         start_cash: float,
@@ -47,12 +44,22 @@ def plot_backtest_results(
         extra_plots: List[Plot] = None,
         candlestick_type: CandlestickType = CandlestickType.LINE,
 ):
+    import pandas as pd
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     logger.info("Plotting results.")
 
     def __create_custom_data(*arrays: np.ndarray):
         return np.stack(tuple(arrays), axis=-1)
 
-    candle_open_times = candles[OPEN_TIME_INDEX]
+    # Candle columns: the rows of a transposed candle array or the columns of Candles.
+    if isinstance(candles, Candles):
+        candle_data, candles = candles, candles.T
+    else:
+        candle_data = candles.T
+
+    candle_open_times = np.asarray(candles[OPEN_TIME_INDEX], dtype=np.float64)
 
     entry_time = map_match(candle_open_times, positions[TIME_INDEX])
     entry_price = assign_where_not_zero(entry_time, positions[PRICE_INDEX])
@@ -249,7 +256,7 @@ def plot_backtest_results(
             for graph in extra_plots:
                 graph_module = importlib.import_module(f'plotly.graph_objects')
                 graph_class = getattr(graph_module, graph.type.capitalize())
-                graph_data = graph.data_callback(candles.T)
+                graph_data = graph.data_callback(candle_data)
                 for params in graph.params:
                     if "constant_y" in params:
                         y_data = [params.pop("constant_y")] * open_time.size
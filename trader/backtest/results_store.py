@@ -0,0 +1,234 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .position import BacktestPosition
+from .trade_report import TradeReport
+from .transform_positions import positions_to_array
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    created REAL NOT NULL,
+    has_ledger INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS params (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    name TEXT NOT NULL,
+    value,
+    kind TEXT,
+    PRIMARY KEY (run_id, name)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS params_name_value ON params (name, value);
+CREATE INDEX IF NOT EXISTS metrics_name_value ON metrics (name, value);
+"""
+
+_CHUNK_SIZE = 500
+
+# Kinds of parameter values SQLite can not tell apart from the stored value.
+_BOOL = "bool"
+_JSON = "json"
+
+
+def _to_column(value) -> Tuple[object, Optional[str]]:
+    """
+    :return: Tuple of 2: (stored value, kind)
+    """
+
+    if isinstance(value, (bool, np.bool_)):
+        return int(value), _BOOL
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (int, float, str)):
+        return value, None
+    return json.dumps(value, default=str), _JSON
+
+
+def _from_column(value, kind: Optional[str]):
+    if kind == _BOOL:
+        return bool(value)
+    if kind == _JSON:
+        return json.loads(value)
+    return value
+
+
+def report_metrics(report: TradeReport) -> Dict[str, float]:
+    return dict(
+        start_cash=report.start_cash,
+        end_cash=report.end_cash,
+        profit=report.profit,
+        wins=report.wins,
+        losses=report.losses,
+        win_rate=report.win_rate,
+    )
+
+
+class RunResult:
+
+    __slots__ = "run_id", "name", "params", "metrics"
+
+    def __init__(self, run_id: int, name: Optional[str], params: dict, metrics: Dict[str, float]):
+        self.run_id = run_id
+        self.name = name
+        self.params = params
+        self.metrics = metrics
+
+    def __str__(self):
+        return f"{self.run_id} {self.params}: {self.metrics}"
+
+
+class ResultsStore:
+    """
+    SQLite store of backtest results.
+
+    Parameters and metrics of every run are indexed rows,
+    so top-k and filter queries only read the matching runs.
+    Trade ledgers (positions_to_array output) are kept in .npy side files.
+
+    Non-scalar parameter values are stored as JSON text.
+    The kind of bool and JSON values is stored next to them, so parameters read back with their type
+    (JSON arrays come back as lists).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.ledger_dir = f"{path}.ledgers"
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(params)")}
+        if "kind" not in columns:
+            # Stores created before the kind column.
+            self._connection.execute("ALTER TABLE params ADD COLUMN kind TEXT")
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def add(
+            self,
+            params: dict,
+            metrics: Dict[str, float],
+            positions: List[BacktestPosition] = None,
+            name: str = None,
+    ) -> int:
+        """
+        :return: Id of the new run.
+        """
+
+        with self._connection:
+            run_id = self._connection.execute(
+                "INSERT INTO runs (name, created, has_ledger) VALUES (?, ?, ?)",
+                (name, time.time(), positions is not None),
+            ).lastrowid
+            self._connection.executemany(
+                "INSERT INTO params (run_id, name, value, kind) VALUES (?, ?, ?, ?)",
+                ((run_id, key, *_to_column(value)) for key, value in params.items()),
+            )
+            self._connection.executemany(
+                "INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)",
+                ((run_id, key, float(value)) for key, value in metrics.items()),
+            )
+
+        if positions is not None:
+            os.makedirs(self.ledger_dir, exist_ok=True)
+            np.save(self._ledger_path(run_id), positions_to_array(positions))
+
+        return run_id
+
+    def add_report(
+            self,
+            params: dict,
+            report: TradeReport,
+            positions: List[BacktestPosition] = None,
+            name: str = None,
+    ) -> int:
+        return self.add(params=params, metrics=report_metrics(report), positions=positions, name=name)
+
+    def _ledger_path(self, run_id: int):
+        return os.path.join(self.ledger_dir, f"{run_id}.npy")
+
+    def ledger(self, run_id: int) -> Optional[np.ndarray]:
+        path = self._ledger_path(run_id)
+        if not os.path.isfile(path):
+            return None
+        return np.load(path)
+
+    @staticmethod
+    def _filter(params: dict):
+        clauses = " INTERSECT ".join(
+            "SELECT run_id FROM params WHERE name = ? AND value = ? AND kind IS ?" for _ in params
+        )
+        args = [arg for key, value in params.items() for arg in (key, *_to_column(value))]
+        return clauses, args
+
+    def _load(self, run_ids: List[int]) -> List[RunResult]:
+        results: Dict[int, RunResult] = {}
+        for i in range(0, len(run_ids), _CHUNK_SIZE):
+            chunk = run_ids[i:i + _CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+
+            for run_id, name in self._connection.execute(
+                f"SELECT run_id, name FROM runs WHERE run_id IN ({placeholders})", chunk
+            ):
+                results[run_id] = RunResult(run_id, name, {}, {})
+            for run_id, key, value, kind in self._connection.execute(
+                f"SELECT run_id, name, value, kind FROM params WHERE run_id IN ({placeholders})", chunk
+            ):
+                results[run_id].params[key] = _from_column(value, kind)
+            for run_id, key, value in self._connection.execute(
+                f"SELECT run_id, name, value FROM metrics WHERE run_id IN ({placeholders})", chunk
+            ):
+                results[run_id].metrics[key] = value
+
+        return [results[run_id] for run_id in run_ids]
+
+    def top(self, metric: str, k=10, ascending=False, **params) -> List[RunResult]:
+        """
+        :param params: Only runs with these exact parameter values are considered.
+        :return: The k best runs by metric.
+        """
+
+        query = "SELECT run_id FROM metrics WHERE name = ?"
+        args = [metric]
+        if params:
+            clauses, filter_args = self._filter(params)
+            query += f" AND run_id IN ({clauses})"
+            args.extend(filter_args)
+        query += f" ORDER BY value {'ASC' if ascending else 'DESC'} LIMIT ?"
+        args.append(k)
+
+        return self._load([row[0] for row in self._connection.execute(query, args)])
+
+    def find(self, **params) -> List[RunResult]:
+        """
+        :return: Every run with these exact parameter values.
+        """
+
+        if not params:
+            query, args = "SELECT run_id FROM runs", []
+        else:
+            query, args = self._filter(params)
+
+        return self._load(sorted(row[0] for row in self._connection.execute(query, args)))
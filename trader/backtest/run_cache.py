@@ -0,0 +1,307 @@
+import hashlib
+import os
+import pathlib
+import sys
+import types
+from typing import List, Optional, Tuple
+
+try:
+    import cPickle as pickle
+except ModuleNotFoundError:
+    import pickle
+
+import numpy as np
+
+import trader
+from trader.core.model import Balance
+from trader.core.strategy import Strategy
+from trader.core.util.common import Storable
+from trader.core.util.jit import Kernel
+
+from .abort_rules import AbortState
+from .backtester import run_backtest
+from .futures_trader import BacktestFuturesTrader
+from .indicator_optimizer import IndicatorOptimizer
+from .log import logger
+from .position import BacktestPosition
+from .trade_report import TradeReport
+from .transform_positions import positions_to_array
+
+# Depth of the object graph described attribute by attribute.
+MAX_DESCRIBE_DEPTH = 8
+
+_code_fingerprint: Optional[str] = None
+
+
+def code_fingerprint() -> str:
+    """
+    Hash of every source file of the trader package, computed once per process.
+    """
+
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        digest = hashlib.blake2b(digest_size=16)
+        root = pathlib.Path(trader.__file__).parent
+        for path in sorted(root.rglob("*.py")):
+            digest.update(str(path.relative_to(root)).encode())
+            digest.update(path.read_bytes())
+        _code_fingerprint = digest.hexdigest()
+    return _code_fingerprint
+
+
+def _fingerprint(module: Optional[str], qualname: str) -> str:
+    path = getattr(sys.modules.get(module), "__file__", None)
+    if path is None or not os.path.isfile(path):
+        return f"{module}.{qualname}"
+    with open(path, "rb") as f:
+        return f"{module}.{qualname}:{hashlib.blake2b(f.read(), digest_size=16).hexdigest()}"
+
+
+def _source_fingerprint(obj) -> str:
+    return _fingerprint(getattr(type(obj), "__module__", None), type(obj).__qualname__)
+
+
+def _callable_fingerprint(obj) -> str:
+    module = getattr(obj, "__module__", None)
+    qualname = getattr(obj, "__qualname__", None)
+    if module is None or qualname is None or "<" in qualname:
+        raise ValueError(f"{obj!r} can not be described, use a module level function or class instead!")
+    return _fingerprint(module, qualname)
+
+
+def _pickle_digest(obj) -> Tuple[str, str]:
+    try:
+        data = pickle.dumps(obj, protocol=4)
+    except Exception as e:
+        raise ValueError(f"{type(obj).__qualname__} object can not be described: {e}") from e
+    return "pickle", hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def describe(obj, _depth=0):
+    """
+    Canonical, hashable description of the parameters of obj.
+
+    Objects nested deeper than MAX_DESCRIBE_DEPTH are described by the digest of their pickle.
+    Raises ValueError for objects which can not be described deterministically,
+    like lambdas and unpicklable objects without attributes.
+    """
+
+    if _depth > MAX_DESCRIBE_DEPTH:
+        return _pickle_digest(obj)
+
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        digest = hashlib.blake2b(np.ascontiguousarray(obj), digest_size=16).hexdigest()
+        return "ndarray", obj.dtype.str, obj.shape, digest
+    if isinstance(obj, (list, tuple)):
+        return tuple(describe(item, _depth + 1) for item in obj)
+    if isinstance(obj, dict):
+        return tuple(sorted((str(key), describe(value, _depth + 1)) for key, value in obj.items()))
+    if isinstance(obj, (set, frozenset)):
+        return "set", tuple(sorted((describe(item, _depth + 1) for item in obj), key=repr))
+    if isinstance(obj, Kernel):
+        return describe(obj.function, _depth + 1)
+    if isinstance(obj, types.MethodType):
+        return "method", describe(obj.__self__, _depth + 1), _callable_fingerprint(obj.__func__)
+    if isinstance(obj, (types.FunctionType, types.BuiltinFunctionType, type)):
+        return "callable", _callable_fingerprint(obj)
+    if isinstance(obj, BacktestFuturesTrader):
+        return describe_trader(obj)
+    if isinstance(obj, IndicatorOptimizer):
+        return describe(obj.indicator, _depth + 1)
+    if isinstance(obj, Storable):
+        return _source_fingerprint(obj), describe(obj.dict(), _depth + 1)
+    if hasattr(obj, "__slots__"):
+        return _source_fingerprint(obj), tuple(
+            (name, describe(getattr(obj, name, None), _depth + 1)) for name in obj.__slots__
+        )
+    if hasattr(obj, "__dict__"):
+        return _source_fingerprint(obj), describe(vars(obj), _depth + 1)
+
+    return _source_fingerprint(obj), _pickle_digest(obj)
+
+
+def describe_position(position: Optional[BacktestPosition]):
+    if position is None:
+        return None
+    return (
+        position.symbol,
+        position.leverage,
+        tuple(position.times),
+        tuple(position.prices),
+        tuple(position.quantities),
+    )
+
+
+def describe_abort_state(abort_state: Optional[AbortState]):
+    # The deadline depends on the wall clock, not on the run.
+    if abort_state is None:
+        return None
+    return abort_state.peak_equity, abort_state.consecutive_losses
+
+
+def describe_trader(backtest_trader: BacktestFuturesTrader):
+    """
+    Config and current state of backtest_trader,
+    so a trader which already traded does not share the key of a fresh one.
+    """
+
+    symbol_info = backtest_trader.symbol_info
+    balance: Balance = backtest_trader.initial_balance
+    current_balance: Balance = backtest_trader.balance
+
+    return (
+        "BacktestFuturesTrader",
+        symbol_info.symbol,
+        symbol_info.quantity_precision,
+        symbol_info.price_precision,
+        backtest_trader.interval,
+        backtest_trader.fee_ratio,
+        backtest_trader.get_leverage(symbol_info.symbol),
+        (balance.asset, balance.total, balance.available),
+        describe(backtest_trader.abort_rules),
+        describe(backtest_trader.intrabar_candles),
+        (current_balance.asset, current_balance.total, current_balance.available),
+        describe_position(backtest_trader.position),
+        tuple(describe_position(position) for position in backtest_trader.positions),
+        describe((
+            backtest_trader.market_order,
+            backtest_trader.limit_order,
+            backtest_trader.stop_order,
+            backtest_trader.take_profit_order,
+        )),
+        backtest_trader.abort_reason,
+        describe_abort_state(backtest_trader.abort_state),
+    )
+
+
+class CachedRun:
+
+    __slots__ = "positions", "balance", "abort_reason"
+
+    def __init__(self, positions: List[BacktestPosition], balance: Balance, abort_reason: Optional[str]):
+        self.positions = positions
+        self.balance = balance
+        self.abort_reason = abort_reason
+
+    @property
+    def ledger(self) -> np.ndarray:
+        return positions_to_array(self.positions)
+
+    def report(self, candles: np.ndarray, backtest_trader: BacktestFuturesTrader, trade_ratio: float = None):
+        return TradeReport(
+            start_cash=backtest_trader.initial_balance.total,
+            positions=self.positions,
+            trade_ratio=trade_ratio,
+            candles=candles,
+            interval=backtest_trader.interval,
+            leverage=backtest_trader.get_leverage(backtest_trader.symbol_info.symbol),
+        )
+
+
+class RunCache:
+    """
+    Content-addressed cache of whole backtest runs.
+
+    The key hashes the candles (or a caller supplied identity, like store name and range),
+    the strategy and indicator parameters, the BacktestFuturesTrader config and state
+    (balance, open position and orders, closed positions) and the source code of the trader package and the strategy module,
+    so any code or parameter change misses.
+
+    Least recently used entries are evicted when the cache grows over max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(
+            self,
+            candles: np.ndarray,
+            strategy: Strategy,
+            candles_id: str = None,
+            start=1,
+            end: int = None,
+    ) -> str:
+        if not isinstance(strategy.trader, BacktestFuturesTrader):
+            raise ValueError("Trader is not an instance of BacktestFuturesTrader!")
+
+        strategy_params = {name: value for name, value in vars(strategy).items() if name != "trader"}
+        description = (
+            code_fingerprint(),
+            candles_id if candles_id is not None else describe(candles),
+            start,
+            len(candles) if end is None else end,
+            _source_fingerprint(strategy),
+            describe(strategy_params),
+            describe_trader(strategy.trader),
+        )
+        return hashlib.blake2b(repr(description).encode(), digest_size=20).hexdigest()
+
+    def _path(self, key: str):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[CachedRun]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                positions, balance, abort_reason = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+        os.utime(path)
+        return CachedRun(positions, balance, abort_reason)
+
+    def put(self, key: str, run: CachedRun):
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((run.positions, run.balance, run.abort_reason), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def run(
+            self,
+            candles: np.ndarray,
+            strategy: Strategy,
+            candles_id: str = None,
+            start=1,
+            end: int = None,
+            show_progress=True,
+    ) -> CachedRun:
+        """
+        Returns the cached result of the run or runs the backtest and stores it.
+        On a hit the strategy is not run, its trader state is left untouched.
+        """
+
+        key = self.key(candles, strategy, candles_id, start, end)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"Backtest cache hit: {key}")
+            return cached
+
+        run_backtest(candles, strategy, show_progress=show_progress, start=start, end=end)
+        result = CachedRun(
+            positions=strategy.trader.positions,
+            balance=strategy.trader.balance,
+            abort_reason=strategy.trader.abort_reason,
+        )
+        self.put(key, result)
+        return result
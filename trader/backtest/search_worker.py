@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Hashable, Optional, Type
+
+import numpy as np
+
+from trader.core.indicator import EntryIndicator
+
+from .indicator_optimizer import IndicatorOptimizer
+
+
+class IndicatorCache:
+    """
+    Keeps one IndicatorOptimizer per indicator type and parameter set,
+    so candidates sharing indicator parameters share the precomputation.
+    """
+
+    def __init__(self, candles: np.ndarray):
+        self.candles = candles
+        self._optimizers: Dict[Hashable, IndicatorOptimizer] = {}
+
+    def get(self, indicator_type: Type[EntryIndicator], **params) -> IndicatorOptimizer:
+        key = (indicator_type, tuple(sorted(params.items())))
+        optimizer = self._optimizers.get(key)
+        if optimizer is None:
+            optimizer = IndicatorOptimizer(self.candles, indicator_type(**params))
+            self._optimizers[key] = optimizer
+        return optimizer
+
+    def __len__(self):
+        return len(self._optimizers)
+
+
+class SearchContext:
+    """
+    Everything the tasks of a parameter search share: the candles, their indicator cache,
+    the strategy factory and the scoring function.
+    """
+
+    __slots__ = "candles", "indicators", "strategy_factory", "score"
+
+    def __init__(self, candles: np.ndarray, strategy_factory: Callable, score: Callable):
+        self.candles = candles
+        self.indicators = IndicatorCache(candles)
+        self.strategy_factory = strategy_factory
+        self.score = score
+
+
+_context: Optional[SearchContext] = None
+
+
+def init_worker(candles: np.ndarray, strategy_factory: Callable, score: Callable):
+    global _context
+    _context = SearchContext(candles, strategy_factory, score)
+
+
+def worker_context() -> SearchContext:
+    if _context is None:
+        raise RuntimeError("Search worker is not initialized!")
+    return _context
+
+
+def create_executor(
+        max_workers: Optional[int],
+        candles: np.ndarray,
+        strategy_factory: Callable,
+        score: Callable,
+) -> Optional[ProcessPoolExecutor]:
+    """
+    Ships the search context to every worker process once, through the pool initializer,
+    instead of pickling it with every task.
+
+    :return: None if max_workers is 1, the context is then set in this process.
+    """
+
+    if max_workers == 1:
+        init_worker(candles, strategy_factory, score)
+        return None
+
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=init_worker,
+        initargs=(candles, strategy_factory, score),
+    )
@@ -0,0 +1,185 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from trader.core.strategy import Strategy
+
+from .backtester import run_backtest
+from .exceptions import LiquidationError, NotEnoughFundsError
+from .hyperparameter_optimizer import StrategyFactory, Trial
+from .log import logger
+from .search_worker import create_executor, worker_context
+from .trade_report import TradeReport
+
+
+Metric = Union[str, Callable[[TradeReport], float]]
+
+
+def score_trade_report(metric: Metric, strategy: Strategy, candles: np.ndarray) -> float:
+    report = TradeReport.from_trader(strategy.trader, candles)
+    if callable(metric):
+        return metric(report)
+    return getattr(report, metric)
+
+
+def _advance(
+        params: dict,
+        strategy: Optional[Strategy],
+        start: int,
+        end: int,
+) -> Tuple[Strategy, float, bool]:
+    """
+    Creates the strategy on the first rung, otherwise continues it from start.
+
+    :return: Tuple of 3: (strategy, score, finished)
+    """
+
+    context = worker_context()
+    candles = context.candles
+    if strategy is None:
+        strategy = context.strategy_factory(candles, params, context.indicators)
+
+    try:
+        run_backtest(candles, strategy, show_progress=False, start=start, end=end)
+    except (LiquidationError, NotEnoughFundsError):
+        return strategy, -math.inf, True
+
+    if strategy.trader.aborted:
+        return strategy, -math.inf, True
+    return strategy, score_trade_report(context.score, strategy, candles[:end]), False
+
+
+class _Candidate:
+
+    __slots__ = "params", "strategy", "score", "finished"
+
+    def __init__(self, params: dict):
+        self.params = params
+        self.strategy: Optional[Strategy] = None
+        self.score = -math.inf
+        self.finished = False
+
+
+class SuccessiveHalving:
+    """
+    Runs every candidate on a short prefix of the candles,
+    keeps the best keep_ratio of them by a TradeReport metric
+    and continues only the survivors on longer prefixes until the full history.
+
+    Survivors are resumed from the end of the previous prefix,
+    their strategy and trader state is kept between rungs.
+    The candles, the strategy factory and the metric are sent to every worker once,
+    only the survivors' strategies travel with the tasks of a rung.
+
+    :param metric: TradeReport attribute name or callable (TradeReport) -> float, higher is better.
+    :param min_candles: Length of the first prefix. Defaults to a geometric schedule ending at the full history.
+    """
+
+    def __init__(
+            self,
+            candles: np.ndarray,
+            strategy_factory: StrategyFactory,
+            candidates: Iterable[dict],
+            metric: Metric = "profit",
+            keep_ratio=0.5,
+            min_candles: int = None,
+            max_workers: Optional[int] = None,
+    ):
+        if not 0 < keep_ratio < 1:
+            raise ValueError("keep_ratio must be between 0 and 1!")
+
+        self.candles = candles
+        self.strategy_factory = strategy_factory
+        self.candidates = [_Candidate(params) for params in candidates]
+        self.metric = metric
+        self.keep_ratio = keep_ratio
+        self.max_workers = max_workers
+
+        if not self.candidates:
+            raise ValueError("At least one candidate is required!")
+
+        self.rungs = self._create_rungs(min_candles)
+
+    def _create_rungs(self, min_candles: Optional[int]) -> List[int]:
+        rung_count = 1
+        if len(self.candidates) > 1:
+            rung_count += math.ceil(math.log(len(self.candidates), 1 / self.keep_ratio))
+
+        total = len(self.candles)
+        if min_candles is None:
+            min_candles = max(2, int(total * self.keep_ratio ** (rung_count - 1)))
+
+        growth = (total / min_candles) ** (1 / max(rung_count - 1, 1))
+        ends = sorted({min(int(round(min_candles * growth ** i)), total) for i in range(rung_count)})
+        ends[-1] = total
+        return ends
+
+    @property
+    def trials(self) -> List[Trial]:
+        trials = [Trial(candidate.params, candidate.score) for candidate in self.candidates]
+        return sorted(trials, key=lambda trial: trial.score, reverse=True)
+
+    def _run_rung(
+            self,
+            executor: Optional[ProcessPoolExecutor],
+            survivors: List[_Candidate],
+            start: int,
+            end: int,
+    ):
+        args = [(candidate.params, candidate.strategy, start, end) for candidate in survivors]
+
+        if executor is None:
+            results = [_advance(*arg) for arg in args]
+        else:
+            results = [future.result() for future in [executor.submit(_advance, *arg) for arg in args]]
+
+        for candidate, (strategy, score, finished) in zip(survivors, results):
+            candidate.strategy = strategy
+            candidate.score = score
+            candidate.finished = finished
+
+    def run(self) -> Trial:
+        """
+        :return: Best trial that reached the end of the candles.
+        """
+
+        executor = create_executor(self.max_workers, self.candles, self.strategy_factory, self.metric)
+
+        survivors = self.candidates
+        start = 1
+        try:
+            for rung, end in enumerate(self.rungs):
+                self._run_rung(executor, survivors, start, end)
+                start = end
+
+                ranked = sorted(
+                    (candidate for candidate in survivors if not candidate.finished),
+                    key=lambda candidate: candidate.score,
+                    reverse=True,
+                )
+                if end != self.rungs[-1]:
+                    ranked = ranked[:max(1, math.ceil(len(survivors) * self.keep_ratio))]
+
+                kept = set(ranked)
+                for candidate in survivors:
+                    if candidate not in kept:
+                        candidate.strategy = None
+
+                logger.info(
+                    f"Rung {rung}: {len(survivors)} candidates on {end} candles, "
+                    f"{len(ranked)} kept."
+                )
+                survivors = ranked
+                if not survivors:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if not survivors:
+            raise ValueError("Every candidate failed before the end of the candles!")
+
+        best = survivors[0]
+        return Trial(best.params, best.score)
@@ -1,14 +1,11 @@
 from typing import List
 
 import numpy as np
-import pandas as pd
 
 from trader.core.model import Position
 from trader.core.const.candle_index import OPEN_TIME_INDEX
 from trader.core.util.common import Storable
 
-import plotly.graph_objects as go
-
 
 class TradeReport(Storable):
 
@@ -38,16 +35,35 @@ class TradeReport(Storable):
         self.wins = len(tuple(position for position in positions if position.profit() > 0))
         self.losses = len(tuple(position for position in positions if position.profit() < 0))
 
+    @classmethod
+    def from_trader(cls, trader, candles: np.ndarray, trade_ratio: float = None):
+        """
+        :param trader: BacktestFuturesTrader which processed the candles.
+        """
+
+        return cls(
+            start_cash=trader.initial_balance.total,
+            positions=trader.positions,
+            trade_ratio=trade_ratio,
+            candles=candles,
+            interval=trader.interval,
+            leverage=trader.get_leverage(trader.symbol_info.symbol),
+        )
+
     @property
     def number_of_candles(self):
         return self.candles.shape[0]
 
     @property
     def start_time(self):
+        import pandas as pd
+
         return pd.to_datetime(self.start_timestamp, unit='s')
 
     @property
     def end_time(self):
+        import pandas as pd
+
         return pd.to_datetime(self.end_timestamp, unit='s')
 
     @property
@@ -70,6 +86,8 @@ class TradeReport(Storable):
         return (self.end_cash - self.start_cash) / self.start_cash
 
     def create_basic_info_table(self):
+        import plotly.graph_objects as go
+
         return go.Table(
             cells=dict(
                 values=[
@@ -90,6 +108,8 @@ class TradeReport(Storable):
         )
 
     def create_trade_result_table(self):
+        import plotly.graph_objects as go
+
         return go.Table(
             cells=dict(
                 values=[
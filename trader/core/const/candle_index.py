@@ -1,12 +1,3 @@
-from crypto_data.binance.schema import (
-    OPEN_TIME,
-    OPEN_PRICE,
-    HIGH_PRICE,
-    LOW_PRICE,
-    CLOSE_PRICE,
-    VOLUME,
-)
-
 OPEN_TIME_INDEX = 0
 OPEN_PRICE_INDEX = 1
 HIGH_PRICE_INDEX = 2
@@ -14,11 +5,27 @@ LOW_PRICE_INDEX = 3
 CLOSE_PRICE_INDEX = 4
 VOLUME_INDEX = 5
 
-COLUMN_NAME_INDEX_MAP = {
-    OPEN_TIME: OPEN_TIME_INDEX,
-    OPEN_PRICE: OPEN_PRICE_INDEX,
-    HIGH_PRICE: HIGH_PRICE_INDEX,
-    LOW_PRICE: LOW_PRICE_INDEX,
-    CLOSE_PRICE: CLOSE_PRICE_INDEX,
-    VOLUME: VOLUME_INDEX,
-}
+
+def __getattr__(name: str):
+    # crypto_data is only imported when the column name map is first used.
+    if name == "COLUMN_NAME_INDEX_MAP":
+        from crypto_data.binance.schema import (
+            OPEN_TIME,
+            OPEN_PRICE,
+            HIGH_PRICE,
+            LOW_PRICE,
+            CLOSE_PRICE,
+            VOLUME,
+        )
+
+        column_name_index_map = globals()[name] = {
+            OPEN_TIME: OPEN_TIME_INDEX,
+            OPEN_PRICE: OPEN_PRICE_INDEX,
+            HIGH_PRICE: HIGH_PRICE_INDEX,
+            LOW_PRICE: LOW_PRICE_INDEX,
+            CLOSE_PRICE: CLOSE_PRICE_INDEX,
+            VOLUME: VOLUME_INDEX,
+        }
+        return column_name_index_map
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
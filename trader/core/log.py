@@ -0,0 +1,24 @@
+import logging
+
+# Like backtest.log and live.log: trader.core is imported by both packages and must not import either of them.
+CORE_LOGGER_NAME = "core"
+
+
+def __create_logger():
+    _logger = logging.getLogger(name=CORE_LOGGER_NAME)
+    if not _logger.handlers:
+        _logger.propagate = False
+        _logger.setLevel(logging.INFO)
+
+        formatter = logging.Formatter(fmt="%(levelname)s-%(name)s: %(message)s")
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setLevel(level=logging.INFO)
+
+        stream_handler.setFormatter(fmt=formatter)
+        _logger.addHandler(stream_handler)
+
+    return _logger
+
+
+logger = __create_logger()
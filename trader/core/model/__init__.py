@@ -10,3 +10,4 @@ from .order import (
     StopLimitOrder,
     StopMarketOrder,
 )
+from .candles import Candles
@@ -0,0 +1,98 @@
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from ..const.candle_index import OPEN_TIME_INDEX, CLOSE_PRICE_INDEX
+
+COLUMNS = 6
+
+
+class Candles:
+    """
+    Columnar candles: an open time column and OHLCV columns of one float dtype.
+
+    Open times keep the dtype they are given in (float64 for candle arrays), so whatever unit
+    and precision they have (seconds, milliseconds, fractions) is kept exactly.
+    With float32 prices a candle takes 28 bytes instead of the 48 of a float64 (N, 6) array.
+    Indexing follows the 2-D array layout, so code written for candle arrays works unchanged:
+
+    - candles[:i] is a view of the first i candles,
+    - candles[mask] and candles[indices] are Candles holding the selected candles,
+    - candles[:, CLOSE_PRICE_INDEX] is a column,
+    - candles[-1][OPEN_TIME_INDEX] is a value of the last candle.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Sequence[np.ndarray]):
+        if len(columns) != COLUMNS:
+            raise ValueError(f"Candles must have {COLUMNS} columns!")
+        if len({column.shape[0] for column in columns}) != 1:
+            raise ValueError("Candle columns must have the same length!")
+        self.columns: Tuple[np.ndarray, ...] = tuple(columns)
+
+    @classmethod
+    def from_array(cls, candles: np.ndarray, price_dtype=np.float32, time_dtype=None) -> 'Candles':
+        """
+        :param candles: (N, 6) candle array.
+        :param price_dtype: dtype of the price and volume columns (float32 or float64).
+        :param time_dtype: dtype of the open time column, the dtype of candles by default.
+        :raises ValueError: If the open times do not fit time_dtype exactly.
+        """
+
+        open_time = candles[:, OPEN_TIME_INDEX]
+        if time_dtype is not None:
+            converted = open_time.astype(time_dtype)
+            if not np.array_equal(converted, open_time):
+                raise ValueError(f"Open times do not fit {np.dtype(time_dtype)} exactly!")
+            open_time = converted
+
+        return cls([
+            np.ascontiguousarray(open_time) if index == OPEN_TIME_INDEX
+            else np.ascontiguousarray(candles[:, index], dtype=price_dtype)
+            for index in range(COLUMNS)
+        ])
+
+    def to_array(self, dtype=np.float64) -> np.ndarray:
+        """
+        :return: (N, 6) candle array.
+        """
+
+        return np.stack(self.columns, axis=1).astype(dtype, copy=False)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.to_array(np.float64 if dtype is None else dtype)
+
+    @property
+    def price_dtype(self) -> np.dtype:
+        return self.columns[CLOSE_PRICE_INDEX].dtype
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.columns[0].shape[0], COLUMNS
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns)
+
+    @property
+    def T(self) -> Tuple[np.ndarray, ...]:
+        return self.columns
+
+    def __len__(self):
+        return self.columns[0].shape[0]
+
+    def __getitem__(self, key: Union[int, slice, np.ndarray, tuple]):
+        if isinstance(key, tuple):
+            rows, column = key
+            if isinstance(column, slice):
+                return self.to_array()[key]
+            return self.columns[column][rows]
+
+        if isinstance(key, (int, np.integer)):
+            return tuple(column[key] for column in self.columns)
+        # Slices give views, boolean masks and index arrays copies, like numpy.
+        return Candles([column[key] for column in self.columns])
+
+    def __repr__(self):
+        return f"Candles(size={len(self)}, price_dtype={self.price_dtype})"
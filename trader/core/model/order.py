@@ -3,8 +3,8 @@ from typing import Union
 from ..const.trade_actions import BUY as TA_BUY
 from ..const.trade_actions import SELL as TA_SELL
 
-from ..util.common import round_down
-from ..util.trade import opposite_side
+from ..util.quantization import Quantizer
+from ..util.trade import opposite_side, str_side_to_int
 
 from ..enum.order import OrderSide, OrderType, TimeInForce
 
@@ -39,7 +39,7 @@ class Order:
             time_in_force: str = None,
             reduce_only=False,
     ):
-        self.side = int(side)
+        self.side = str_side_to_int(side) if isinstance(side, str) else int(side)
         if self.side not in (TA_BUY, TA_SELL):
             raise ValueError(f"Side must be {TA_BUY} or {TA_SELL}. Invalid value: {self.side}.")
 
@@ -63,14 +63,27 @@ class Order:
     def opposite_side(self):
         return opposite_side(self.side)
 
-    def to_binance_order(self, price_precision: int, quantity_precision: int):
-        order = dict(symbol=self.symbol, type=str(self.type).upper(), side=str(self.side).upper())
+    def to_binance_order(
+            self,
+            price_precision: int = None,
+            quantity_precision: int = None,
+            quantizer: Quantizer = None,
+    ):
+        """
+        Prices and quantity are rounded down to the tick and step size of quantizer,
+        or to the given precisions.
+        """
+
+        if quantizer is None:
+            quantizer = Quantizer.from_precision(price_precision, quantity_precision)
+
+        order = dict(symbol=self.symbol, type=str(self.type).upper(), side=self.side_as_str())
         if self.quantity is not None:
-            order["quantity"] = str(round_down(abs(self.quantity), quantity_precision))
+            order["quantity"] = quantizer.format_quantity(self.quantity)
         if self.price is not None:
-            order["price"] = round_down(self.price, price_precision)
+            order["price"] = quantizer.format_price(self.price)
         if self.stop_price is not None:
-            order["stopPrice"] = round_down(self.stop_price, price_precision)
+            order["stopPrice"] = quantizer.format_price(self.stop_price)
         if self.close_position is not None:
             order["closePosition"] = str(self.close_position).lower()
         if self.time_in_force is not None:
@@ -81,6 +94,13 @@ class Order:
 
     @staticmethod
     def from_binance(data: dict) -> 'Order':
+        order = Order._from_binance_type(data)
+        order.order_id = data.get("orderId")
+        order.status = data.get("status")
+        return order
+
+    @staticmethod
+    def _from_binance_type(data: dict) -> 'Order':
         order_type: str = data["type"]
         if order_type == OrderType.MARKET.value:
             return MarketOrder(
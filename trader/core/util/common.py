@@ -13,8 +13,6 @@ except ModuleNotFoundError:
 import random
 from typing import Union
 
-import yaml
-
 
 def read_json(*path):
     with open(os.path.join(*path)) as f:
@@ -22,6 +20,8 @@ def read_json(*path):
 
 
 def read_yaml(*path):
+    import yaml
+
     with open(os.path.join(*path)) as f:
         return yaml.load(f, Loader=yaml.FullLoader)
 
@@ -109,7 +109,7 @@ def pickle_loader(filename):
 
 
 def save_object(obj, filename):
-    with open(filename, 'ab ') as outp:  # Overwrites any existing file.
+    with open(filename, 'ab') as outp:  # Appends to any existing file.
         pickle.dump(obj, outp, pickle.HIGHEST_PROTOCOL)
 
 
@@ -0,0 +1,146 @@
+import functools
+import importlib
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from ..log import logger
+
+# Environment variable of the on-disk compilation cache directory.
+CACHE_DIR_ENV = "TRADER_NUMBA_CACHE_DIR"
+
+# Element types of candle arrays the kernels are precompiled for by warmup.
+CANDLE_DTYPES = ("float64", "float32")
+
+_cache_dir: Optional[str] = os.environ.get(CACHE_DIR_ENV)
+_lock = threading.Lock()
+
+
+def set_cache_dir(path: Optional[str]):
+    """
+    Sets the directory numba caches the compiled kernels in (numba's default location if None).
+    Only affects kernels which were not called or compiled yet, so call it at startup.
+    Also exported to the environment, so worker processes started afterwards use the same directory.
+    """
+
+    global _cache_dir
+    if path is None:
+        _cache_dir = None
+        os.environ.pop(CACHE_DIR_ENV, None)
+    else:
+        _cache_dir = os.environ[CACHE_DIR_ENV] = os.path.abspath(os.path.expanduser(path))
+
+
+def get_cache_dir() -> Optional[str]:
+    return _cache_dir
+
+
+class Kernel:
+    """
+    Function compiled by numba on its first call (or by compile/warmup) with caching to disk,
+    so a new process loads the machine code from the cache instead of compiling it again.
+
+    :param signatures: Argument type templates like "({dtype}[:], {dtype}[::1])",
+        compiled by warmup for every dtype of CANDLE_DTYPES.
+    """
+
+    def __init__(self, function, signatures: Iterable[str], options: dict):
+        functools.update_wrapper(self, function)
+        self.function = function
+        self.name = f"{function.__module__}.{function.__qualname__}"
+        self.signatures = tuple(signatures)
+        self.options = options
+        self._dispatcher = None
+
+    @property
+    def dispatcher(self):
+        if self._dispatcher is None:
+            with _lock:
+                if self._dispatcher is None:
+                    import numba
+
+                    if _cache_dir is not None:
+                        numba.config.CACHE_DIR = _cache_dir
+                    self._dispatcher = numba.jit(cache=True, **self.options)(self.function)
+        return self._dispatcher
+
+    def __call__(self, *args):
+        return self.dispatcher(*args)
+
+    def __reduce__(self):
+        return _load_kernel, (self.function.__module__, self.function.__qualname__)
+
+    def signatures_for(self, dtypes: Iterable[str] = CANDLE_DTYPES) -> List[str]:
+        return [signature.format(dtype=dtype) for dtype in dtypes for signature in self.signatures]
+
+    def compile(self, dtypes: Iterable[str] = CANDLE_DTYPES) -> float:
+        """
+        Compiles (or loads from the cache) the signatures of the kernel for the dtypes.
+
+        :return: Elapsed seconds.
+        """
+
+        start = time.perf_counter()
+        dispatcher = self.dispatcher
+        for signature in self.signatures_for(dtypes):
+            dispatcher.compile(signature)
+        return time.perf_counter() - start
+
+
+def _load_kernel(module: str, qualname: str) -> Kernel:
+    return getattr(importlib.import_module(module), qualname)
+
+
+KERNELS: Dict[str, Kernel] = {}
+
+
+def kernel(*signatures: str, **options):
+    """
+    Registers the decorated function as a Kernel compiled with numba.jit(**options).
+
+    Example::
+
+        @kernel("({dtype}[:], {dtype}[::1])", nopython=True)
+        def f(a, b): ...
+    """
+
+    def decorator(function) -> Kernel:
+        compiled = Kernel(function, signatures, options)
+        KERNELS[compiled.name] = compiled
+        return compiled
+
+    return decorator
+
+
+def _import_kernel_modules():
+    # Modules defining kernels, imported so that warmup sees every registered kernel.
+    importlib.import_module("trader.core.util.trade")
+    importlib.import_module("trader.core.util.resample")
+
+
+def warmup(dtypes: Iterable[str] = CANDLE_DTYPES, background=False) -> Optional[threading.Thread]:
+    """
+    Compiles every registered kernel for the dtypes, loading them from the disk cache where possible,
+    and logs the time spent per kernel.
+
+    :param background: Compile on a daemon thread and return it instead of blocking.
+    """
+
+    if background:
+        thread = threading.Thread(target=warmup, args=(tuple(dtypes),), name="jit-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    _import_kernel_modules()
+    dtypes = tuple(dtypes)
+    total = 0.0
+    for name, compiled in list(KERNELS.items()):
+        seconds = compiled.compile(dtypes)
+        total += seconds
+        hits = sum(compiled.dispatcher.stats.cache_hits.values())
+        logger.info(
+            f"JIT {name}: {len(compiled.signatures_for(dtypes))} signatures in {seconds:.3f} s "
+            f"({hits} from cache)."
+        )
+    logger.info(f"JIT warm-up of {len(KERNELS)} kernels took {total:.3f} s (cache: {_cache_dir or 'numba default'}).")
@@ -45,7 +45,7 @@ def map_match(src, tar):
     src_size = np.shape(src)[0]
     tar_size = np.shape(tar)[0]
     src_mat = src[:, np.newaxis]
-    tar_mat = np.reshape(np.tile(tar, src_size), newshape=(src_size, tar_size))
+    tar_mat = np.reshape(np.tile(tar, src_size), (src_size, tar_size))
     mask = np.sum(np.equal(src_mat, tar_mat), axis=-1)
     ret = src * mask
     return ret
@@ -55,7 +55,7 @@ def mask_match(src, tar):
     src_size = np.shape(src)[0]
     tar_size = np.shape(tar)[0]
     src_mat = src[:, np.newaxis]
-    tar_mat = np.reshape(np.tile(tar, src_size), newshape=(src_size, tar_size))
+    tar_mat = np.reshape(np.tile(tar, src_size), (src_size, tar_size))
     return np.any(np.equal(src_mat, tar_mat), axis=-1)
 
 
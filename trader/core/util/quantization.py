@@ -0,0 +1,211 @@
+import math
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from ..const.trade_actions import BUY
+
+ArrayLike = Union[float, np.ndarray]
+
+# Relative tolerance under which a value counts as an exact multiple of the tick/step (float noise).
+_TOLERANCE = 1e-9
+
+
+def _to_fraction(size: Union[str, float]) -> Tuple[int, int]:
+    """
+    :return: (units, decimals) with size == units / 10 ** decimals, e.g. "0.10" -> (10, 2).
+    """
+
+    text = size if isinstance(size, str) else f"{size:.12f}"
+    if "e" in text.lower():
+        text = f"{float(text):.12f}"
+    if "." not in text:
+        return int(text), 0
+
+    whole, fraction = text.split(".")
+    fraction = fraction.rstrip("0")
+    return int(whole + fraction), len(fraction)
+
+
+def _upper_limit(value) -> float:
+    """
+    Binance disables a maximum filter with 0 (sent as "0"), parsed to no limit.
+    """
+
+    value = math.inf if value is None else float(value)
+    return value if value > 0.0 else math.inf
+
+
+def _multiples(values: ArrayLike, size: float, mode: str):
+    steps = np.asarray(values, dtype=np.float64) / size
+    nearest = np.rint(steps)
+    if mode == "round":
+        return nearest.astype(np.int64)
+
+    exact = np.abs(steps - nearest) <= _TOLERANCE * np.maximum(1.0, np.abs(steps))
+    if mode == "floor":
+        rounded = np.floor(steps)
+    elif mode == "ceil":
+        rounded = np.ceil(steps)
+    else:
+        raise ValueError("Mode must be floor, ceil or round.")
+    return np.where(exact, nearest, rounded).astype(np.int64)
+
+
+class Quantizer:
+    """
+    Rounds prices to the tick size and quantities to the step size of a symbol,
+    for scalars and numpy arrays alike.
+
+    Tick and step sizes are stored as integer fractions (units / 10 ** decimals).
+    Values are divided by the tick or step size in float64 and rounded to an integer number of ticks or steps;
+    a quotient within a relative 1e-9 of an integer counts as exact, so float noise like 0.3 / 0.1
+    does not drop a tick. Formatting multiplies the integer counts by the integer units,
+    so the strings are exact decimals without float-to-string truncation.
+    """
+
+    __slots__ = (
+        "tick_size", "step_size", "price_decimals", "quantity_decimals", "_tick_units", "_step_units",
+        "min_price", "max_price", "min_quantity", "max_quantity", "min_notional",
+    )
+
+    def __init__(
+            self,
+            tick_size: Union[str, float],
+            step_size: Union[str, float],
+            min_price=0.0,
+            max_price=math.inf,
+            min_quantity=0.0,
+            max_quantity=math.inf,
+            min_notional=0.0,
+    ):
+        self._tick_units, self.price_decimals = _to_fraction(tick_size)
+        self._step_units, self.quantity_decimals = _to_fraction(step_size)
+        if self._tick_units <= 0 or self._step_units <= 0:
+            raise ValueError("Tick and step size must be positive!")
+
+        self.tick_size = self._tick_units / 10 ** self.price_decimals
+        self.step_size = self._step_units / 10 ** self.quantity_decimals
+        self.min_price = float(min_price)
+        self.max_price = _upper_limit(max_price)
+        self.min_quantity = float(min_quantity)
+        self.max_quantity = _upper_limit(max_quantity)
+        self.min_notional = float(min_notional)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def from_precision(price_precision: int, quantity_precision: int) -> 'Quantizer':
+        return Quantizer(tick_size=f"{10.0 ** -price_precision:.{price_precision}f}",
+                         step_size=f"{10.0 ** -quantity_precision:.{quantity_precision}f}")
+
+    @staticmethod
+    def from_symbol_info(symbol_info) -> 'Quantizer':
+        """
+        Uses the exchange filters of the symbol info if it has any (see BinanceSymbolInfo.quantizer),
+        otherwise the price and quantity precision.
+        """
+
+        quantizer = getattr(symbol_info, "quantizer", None)
+        if quantizer is not None:
+            return quantizer
+        return Quantizer.from_precision(symbol_info.price_precision, symbol_info.quantity_precision)
+
+    def price_ticks(self, prices: ArrayLike, mode="floor"):
+        return _multiples(prices, self.tick_size, mode)
+
+    def quantity_steps(self, quantities: ArrayLike):
+        return _multiples(np.abs(quantities), self.step_size, "floor")
+
+    def prices(self, prices: ArrayLike, mode="floor") -> ArrayLike:
+        """
+        :param mode: floor, ceil or round to the tick size.
+        """
+
+        quantized = self.price_ticks(prices, mode) * self._tick_units / 10 ** self.price_decimals
+        return quantized if np.ndim(quantized) else float(quantized)
+
+    def quantities(self, quantities: ArrayLike) -> ArrayLike:
+        """
+        Rounds quantities towards zero to the step size, keeping their sign.
+        """
+
+        quantized = np.copysign(
+            self.quantity_steps(quantities) * self._step_units / 10 ** self.quantity_decimals,
+            quantities,
+        )
+        return quantized if np.ndim(quantized) else float(quantized)
+
+    @staticmethod
+    def _format(units: int, decimals: int) -> str:
+        if decimals == 0:
+            return str(units)
+        text = str(units).rjust(decimals + 1, "0")
+        return f"{text[:-decimals]}.{text[-decimals:]}"
+
+    def format_price(self, price: float, mode="floor") -> str:
+        return self._format(int(self.price_ticks(price, mode)) * self._tick_units, self.price_decimals)
+
+    def format_quantity(self, quantity: float) -> str:
+        return self._format(int(self.quantity_steps(quantity)) * self._step_units, self.quantity_decimals)
+
+    def format_prices(self, prices: ArrayLike, mode="floor") -> List[str]:
+        units = np.atleast_1d(self.price_ticks(prices, mode)) * self._tick_units
+        return [self._format(int(unit), self.price_decimals) for unit in units]
+
+    def format_quantities(self, quantities: ArrayLike) -> List[str]:
+        units = np.atleast_1d(self.quantity_steps(quantities)) * self._step_units
+        return [self._format(int(unit), self.quantity_decimals) for unit in units]
+
+    def valid(self, prices: ArrayLike, quantities: ArrayLike):
+        """
+        :return: True where the (already quantized) price and quantity pass
+            the min/max price, min/max quantity and min notional filters.
+        """
+
+        prices = np.asarray(prices, dtype=np.float64)
+        quantities = np.abs(np.asarray(quantities, dtype=np.float64))
+        return (
+            (prices >= self.min_price)
+            & (prices <= self.max_price)
+            & (quantities >= self.min_quantity)
+            & (quantities <= self.max_quantity)
+            & (prices * quantities >= self.min_notional)
+        )
+
+    def check(self, price: float, quantity: float):
+        """
+        Raises ValueError naming the first filter the price and quantity fail.
+        """
+
+        quantity = abs(quantity)
+        if not self.min_price <= price <= self.max_price:
+            raise ValueError(f"Price {price} is outside [{self.min_price}, {self.max_price}].")
+        if not self.min_quantity <= quantity <= self.max_quantity:
+            raise ValueError(f"Quantity {quantity} is outside [{self.min_quantity}, {self.max_quantity}].")
+        if price * quantity < self.min_notional:
+            raise ValueError(f"Notional {price * quantity} is below {self.min_notional}.")
+
+    def ladder(
+            self,
+            side: int,
+            start_price: float,
+            end_price: float,
+            count: int,
+            total_quantity: float,
+            weights: np.ndarray = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Quantized limit order ladder from start_price to end_price (inclusive) in one vectorized call.
+        Buy prices are rounded down and sell prices up, so no order crosses its intended level.
+
+        :param weights: Share of total_quantity per order (normalized), equal by default.
+        :return: (prices, quantities, valid mask) arrays of length count.
+        """
+
+        raw_prices = np.linspace(start_price, end_price, count)
+        weights = np.ones(count) if weights is None else np.asarray(weights, dtype=np.float64)
+
+        prices = self.prices(raw_prices, mode="floor" if side == BUY else "ceil")
+        quantities = self.quantities(total_quantity * weights / weights.sum())
+        return prices, quantities, self.valid(prices, quantities)
@@ -0,0 +1,152 @@
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from ..const.candle_index import (
+    OPEN_TIME_INDEX,
+    OPEN_PRICE_INDEX,
+    HIGH_PRICE_INDEX,
+    LOW_PRICE_INDEX,
+    CLOSE_PRICE_INDEX,
+    VOLUME_INDEX,
+)
+from ..model.candles import Candles
+from .common import interval_to_seconds
+from .jit import kernel
+
+# Binance weeks start on Monday, the epoch was a Thursday.
+_WEEK_ORIGIN = 4 * 86400
+
+
+@kernel(
+    "({dtype}[:], {dtype}[:], int64[::1])",
+    "({dtype}[::1], {dtype}[::1], int64[::1])",
+    nopython=True,
+)
+def running_high_low(high, low, group):
+    """
+    :return: Highest high and lowest low of every candle's group up to and including the candle.
+    """
+
+    running_high = np.empty(high.shape[0], dtype=high.dtype)
+    running_low = np.empty(low.shape[0], dtype=low.dtype)
+    for i in range(high.shape[0]):
+        if i == 0 or group[i] != group[i - 1]:
+            running_high[i] = high[i]
+            running_low[i] = low[i]
+        else:
+            running_high[i] = max(running_high[i - 1], high[i])
+            running_low[i] = min(running_low[i - 1], low[i])
+    return running_high, running_low
+
+
+class Resampler:
+    """
+    Aggregates base candles into candles of a higher interval in one vectorized pass
+    and maps every base candle to the higher candles known at its close, without lookahead.
+
+    Higher candles are aligned to the epoch like on Binance (weeks start on Monday);
+    calendar intervals (months, years) are not supported.
+    At base index i:
+
+    - last_closed(i) is the latest higher candle whose close time is not after the close of base candle i,
+    - in_progress(i) is the higher candle containing base candle i aggregated up to it,
+      None if base candle i closes it.
+
+    Both are O(1) lookups into arrays precomputed at construction.
+    In a strategy fed by run_backtest, the latest base candle is i = len(candles) - 1.
+
+    :param base_interval: Interval of the base candles, used to tell whether their last candle
+        closes a higher candle. Defaults to the smallest open time difference.
+    """
+
+    def __init__(self, candles: Union[np.ndarray, Candles], interval: str, base_interval: str = None):
+        self.interval = interval
+        self.interval_in_seconds = interval_to_seconds(interval)
+        if interval[-1] in ("M", "y", "Y"):
+            raise ValueError("Calendar intervals (months, years) can not be resampled!")
+
+        time_column = np.asarray(candles[:, OPEN_TIME_INDEX])
+        open_time = time_column.astype(np.int64)
+        if open_time.shape[0] == 0:
+            raise ValueError("Candles must not be empty!")
+
+        if base_interval is not None:
+            base_seconds = interval_to_seconds(base_interval)
+        elif open_time.shape[0] > 1:
+            base_seconds = int(np.diff(open_time).min())
+        else:
+            raise ValueError("base_interval is required for a single candle!")
+        if base_seconds > self.interval_in_seconds or self.interval_in_seconds % base_seconds:
+            raise ValueError(f"{interval} is not a multiple of the base interval!")
+
+        origin = _WEEK_ORIGIN if interval[-1].lower() == "w" else 0
+        bucket = (open_time - origin) // self.interval_in_seconds
+        starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+        ends = np.append(starts[1:], open_time.shape[0]) - 1
+
+        # Index of the higher candle of every base candle.
+        self.index = np.cumsum(np.diff(bucket, prepend=bucket[0]) != 0)
+
+        open_price = np.asarray(candles[:, OPEN_PRICE_INDEX])
+        high = np.asarray(candles[:, HIGH_PRICE_INDEX])
+        low = np.asarray(candles[:, LOW_PRICE_INDEX])
+        close = np.asarray(candles[:, CLOSE_PRICE_INDEX])
+        volume = np.asarray(candles[:, VOLUME_INDEX])
+
+        higher_open_time = bucket[starts] * self.interval_in_seconds + origin
+        columns = [None] * 6
+        columns[OPEN_TIME_INDEX] = higher_open_time.astype(time_column.dtype, copy=False)
+        columns[OPEN_PRICE_INDEX] = open_price[starts]
+        columns[HIGH_PRICE_INDEX] = np.maximum.reduceat(high, starts)
+        columns[LOW_PRICE_INDEX] = np.minimum.reduceat(low, starts)
+        columns[CLOSE_PRICE_INDEX] = close[ends]
+        columns[VOLUME_INDEX] = np.add.reduceat(volume, starts)
+
+        if isinstance(candles, Candles):
+            self.candles = Candles(columns)
+        else:
+            self.candles = np.stack(columns, axis=1).astype(candles.dtype, copy=False)
+
+        # A higher candle is closed once a base candle closing at or after its close time has arrived.
+        closes_bucket = open_time + base_seconds >= higher_open_time[self.index] + self.interval_in_seconds
+        self.closed = closes_bucket
+        self.last_closed_index = np.where(closes_bucket, self.index, self.index - 1)
+
+        # Partial aggregates of the higher candle of every base candle, up to and including it.
+        self._running_high, self._running_low = running_high_low(high, low, self.index)
+        cumulative_volume = np.cumsum(volume, dtype=np.float64)
+        self._running_volume = (
+            cumulative_volume - (cumulative_volume[starts] - volume[starts])[self.index]
+        ).astype(volume.dtype, copy=False)
+        self._close = close
+
+    def __len__(self):
+        return len(self.candles)
+
+    def closed_candles(self, i: int) -> Union[np.ndarray, Candles]:
+        """
+        :return: Higher candles closed at base candle i (a view).
+        """
+
+        return self.candles[:self.last_closed_index[i] + 1]
+
+    def last_closed(self, i: int) -> Optional[Tuple]:
+        index = self.last_closed_index[i]
+        if index < 0:
+            return None
+        return self.candles[index]
+
+    def in_progress(self, i: int) -> Optional[Tuple]:
+        if self.closed[i]:
+            return None
+
+        candle = self.candles[self.index[i]]
+        row = [None] * 6
+        row[OPEN_TIME_INDEX] = candle[OPEN_TIME_INDEX]
+        row[OPEN_PRICE_INDEX] = candle[OPEN_PRICE_INDEX]
+        row[HIGH_PRICE_INDEX] = self._running_high[i]
+        row[LOW_PRICE_INDEX] = self._running_low[i]
+        row[CLOSE_PRICE_INDEX] = self._close[i]
+        row[VOLUME_INDEX] = self._running_volume[i]
+        return tuple(row)
@@ -1,9 +1,9 @@
 from typing import Union
 
-import numba
 import numpy as np
 
 from .common import generate_random_string, generate_ascii
+from .jit import kernel
 from ..const.trade_actions import BUY, SELL
 
 from ..enum import OrderSide
@@ -27,6 +27,12 @@ def int_side_to_str(side: int):
         raise ValueError(f"Side must be {BUY} or {SELL}.")
 
 
+def side_to_int(side: Union[OrderSide, str, int]) -> int:
+    if isinstance(side, str):
+        return str_side_to_int(side)
+    return int(side)
+
+
 def opposite_side(side: int):
     if side == BUY:
         return SELL
@@ -36,9 +42,13 @@ def opposite_side(side: int):
         raise ValueError(f"Side must be {BUY} or {SELL}.")
 
 
-@numba.jit(nopython=True)
+@kernel(
+    "({dtype}[:], {dtype}[:], {dtype}[::1])",
+    "({dtype}[::1], {dtype}[::1], {dtype}[::1])",
+    nopython=True,
+)
 def calculate_ha_open(open, close, ha_close):
-    ha_open = np.empty(np.shape(open))
+    ha_open = np.empty_like(ha_close)
     ha_open[0] = (open[0] + close[0]) / 2
 
     for i in range(1, np.shape(open)[0]):
@@ -86,26 +96,33 @@ def calculate_profit(entry_price: float, exit_price: float, quantity: float, lev
 
 
 def calculate_pnl(
-        entry_price: float,
-        exit_price: float,
-        quantity: float,
-        side: Union[OrderSide, int],
-        leverage: int = 1,
+        entry_price: Union[float, np.ndarray],
+        exit_price: Union[float, np.ndarray],
+        quantity: Union[float, np.ndarray],
+        side: Union[OrderSide, str, int, np.ndarray],
+        leverage: Union[int, np.ndarray] = 1,
 ):
     """
+    Works on scalars and elementwise on numpy arrays (side as an integer array of BUY and SELL).
+
     :return: Tuple of 3: (initial margin, pnl, roe)
     """
 
-    side = str(side).upper()
-
-    if side == BUY:
-        pnl = (exit_price - entry_price) * quantity
-    elif side == SELL:
-        pnl = (entry_price - exit_price) * quantity
+    if isinstance(side, np.ndarray):
+        if not np.isin(side, (BUY, SELL)).all():
+            raise ValueError(f"Parameter side must be {BUY} or {SELL}")
+        direction = np.where(side == BUY, 1.0, -1.0)
     else:
-        raise ValueError(f"Parameter side must be {BUY} or {SELL}")
-
-    initial_margin = quantity * entry_price / leverage
+        side = side_to_int(side)
+        if side == BUY:
+            direction = 1.0
+        elif side == SELL:
+            direction = -1.0
+        else:
+            raise ValueError(f"Parameter side must be {BUY} or {SELL}")
+
+    pnl = (exit_price - entry_price) * quantity * direction
+    initial_margin = abs(quantity) * entry_price / leverage
     roe = pnl / initial_margin
 
     return initial_margin, pnl, roe
@@ -119,7 +136,7 @@ def calculate_target_price(
 ):
     diff = entry_price * roe / leverage
 
-    side = str(side).upper()
+    side = side_to_int(side)
 
     if side == BUY:
         return entry_price + diff
@@ -153,7 +170,7 @@ def create_position(
     stop_order = None
     if take_profit_price is not None:
         take_profit_order = Order.take_profit_market(symbol=symbol, side=exit_side, stop_price=take_profit_price)
-    elif stop_loss_price is not None:
+    if stop_loss_price is not None:
         stop_order = Order.stop_market(symbol=symbol, side=exit_side, stop_price=stop_loss_price)
 
     return entry_order, stop_order, take_profit_order
@@ -1,6 +1,44 @@
 # nopycln: file
 
-from .futures_trader import BinanceFuturesTrader
-from .balance import BinanceBalance
-from .position import BinancePosition
-from .symbol_info import BinanceSymbolInfo
+import importlib
+
+# Exports are imported on first access, so the modules which do not need python-binance
+# (portfolio_risk, metrics, simulator.exchange, ...) can be used without importing it.
+_EXPORTS = {
+    "BinanceFuturesTrader": ".futures_trader",
+    "BinanceBalance": ".balance",
+    "BinancePosition": ".position",
+    "AsyncBinancePosition": ".position",
+    "BinanceSymbolInfo": ".symbol_info",
+    "SymbolInfoCache": ".symbol_info_cache",
+    "AsyncSymbolInfoCache": ".symbol_info_cache",
+    "AccountState": ".account_state",
+    "AsyncBinanceFuturesTrader": ".async_futures_trader",
+    "KlineStream": ".kline_stream",
+    "RequestScheduler": ".rate_limit",
+    "ScheduledClient": ".rate_limit",
+    "OrderResult": ".batch",
+    "PortfolioRisk": ".portfolio_risk",
+    "RiskSnapshot": ".portfolio_risk",
+    "OrderStager": ".staged_order",
+    "StagedRequest": ".staged_order",
+    "LiveHost": ".host",
+    "pooled_client": ".host",
+    "run_sharded": ".host",
+    "RequestMetrics": ".metrics",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = globals()[name] = getattr(importlib.import_module(module, __name__), name)
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
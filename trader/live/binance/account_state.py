@@ -0,0 +1,258 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from binance.client import Client
+
+from trader.core.model import Order
+
+from ..log import logger
+from .balance import BinanceBalance
+from .portfolio_risk import BOTH, PortfolioRisk, RiskSnapshot
+
+_CLOSED_ORDER_STATUSES = ("FILLED", "CANCELED", "EXPIRED", "REJECTED")
+
+
+class PositionState:
+
+    __slots__ = "symbol", "quantity", "entry_price", "unrealized_profit", "position_side"
+
+    def __init__(
+            self,
+            symbol: str,
+            quantity: float,
+            entry_price: float,
+            unrealized_profit: float,
+            position_side=BOTH,
+    ):
+        self.symbol = symbol
+        self.quantity = quantity
+        self.entry_price = entry_price
+        self.unrealized_profit = unrealized_profit
+        self.position_side = position_side
+
+
+def _order_from_stream(data: dict) -> Order:
+    return Order.from_binance(dict(
+        symbol=data["s"],
+        type=data["o"],
+        side=data["S"],
+        origQty=data["q"],
+        price=data["p"],
+        stopPrice=data["sp"],
+        timeInForce=data["f"],
+        orderId=data["i"],
+        status=data["X"],
+    ))
+
+
+class AccountState:
+    """
+    In-memory mirror of the futures account: positions (per symbol and position side), balances,
+    open orders indexed by orderId and leverage per symbol.
+
+    Seeded once over REST, then kept up to date by user-data stream events passed to apply.
+    Events which arrive before the seed is finished are buffered and all of them are replayed after it,
+    in order: balances and positions of ACCOUNT_UPDATE are absolute, so replaying an event
+    the snapshot already contains is harmless, while dropping one it missed would lose the update.
+    Reads are taken under the lock and return copies (position states are replaced, never mutated).
+
+    ACCOUNT_UPDATE events carry the wallet balance but not the available balance,
+    so after one the available balances are queried again over REST on the next read.
+
+    Mark price stream events passed to apply_mark_price make unrealized PnL, ROE
+    and liquidation distance local computations (see PortfolioRisk).
+    """
+
+    def __init__(self):
+        self.positions: Dict[Tuple[str, str], PositionState] = {}
+        self.balances: Dict[str, BinanceBalance] = {}
+        self.orders: Dict[int, Order] = {}
+        self.leverages: Dict[str, int] = {}
+        self.risk = PortfolioRisk()
+
+        self.seeded = False
+        self._client: Optional[Client] = None
+        self._stale_available = False
+        self._buffer: List[dict] = []
+        self._lock = threading.RLock()
+
+    def seed(self, client: Client):
+        with self._lock:
+            self.seeded = False
+            self._client = client
+
+        account: dict = client.futures_account()
+        open_orders: List[dict] = client.futures_get_open_orders()
+
+        with self._lock:
+            self.balances = {
+                asset["asset"]: BinanceBalance(
+                    asset=asset["asset"],
+                    total=asset["walletBalance"],
+                    available=asset["availableBalance"],
+                )
+                for asset in account["assets"]
+            }
+            self._stale_available = False
+            for symbol, position_side in self.positions:
+                self.risk.set_position(symbol, 0.0, 0.0, position_side)
+            self.positions = {}
+            self.leverages = {}
+            for position in account["positions"]:
+                self._set_leverage(position["symbol"], int(position["leverage"]))
+                self._set_position(
+                    symbol=position["symbol"],
+                    quantity=float(position["positionAmt"]),
+                    entry_price=float(position["entryPrice"]),
+                    unrealized_profit=float(position["unrealizedProfit"]),
+                    position_side=position.get("positionSide", BOTH),
+                )
+            self.orders = {}
+            for data in open_orders:
+                try:
+                    order = Order.from_binance(data)
+                except ValueError:
+                    continue
+                self.orders[order.order_id] = order
+
+            self.seeded = True
+            buffer, self._buffer = self._buffer, []
+            for event in buffer:
+                self._apply(event)
+
+    def _set_leverage(self, symbol: str, leverage: int):
+        self.leverages[symbol] = leverage
+        self.risk.set_leverage(symbol, leverage)
+
+    def _set_position(
+            self,
+            symbol: str,
+            quantity: float,
+            entry_price: float,
+            unrealized_profit: float,
+            position_side=BOTH,
+    ):
+        self.risk.set_position(symbol, quantity, entry_price, position_side)
+        if quantity == 0.0:
+            self.positions.pop((symbol, position_side), None)
+        else:
+            self.positions[(symbol, position_side)] = PositionState(
+                symbol, quantity, entry_price, unrealized_profit, position_side,
+            )
+
+    def apply(self, event: dict):
+        """
+        Callback of the futures user-data stream.
+        """
+
+        with self._lock:
+            if not self.seeded:
+                self._buffer.append(event)
+            else:
+                self._apply(event)
+
+    def _apply(self, event: dict):
+        event_type = event.get("e")
+        if event_type == "ACCOUNT_UPDATE":
+            for balance in event["a"]["B"]:
+                previous = self.balances.get(balance["a"])
+                self.balances[balance["a"]] = BinanceBalance(
+                    asset=balance["a"],
+                    total=balance["wb"],
+                    available=0.0 if previous is None else previous.available,
+                )
+                self._stale_available = True
+            for position in event["a"]["P"]:
+                self._set_position(
+                    symbol=position["s"],
+                    quantity=float(position["pa"]),
+                    entry_price=float(position["ep"]),
+                    unrealized_profit=float(position["up"]),
+                    position_side=position.get("ps", BOTH),
+                )
+        elif event_type == "ORDER_TRADE_UPDATE":
+            data = event["o"]
+            if data["X"] in _CLOSED_ORDER_STATUSES:
+                self.orders.pop(data["i"], None)
+            else:
+                try:
+                    self.orders[data["i"]] = _order_from_stream(data)
+                except ValueError:
+                    logger.debug(f"Unsupported order type in stream: {data['o']}")
+        elif event_type == "ACCOUNT_CONFIG_UPDATE":
+            if "ac" in event:
+                self._set_leverage(event["ac"]["s"], int(event["ac"]["l"]))
+        elif event_type == "error":
+            logger.warning(f"User-data stream error: {event}")
+
+    def apply_mark_price(self, message):
+        """
+        Callback of the futures mark price streams (<symbol>@markPrice or !markPrice@arr, plain or combined).
+        """
+
+        data = message.get("data", message) if isinstance(message, dict) else message
+        for event in data if isinstance(data, list) else (data,):
+            if event.get("e") == "markPriceUpdate":
+                self.risk.set_mark_price(event["s"], float(event["p"]))
+            elif event.get("e") == "error":
+                logger.warning(f"Mark price stream error: {event}")
+
+    def get_position(self, symbol: str, position_side: str = None) -> Optional[PositionState]:
+        """
+        :param position_side: BOTH, LONG or SHORT. Defaults to the one-way position,
+            or in hedge mode to the LONG position if it is open, else the SHORT one.
+        """
+
+        symbol = symbol.upper()
+        with self._lock:
+            if position_side is not None:
+                return self.positions.get((symbol, position_side))
+
+            for position_side in (BOTH, "LONG", "SHORT"):
+                position = self.positions.get((symbol, position_side))
+                if position is not None:
+                    return position
+
+    def get_positions(self) -> List[PositionState]:
+        with self._lock:
+            return list(self.positions.values())
+
+    def _refresh_available(self):
+        balances: List[dict] = self._client.futures_account_balance()
+
+        with self._lock:
+            for balance in balances:
+                current = self.balances.get(balance["asset"])
+                if current is not None:
+                    current.available = float(balance["availableBalance"])
+            self._stale_available = False
+
+    def get_balances(self) -> List[BinanceBalance]:
+        if self._stale_available and self._client is not None:
+            self._refresh_available()
+
+        with self._lock:
+            return [
+                BinanceBalance(asset=balance.asset, total=balance.total, available=balance.available)
+                for balance in self.balances.values()
+                if balance.total > 0.0
+            ]
+
+    def get_open_orders(self, symbol: str = None) -> List[Order]:
+        with self._lock:
+            return [order for order in self.orders.values() if symbol is None or order.symbol == symbol]
+
+    def get_leverage(self, symbol: str) -> int:
+        with self._lock:
+            return self.leverages[symbol.upper()]
+
+    def unrealized_profit(self, symbol: str, position_side: str = None) -> float:
+        position = self.get_position(symbol, position_side)
+        if position is None:
+            return 0.0
+        if self.risk.has_mark_price(position.symbol):
+            return self.risk.unrealized_profit(position.symbol, position.position_side)
+        return position.unrealized_profit
+
+    def risk_snapshot(self) -> RiskSnapshot:
+        return self.risk.snapshot()
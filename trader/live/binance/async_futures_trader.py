@@ -0,0 +1,230 @@
+import asyncio
+import json
+from typing import Dict, Iterable, List, Optional
+
+import aiohttp
+from binance import AsyncClient
+from binance.exceptions import BinanceAPIException
+
+from ...core.interface import FuturesTrader
+from ...core.const.trade_actions import BUY
+from ...core.model import Order
+from ...core.util.trade import create_position
+
+from .balance import BinanceBalance
+from .batch import MAX_BATCH_CANCEL, OrderResult, chunk, map_batch_response
+from .position import AsyncBinancePosition
+from .symbol_info import BinanceSymbolInfo
+from .symbol_info_cache import AsyncSymbolInfoCache
+
+
+class AsyncBinanceFuturesTrader(FuturesTrader):
+    """
+    Asyncio counterpart of BinanceFuturesTrader on binance.AsyncClient.
+
+    Every method is a coroutine. The client's aiohttp session keeps connections alive,
+    the *_many methods run independent calls (per-symbol orders, cancels, state queries) concurrently.
+    """
+
+    def __init__(self, client: AsyncClient, symbol_info_cache: AsyncSymbolInfoCache = None):
+        self.client = client
+        if symbol_info_cache is None:
+            symbol_info_cache = AsyncSymbolInfoCache(client)
+        self.symbol_info_cache = symbol_info_cache
+
+    @classmethod
+    async def create(
+            cls,
+            api_key: str = None,
+            api_secret: str = None,
+            pool_size=100,
+            keepalive_timeout=60.0,
+            **client_kwargs,
+    ) -> 'AsyncBinanceFuturesTrader':
+        """
+        Creates an AsyncClient with a keep-alive connection pool of pool_size connections.
+        """
+
+        connector = aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=keepalive_timeout)
+        client = await AsyncClient.create(
+            api_key=api_key,
+            api_secret=api_secret,
+            session_params=dict(connector=connector),
+            **client_kwargs,
+        )
+        return cls(client)
+
+    async def close(self):
+        await self.client.close_connection()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close_position(self, symbol: str):
+        position = await self.get_position(symbol=symbol)
+
+        if position is not None:
+            symbol_info = await self.get_symbol_info(symbol)
+            order = Order.market(
+                symbol=symbol,
+                side="SELL" if position.side == BUY else "BUY",
+                quantity=position.quantity,
+            )
+            order.reduce_only = True
+            await self.client.futures_create_order(
+                **order.to_binance_order(quantizer=symbol_info.quantizer)
+            )
+
+    async def close_positions(self, *symbols: str):
+        await asyncio.gather(*(self.close_position(symbol) for symbol in symbols))
+
+    async def get_leverage(self, symbol) -> int:
+        position = await self._get_position_info(symbol)
+        return int(position["leverage"])
+
+    async def create_position(
+            self,
+            symbol: str,
+            quantity: float,
+            price: float = None,
+            take_profit_price: float = None,
+            stop_loss_price: float = None,
+    ) -> List[Order]:
+        orders = create_position(
+            symbol=symbol,
+            quantity=quantity,
+            price=price,
+            take_profit_price=take_profit_price,
+            stop_loss_price=stop_loss_price
+        )
+
+        symbol_info = await self.get_symbol_info(symbol=symbol)
+        batch_orders = [
+            order.to_binance_order(quantizer=symbol_info.quantizer)
+            for order in orders
+            if order is not None
+        ]
+        binance_orders = await self.client.futures_place_batch_order(batchOrders=batch_orders)
+
+        return [Order.from_binance(order) for order in binance_orders]
+
+    async def create_positions(self, positions: Iterable[dict]) -> List[List[Order]]:
+        """
+        :param positions: create_position keyword arguments, one dict per symbol.
+        """
+
+        return list(await asyncio.gather(*(self.create_position(**position) for position in positions)))
+
+    async def create_order(self, order: Order) -> Order:
+        symbol_info = await self.get_symbol_info(symbol=order.symbol)
+        order = await self.client.futures_create_order(
+            **order.to_binance_order(quantizer=symbol_info.quantizer)
+        )
+        return Order.from_binance(order)
+
+    async def create_orders(self, *orders: Order) -> List[Order]:
+        return list(await asyncio.gather(*(self.create_order(order) for order in orders)))
+
+    async def _cancel_batch(self, symbol: str, orders: List[Order]) -> List[OrderResult]:
+        try:
+            responses = await self.client.futures_cancel_orders(
+                symbol=symbol,
+                orderIdList=json.dumps([order.order_id for order in orders]),
+            )
+        except BinanceAPIException as e:
+            return [OrderResult(order, error=f"{e.code}: {e.message}") for order in orders]
+        return map_batch_response(orders, responses)
+
+    async def cancel_orders(self, *orders: Order) -> List[OrderResult]:
+        """
+        Cancels the orders in batches of at most 10 per symbol, sent concurrently.
+
+        :return: One result per order, in the order of the arguments.
+        """
+
+        by_symbol: Dict[str, List[Order]] = {}
+        for order in orders:
+            by_symbol.setdefault(order.symbol, []).append(order)
+
+        batches = await asyncio.gather(*(
+            self._cancel_batch(symbol, batch)
+            for symbol, symbol_orders in by_symbol.items()
+            for batch in chunk(symbol_orders, MAX_BATCH_CANCEL)
+        ))
+
+        results = {id(result.order): result for batch in batches for result in batch}
+        return [results[id(order)] for order in orders]
+
+    async def cancel_symbol_orders(self, *symbols: str) -> List[Dict]:
+        return list(await asyncio.gather(*(
+            self.client.futures_cancel_all_open_orders(symbol=symbol)
+            for symbol in symbols
+        )))
+
+    async def get_open_orders(self, symbol: str = None) -> List[Order]:
+        params = {} if symbol is None else dict(symbol=symbol)
+        open_orders: List[Dict] = await self.client.futures_get_open_orders(**params)
+        return [Order.from_binance(order) for order in open_orders]
+
+    async def get_open_orders_many(self, *symbols: str) -> Dict[str, List[Order]]:
+        results = await asyncio.gather(*(self.get_open_orders(symbol) for symbol in symbols))
+        return dict(zip(symbols, results))
+
+    async def get_balances(self) -> List[BinanceBalance]:
+        balances: List[Dict] = await self.client.futures_account_balance()
+
+        return [
+            BinanceBalance(
+                asset=balance["asset"],
+                total=balance["balance"],
+                available=balance["withdrawAvailable"],
+            )
+            for balance in balances
+            if float(balance["balance"]) > 0.0
+        ]
+
+    async def get_balance(self, asset: str) -> BinanceBalance:
+        for balance in await self.get_balances():
+            if balance.asset == asset:
+                return balance
+
+        raise ValueError(f"No available {asset!r} balance.")
+
+    async def _get_position_info(self, symbol: str) -> dict:
+        symbol = symbol.upper()
+        for position in (await self.client.futures_account())["positions"]:
+            if position["symbol"] == symbol:
+                return position
+
+        raise ValueError(f"Symbol with name: {symbol} is not found")
+
+    async def get_positions(self) -> List[AsyncBinancePosition]:
+        positions: List[Dict] = (await self.client.futures_account())["positions"]
+
+        return [
+            AsyncBinancePosition.from_binance(self.client, position)
+            for position in positions
+            if float(position["positionAmt"]) != .0
+        ]
+
+    async def get_position(self, symbol: str) -> Optional[AsyncBinancePosition]:
+        for position in await self.get_positions():
+            if position.symbol == symbol:
+                return position
+
+    async def get_all_symbol_info(self) -> List[BinanceSymbolInfo]:
+        return await self.symbol_info_cache.get_all()
+
+    async def get_symbol_info(self, symbol: str) -> BinanceSymbolInfo:
+        return await self.symbol_info_cache.get(symbol)
+
+    async def set_leverage(self, symbol: str, leverage: int):
+        await self.client.futures_change_leverage(symbol=symbol, leverage=leverage)
+
+    async def set_leverage_many(self, leverages: Dict[str, int]):
+        await asyncio.gather(*(
+            self.set_leverage(symbol, leverage) for symbol, leverage in leverages.items()
+        ))
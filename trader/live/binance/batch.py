@@ -0,0 +1,50 @@
+from typing import Iterable, List, Optional, TypeVar
+
+from trader.core.model import Order
+
+MAX_BATCH_CANCEL = 10
+MAX_BATCH_MODIFY = 5
+
+T = TypeVar("T")
+
+
+def chunk(items: List[T], size: int) -> Iterable[List[T]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class OrderResult:
+    """
+    Outcome of one order of a batch request, mapped back to the originating Order.
+    """
+
+    __slots__ = "order", "response", "error"
+
+    def __init__(self, order: Order, response: Optional[dict] = None, error: Optional[str] = None):
+        self.order = order
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __str__(self):
+        return f"{self.order.order_id}: {self.error if self.error is not None else 'OK'}"
+
+
+def map_batch_response(orders: List[Order], responses: List[dict]) -> List[OrderResult]:
+    """
+    Binance answers a batch with one entry per request item, in order,
+    which is either the order or an error with code and msg.
+    """
+
+    results = []
+    for order, response in zip(orders, responses):
+        if "code" in response and "orderId" not in response:
+            results.append(OrderResult(order, response, error=f"{response['code']}: {response.get('msg')}"))
+        else:
+            order.order_id = response.get("orderId", order.order_id)
+            order.status = response.get("status", order.status)
+            results.append(OrderResult(order, response))
+    return results
@@ -1,22 +1,125 @@
-from typing import Dict, List, Optional
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 
 from binance.client import Client
+from binance.exceptions import BinanceAPIException
 
 from ...core.interface import FuturesTrader
 from ...core.const.trade_actions import BUY
 from ...core.model import Order
 from ...core.util.trade import create_position
 
-from ..binance import BinanceBalance
-from ..binance import BinancePosition
-from ..binance import BinanceSymbolInfo
-from ..binance.helpers import get_symbol_info, get_position_info
+from .account_state import AccountState
+from .portfolio_risk import RiskSnapshot
+from .balance import BinanceBalance
+from .batch import MAX_BATCH_CANCEL, MAX_BATCH_MODIFY, OrderResult, chunk, map_batch_response
+from .position import BinancePosition
+from .symbol_info import BinanceSymbolInfo
+from .symbol_info_cache import SymbolInfoCache, shared_symbol_info_cache
+from .helpers import get_position_info
+from .metrics import RequestMetrics
+from .rate_limit import RequestScheduler, ScheduledClient
+from .staged_order import OrderStager, StagedRequest
 
 
 class BinanceFuturesTrader(FuturesTrader):
 
-    def __init__(self, client: Client):
-        self.client = client
+    def __init__(
+            self,
+            client: Client,
+            symbol_info_cache: SymbolInfoCache = None,
+            account_state: AccountState = None,
+            scheduler: RequestScheduler = None,
+    ):
+        """
+        :param account_state: If given, positions, balances, open orders and leverage
+            are read from this stream-driven mirror instead of REST (see start_user_data_stream).
+        :param scheduler: Rate-limit scheduler of the futures REST calls.
+            Traders sharing a client (and IP) should share one. Defaults to a new scheduler.
+        """
+
+        if symbol_info_cache is None:
+            symbol_info_cache = shared_symbol_info_cache(client)
+        self.symbol_info_cache = symbol_info_cache
+
+        if scheduler is None:
+            scheduler = RequestScheduler()
+        self.scheduler = scheduler
+        self.client = ScheduledClient(client, scheduler)
+        self.account_state = account_state
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stager: Optional[OrderStager] = None
+
+    @property
+    def metrics(self) -> RequestMetrics:
+        """
+        Per-endpoint latency, weight and error metrics of the REST calls of this trader's scheduler.
+        """
+
+        return self.scheduler.metrics
+
+    def metrics_snapshot(self) -> Dict[str, dict]:
+        return self.scheduler.metrics.snapshot()
+
+    def start_metrics_logging(self, interval=60.0):
+        self.scheduler.metrics.start_logging(interval)
+
+    def _run_concurrently(self, calls: List[Callable[[], List[OrderResult]]]) -> List[OrderResult]:
+        if len(calls) == 1:
+            return calls[0]()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="binance-batch")
+
+        futures = [self._executor.submit(call) for call in calls]
+        return [result for future in futures for result in future.result()]
+
+    def _is_mirrored(self):
+        return self.account_state is not None and self.account_state.seeded
+
+    def start_user_data_stream(self, websocket_manager) -> str:
+        """
+        Subscribes the account mirror to the futures user-data stream and seeds it over REST.
+
+        :param websocket_manager: Started binance.ThreadedWebsocketManager (or anything with the same
+            start_futures_user_socket method, like a local fake stream).
+        :return: Stream name.
+        """
+
+        if self.account_state is None:
+            self.account_state = AccountState()
+
+        stream_name = websocket_manager.start_futures_user_socket(callback=self.account_state.apply)
+        self.account_state.seed(self.client)
+        return stream_name
+
+    def start_mark_price_stream(self, websocket_manager, symbols: List[str] = None) -> str:
+        """
+        Feeds mark prices to the account mirror, so unrealized PnL, ROE and
+        liquidation distance of the positions are computed locally.
+
+        :param symbols: Defaults to every symbol (!markPrice@arr@1s).
+        :return: Stream name.
+        """
+
+        if self.account_state is None:
+            self.account_state = AccountState()
+
+        if symbols is None:
+            streams = ["!markPrice@arr@1s"]
+        else:
+            streams = [f"{symbol.lower()}@markPrice@1s" for symbol in symbols]
+
+        return websocket_manager.start_futures_multiplex_socket(
+            callback=self.account_state.apply_mark_price,
+            streams=streams,
+        )
+
+    def get_risk_snapshot(self) -> RiskSnapshot:
+        if not self._is_mirrored():
+            raise ValueError("Risk snapshot needs a seeded account state (see start_user_data_stream).")
+        return self.account_state.risk_snapshot()
 
     def close_position(self, symbol: str):
         position = self.get_position(symbol=symbol)
@@ -29,9 +132,12 @@ class BinanceFuturesTrader(FuturesTrader):
                 side=side,
                 quantity=position.quantity,
             )
-            self.client.futures_create_order(**order)
+            order.reduce_only = True
+            self.create_order(order)
 
     def get_leverage(self, symbol) -> int:
+        if self._is_mirrored():
+            return self.account_state.get_leverage(symbol)
         return int(get_position_info(self.client, symbol)["leverage"])
 
     def create_position(
@@ -52,7 +158,9 @@ class BinanceFuturesTrader(FuturesTrader):
         )
 
         symbol_info = self.get_symbol_info(symbol=symbol)
-        orders = dict(batchOrders=[order.to_binance_order(symbol_info) for order in orders if order is not None])
+        orders = dict(batchOrders=[
+            order.to_binance_order(quantizer=symbol_info.quantizer) for order in orders if order is not None
+        ])
 
         binance_orders = self.client.futures_place_batch_order(**orders)
 
@@ -61,19 +169,154 @@ class BinanceFuturesTrader(FuturesTrader):
     def create_order(self, order: Order) -> Order:
         symbol_info = self.get_symbol_info(symbol=order.symbol)
         order = self.client.futures_create_order(
-            **order.to_binance_order(
-                price_precision=symbol_info.price_precision,
-                quantity_precision=symbol_info.quantity_precision
-            )
+            **order.to_binance_order(quantizer=symbol_info.quantizer)
         )
         return Order.from_binance(order)
 
-    def cancel_orders(self, *orders: Order) -> List[Order]:
+    @property
+    def stager(self) -> OrderStager:
+        if self._stager is None:
+            self._stager = OrderStager(self.client, self.symbol_info_cache)
+        return self._stager
+
+    def stage_orders(self, *orders: Order) -> List[StagedRequest]:
+        """
+        Prepares orders to be sent later with send_staged, in batches of up to 5 orders per symbol.
+        """
+
+        orders_by_symbol: Dict[str, List[Order]] = {}
+        for order in orders:
+            orders_by_symbol.setdefault(order.symbol, []).append(order)
+
         return [
-            self.client.futures_cancel_order(symbol=order.symbol, orderId=order.order_id)
-            for order in orders
+            self.stager.stage(batch[0]) if len(batch) == 1 else self.stager.stage_batch(batch)
+            for symbol_orders in orders_by_symbol.values()
+            for batch in chunk(symbol_orders, MAX_BATCH_MODIFY)
         ]
 
+    def stage_position(
+            self,
+            symbol: str,
+            quantity: float,
+            price: float = None,
+            take_profit_price: float = None,
+            stop_loss_price: float = None,
+    ) -> StagedRequest:
+        return self.stager.stage_position(
+            symbol=symbol,
+            quantity=quantity,
+            price=price,
+            take_profit_price=take_profit_price,
+            stop_loss_price=stop_loss_price,
+        )
+
+    def send_staged(self, *staged: StagedRequest) -> List[OrderResult]:
+        return self._run_concurrently([
+            lambda request=request: self.stager.send(request) for request in staged
+        ])
+
+    def _cancel_batch(self, symbol: str, orders: List[Order]) -> List[OrderResult]:
+        try:
+            responses = self.client.futures_cancel_orders(
+                symbol=symbol,
+                orderIdList=json.dumps([order.order_id for order in orders]),
+            )
+        except BinanceAPIException as e:
+            return [OrderResult(order, error=f"{e.code}: {e.message}") for order in orders]
+        return map_batch_response(orders, responses)
+
+    def cancel_orders(self, *orders: Order) -> List[OrderResult]:
+        """
+        Cancels the orders in batches of at most 10 per symbol, sent concurrently.
+
+        :return: One result per order, in the order of the arguments.
+        """
+
+        by_symbol: Dict[str, List[Order]] = {}
+        for order in orders:
+            by_symbol.setdefault(order.symbol, []).append(order)
+
+        calls = [
+            lambda symbol=symbol, batch=batch: self._cancel_batch(symbol, batch)
+            for symbol, symbol_orders in by_symbol.items()
+            for batch in chunk(symbol_orders, MAX_BATCH_CANCEL)
+        ]
+        if not calls:
+            return []
+
+        results = {id(result.order): result for result in self._run_concurrently(calls)}
+        return [results[id(order)] for order in orders]
+
+    def _modification_error(self, order: Order) -> Optional[str]:
+        if str(order.type).upper() != "LIMIT":
+            return f"Only LIMIT orders can be modified, got {order.type}."
+        if order.order_id is None:
+            return "Order has no order id."
+        if order.price is None or order.quantity is None:
+            return "Order needs a price and a quantity."
+        try:
+            self.get_symbol_info(order.symbol)
+        except ValueError as e:
+            return str(e)
+        return None
+
+    def _to_modification(self, order: Order) -> dict:
+        symbol_info = self.get_symbol_info(order.symbol)
+        return dict(
+            symbol=order.symbol,
+            orderId=order.order_id,
+            side=order.side_as_str(),
+            quantity=symbol_info.quantizer.format_quantity(order.quantity),
+            price=symbol_info.quantizer.format_price(order.price),
+        )
+
+    def _modify_batch(self, orders: List[Order]) -> List[OrderResult]:
+        try:
+            responses = self.client.futures_v1_put_batch_orders(
+                batchOrders=json.dumps([self._to_modification(order) for order in orders]),
+            )
+        except BinanceAPIException as e:
+            return [OrderResult(order, error=f"{e.code}: {e.message}") for order in orders]
+        return map_batch_response(orders, responses)
+
+    def _modify_one(self, order: Order) -> List[OrderResult]:
+        try:
+            response = self.client.futures_modify_order(**self._to_modification(order))
+        except BinanceAPIException as e:
+            return [OrderResult(order, error=f"{e.code}: {e.message}")]
+        return map_batch_response([order], [response])
+
+    def modify_orders(self, *orders: Order) -> List[OrderResult]:
+        """
+        Amends open LIMIT orders to their current price and quantity,
+        in batches of at most 5, sent concurrently.
+        Falls back to concurrent single amends if the client has no batch modify endpoint.
+        Orders which can not be amended (not LIMIT, no order id, price or quantity) fail without a request.
+
+        :return: One result per order, in the order of the arguments.
+        """
+
+        results: Dict[int, OrderResult] = {}
+        valid_orders = []
+        for order in orders:
+            error = self._modification_error(order)
+            if error is None:
+                valid_orders.append(order)
+            else:
+                results[id(order)] = OrderResult(order, error=error)
+
+        if hasattr(self.client.client, "futures_v1_put_batch_orders"):
+            calls = [
+                lambda batch=batch: self._modify_batch(batch)
+                for batch in chunk(valid_orders, MAX_BATCH_MODIFY)
+            ]
+        else:
+            calls = [lambda order=order: self._modify_one(order) for order in valid_orders]
+        if calls:
+            results.update((id(result.order), result) for result in self._run_concurrently(calls))
+
+        return [results[id(order)] for order in orders]
+
     def cancel_symbol_orders(self, symbol: str) -> List[Order]:
         canceled_orders: List[Dict] = self.client.futures_cancel_all_open_orders(
             symbol=symbol
@@ -82,10 +325,16 @@ class BinanceFuturesTrader(FuturesTrader):
         return [Order.from_binance(order) for order in canceled_orders]
 
     def get_open_orders(self, symbol: str = None) -> List[Order]:
+        if self._is_mirrored():
+            return self.account_state.get_open_orders(symbol)
+
         open_orders: List[Dict] = self.client.futures_get_open_orders(symbol=symbol)
         return [Order.from_binance(order) for order in open_orders]
 
     def get_balances(self) -> List[BinanceBalance]:
+        if self._is_mirrored():
+            return self.account_state.get_balances()
+
         balances: List[Dict] = self.client.futures_account_balance()
 
         return [
@@ -105,27 +354,47 @@ class BinanceFuturesTrader(FuturesTrader):
 
         raise ValueError(f"No available {asset!r} balance.")
 
+    def _mirrored_position(self, position) -> BinancePosition:
+        return BinancePosition(
+            client=self.client,
+            account_state=self.account_state,
+            symbol=position.symbol,
+            quantity=position.quantity,
+            entry_price=position.entry_price,
+            leverage=self.account_state.get_leverage(position.symbol),
+            position_side=position.position_side,
+        )
+
     def get_positions(self) -> List[BinancePosition]:
+        if self._is_mirrored():
+            return [self._mirrored_position(position) for position in self.account_state.get_positions()]
+
         positions: List[Dict] = self.client.futures_account()["positions"]
 
         return [
-            BinancePosition(**position)
+            BinancePosition.from_binance(self.client, position)
             for position in positions
             if float(position["positionAmt"]) != .0
         ]
 
     def get_position(self, symbol: str) -> Optional[BinancePosition]:
+        if self._is_mirrored():
+            position = self.account_state.get_position(symbol)
+            return None if position is None else self._mirrored_position(position)
+
         for position in self.get_positions():
             if position.symbol == symbol:
                 return position
 
     def get_all_symbol_info(self) -> List[BinanceSymbolInfo]:
-        exchange_info: dict = self.client.futures_exchange_info()
+        """
+        Served from the symbol info cache, which loads it on the first call and keeps it fresh.
+        """
 
-        return [BinanceSymbolInfo(**symbol_info) for symbol_info in exchange_info["symbols"]]
+        return self.symbol_info_cache.get_all()
 
     def get_symbol_info(self, symbol: str) -> BinanceSymbolInfo:
-        return get_symbol_info(self.client, symbol)
+        return self.symbol_info_cache.get(symbol)
 
     def set_leverage(self, symbol: str, leverage: int):
         self.client.futures_change_leverage(symbol=symbol, leverage=leverage)
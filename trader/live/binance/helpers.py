@@ -1,11 +1,11 @@
+import time
 from typing import Optional, List
 from binance.client import Client
 
-from position import BinancePosition
-from symbol_info import BinanceSymbolInfo
 from trader.core.enum import OrderType
 from trader.core.const.trade_actions import BUY
-from trader.core.util.common import round_down
+
+from .symbol_info_cache import shared_symbol_info_cache
 
 
 def get_open_position(self, symbol: str) -> Optional[dict]:
@@ -16,28 +16,42 @@ def get_open_position(self, symbol: str) -> Optional[dict]:
             return position
 
 
-def get_symbol_info(client: Client, symbol: str):
-    symbol = symbol.upper()
+def server_time_offset(client: Client, samples=5) -> float:
+    """
+    :return: Seconds to add to the local clock to get the exchange clock,
+        taken from the sample with the shortest round trip.
+    """
 
-    for symbol_info in client.futures_exchange_info()["symbols"]:
-        if symbol_info["symbol"] == symbol:
-            return BinanceSymbolInfo(**symbol_info)
+    best_round_trip = None
+    offset = 0.0
+    for _ in range(samples):
+        sent = time.time()
+        server_time = client.futures_time()["serverTime"] / 1000
+        received = time.time()
 
-    raise ValueError(f"Invalid symbol: {symbol}")
+        if best_round_trip is None or received - sent < best_round_trip:
+            best_round_trip = received - sent
+            offset = server_time - (sent + received) / 2
+    return offset
 
 
-def get_position_info(client: Client, symbol: str):
+def get_symbol_info(client: Client, symbol: str):
+    return shared_symbol_info_cache(client).get(symbol)
+
+
+def get_position_info(client: Client, symbol: str) -> dict:
     symbol = symbol.upper()
 
     for position in client.futures_account()["positions"]:
         if position["symbol"] == symbol:
-            return BinancePosition(client=client, **position)
+            return position
 
     raise ValueError(f"Symbol with name: {symbol} is not found")
 
 
-def close_position(client: Client, position: BinancePosition, close_price: float = None):
+def close_position(client: Client, position: 'BinancePosition', close_price: float = None):
     close_side = "SELL" if position.side == BUY else "BUY"
+    symbol_info = get_symbol_info(client, position.symbol)
 
     if close_price is None:
         # Can't use closePosition="true" because it can only be used with STOP_MARKET and TAKE_PROFIT_MARKET orders
@@ -45,12 +59,11 @@ def close_position(client: Client, position: BinancePosition, close_price: float
             symbol=position.symbol,
             side=close_side,
             type=str(OrderType.MARKET),
-            quantity=str(abs(position.quantity)),
+            quantity=symbol_info.quantizer.format_quantity(position.quantity),
             reduceOnly="true",
         )
     else:
-        symbol_info = get_symbol_info(client, position.symbol)
-        close_price = round_down(close_price, symbol_info.price_precision)
+        close_price = symbol_info.quantizer.format_price(close_price)
 
         client.futures_create_order(
             symbol=position.symbol,
@@ -0,0 +1,141 @@
+import multiprocessing
+from typing import Callable, Dict, Iterable, List
+
+from binance import ThreadedWebsocketManager
+from binance.client import Client
+from requests.adapters import HTTPAdapter
+
+from trader.core.strategy import Strategy
+from trader.core.util.jit import warmup
+
+from ..log import logger
+from ..runner import Clock, LiveRunner
+from .futures_trader import BinanceFuturesTrader
+from .helpers import server_time_offset
+from .kline_stream import KlineStream
+
+StrategyFactory = Callable[[str, BinanceFuturesTrader], Strategy]
+
+
+def pooled_client(api_key: str, api_secret: str, pool_size=32, **client_kwargs) -> Client:
+    """
+    Client whose session keeps up to pool_size keep-alive connections to the API host.
+    """
+
+    client = Client(api_key, api_secret, **client_kwargs)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    client.session.mount("https://", adapter)
+    client.session.mount("http://", adapter)
+    return client
+
+
+class LiveHost:
+    """
+    Runs the strategies of many symbols in one process.
+
+    Every strategy shares one trader, so one pooled client, one symbol info cache,
+    one rate-limit scheduler and one user-data stream.
+    Closed candles of every symbol arrive on combined kline streams (200 symbols per connection)
+    and a LiveRunner evaluates the symbols concurrently on a thread pool at each candle close.
+
+    :param strategy_factory: Called with (symbol, trader) for every symbol.
+    :param max_workers: Number of symbols evaluated at the same time.
+    """
+
+    def __init__(
+            self,
+            client: Client,
+            strategy_factory: StrategyFactory,
+            symbols: Iterable[str],
+            interval: str,
+            capacity=1000,
+            max_workers: int = None,
+    ):
+        self.client = client
+        self.trader = BinanceFuturesTrader(client)
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.stream = KlineStream(self.trader.client, self.symbols, interval, capacity)
+        self.strategies: Dict[str, Strategy] = {
+            symbol: strategy_factory(symbol, self.trader) for symbol in self.symbols
+        }
+        self.runner = LiveRunner(self.strategies, self.stream, interval, max_workers=max_workers)
+        self.websocket_manager = None
+
+    def start(self, websocket_manager=None, warm_up_workers=8):
+        """
+        Loads the symbol infos, subscribes to the streams and loads the candle history.
+        The JIT kernels are compiled (or loaded from the disk cache) meanwhile on a background thread.
+
+        :param websocket_manager: Started binance.ThreadedWebsocketManager.
+            Defaults to a new one with the keys of the client.
+        """
+
+        if websocket_manager is None:
+            websocket_manager = ThreadedWebsocketManager(self.client.API_KEY, self.client.API_SECRET)
+            websocket_manager.start()
+        self.websocket_manager = websocket_manager
+        jit_warmup = warmup(background=True)
+
+        self.runner.clock = Clock(server_time_offset(self.client))
+        self.trader.get_all_symbol_info()
+        self.trader.start_user_data_stream(websocket_manager)
+        self.stream.start(websocket_manager, max_workers=warm_up_workers)
+        jit_warmup.join()
+        logger.info(f"Hosting {len(self.symbols)} symbols on {len(self.stream.stream_names)} kline connections.")
+
+    def run(self, closes: int = None):
+        self.runner.run(closes)
+
+    def stop(self):
+        self.runner.stop()
+        if self.websocket_manager is not None:
+            self.websocket_manager.stop()
+
+
+def _run_shard(
+        api_key: str,
+        api_secret: str,
+        strategy_factory: StrategyFactory,
+        symbols: List[str],
+        interval: str,
+        host_kwargs: dict,
+):
+    host = LiveHost(pooled_client(api_key, api_secret), strategy_factory, symbols, interval, **host_kwargs)
+    host.start()
+    try:
+        host.run()
+    finally:
+        host.stop()
+
+
+def run_sharded(
+        api_key: str,
+        api_secret: str,
+        strategy_factory: StrategyFactory,
+        symbols: Iterable[str],
+        interval: str,
+        processes: int = None,
+        **host_kwargs,
+):
+    """
+    Splits the symbols over processes, each running one LiveHost, for CPU-bound strategies.
+
+    Every process opens its own client and streams, so connections grow with the number
+    of processes, not with the number of symbols. strategy_factory must be picklable.
+    """
+
+    symbols = [symbol.upper() for symbol in symbols]
+    processes = min(processes or multiprocessing.cpu_count(), len(symbols))
+
+    workers = [
+        multiprocessing.Process(
+            target=_run_shard,
+            args=(api_key, api_secret, strategy_factory, symbols[i::processes], interval, host_kwargs),
+            name=f"live-shard-{i}",
+        )
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
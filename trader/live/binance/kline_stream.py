@@ -0,0 +1,209 @@
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from binance.client import Client
+
+from trader.core.strategy import Strategy
+from trader.core.util.common import interval_to_seconds
+
+from ..candle_buffer import CandleRingBuffer
+from ..log import logger
+from ..runner import CandleFeed
+
+_MAX_KLINES_PER_REQUEST = 1500
+_MAX_STREAMS_PER_CONNECTION = 200
+
+CandleCallback = Callable[[str, np.ndarray], None]
+
+
+def klines_to_candles(klines: List[list]) -> np.ndarray:
+    """
+    Converts REST klines to the candles layout (open time in seconds).
+    """
+
+    candles = np.array([kline[:6] for kline in klines], dtype=np.float64).reshape(-1, 6)
+    candles[:, 0] /= 1000
+    return candles
+
+
+class KlineStream(CandleFeed):
+    """
+    Consumes closed futures klines of many symbols from one multiplexed websocket
+    into a CandleRingBuffer per symbol.
+
+    Missing candles (reconnects, late start) are backfilled by bulk REST requests.
+    After every candle close the strategy of the symbol (if any) and the callbacks
+    get a contiguous view of the buffer.
+    """
+
+    def __init__(
+            self,
+            client: Client,
+            symbols: Iterable[str],
+            interval: str,
+            capacity=1000,
+            strategies: Dict[str, Strategy] = None,
+    ):
+        self.client = client
+        self.interval = interval
+        self.interval_in_seconds = interval_to_seconds(interval)
+        self.buffers: Dict[str, CandleRingBuffer] = {
+            symbol.upper(): CandleRingBuffer(capacity) for symbol in symbols
+        }
+        self.strategies: Dict[str, Strategy] = {
+            symbol.upper(): strategy for symbol, strategy in (strategies or {}).items()
+        }
+        self.callbacks: List[CandleCallback] = []
+        self.stream_names: List[str] = []
+
+        # Messages held back while the history is loaded, None when not loading.
+        self._held: Optional[List[dict]] = None
+        self._held_lock = threading.Lock()
+
+    def add_callback(self, callback: CandleCallback):
+        self.callbacks.append(callback)
+
+    def candles(self, symbol: str, close_time: float = None) -> Optional[np.ndarray]:
+        """
+        :param close_time: If given, None is returned until the candle closed at close_time has arrived.
+        """
+
+        buffer = self.buffers[symbol.upper()]
+        if close_time is not None:
+            last_open_time = buffer.last_open_time
+            if last_open_time is None or last_open_time + self.interval_in_seconds < close_time:
+                return None
+        return buffer.view()
+
+    def backfill(self, symbol: str, end_time: float = None):
+        """
+        Loads the candles missing from the buffer of symbol, up to end_time (exclusive, in seconds).
+        Defaults to the open time of the current, still open candle.
+        """
+
+        buffer = self.buffers[symbol]
+        if end_time is None:
+            end_time = time.time() // self.interval_in_seconds * self.interval_in_seconds
+
+        if buffer.last_open_time is None:
+            start_time = end_time - buffer.capacity * self.interval_in_seconds
+        else:
+            start_time = buffer.last_open_time + self.interval_in_seconds
+
+        while start_time < end_time:
+            candles = klines_to_candles(self.client.futures_klines(
+                symbol=symbol,
+                interval=self.interval,
+                startTime=int(start_time * 1000),
+                endTime=int(end_time * 1000) - 1,
+                limit=min(_MAX_KLINES_PER_REQUEST, math.ceil((end_time - start_time) / self.interval_in_seconds)),
+            ))
+            if candles.shape[0] == 0:
+                break
+
+            buffer.extend(candles)
+            logger.info(f"Backfilled {candles.shape[0]} {symbol} candles.")
+            start_time = buffer.last_open_time + self.interval_in_seconds
+
+    def warm_up(self, max_workers=1):
+        if max_workers == 1:
+            for symbol in self.buffers:
+                self.backfill(symbol)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kline-backfill") as executor:
+            list(executor.map(self.backfill, self.buffers))
+
+    def start(self, websocket_manager, warm_up=True, max_workers=1) -> List[str]:
+        """
+        Subscribes to the klines of every symbol, with one combined stream per 200 symbols.
+
+        With warm_up, the candle history is loaded after subscribing. Klines which arrive meanwhile
+        are held back and replayed once it is loaded (the ones already loaded are dropped by open time),
+        so the buffers are only written by one thread, in open time order, and no candle close is missed.
+
+        :param websocket_manager: Started binance.ThreadedWebsocketManager (or anything with the same
+            start_futures_multiplex_socket method).
+        :param max_workers: Number of symbols backfilled at the same time by the warm-up.
+        :return: Stream names.
+        """
+
+        if warm_up:
+            with self._held_lock:
+                self._held = []
+
+        streams = [f"{symbol.lower()}@kline_{self.interval}" for symbol in self.buffers]
+        self.stream_names = [
+            websocket_manager.start_futures_multiplex_socket(
+                callback=self.on_message,
+                streams=streams[i:i + _MAX_STREAMS_PER_CONNECTION],
+            )
+            for i in range(0, len(streams), _MAX_STREAMS_PER_CONNECTION)
+        ]
+
+        if warm_up:
+            try:
+                self.warm_up(max_workers)
+            finally:
+                self._replay_held()
+        return self.stream_names
+
+    def _replay_held(self):
+        while True:
+            with self._held_lock:
+                held, self._held = self._held, ([] if self._held else None)
+            if not held:
+                return
+            for message in held:
+                self._on_message(message)
+
+    def on_message(self, message: dict):
+        with self._held_lock:
+            if self._held is not None:
+                self._held.append(message)
+                return
+        self._on_message(message)
+
+    def _on_message(self, message: dict):
+        data = message.get("data", message)
+        if data.get("e") != "kline":
+            if data.get("e") == "error":
+                logger.warning(f"Kline stream error: {data}")
+            return
+
+        kline = data["k"]
+        if not kline["x"]:
+            return
+
+        symbol = data["s"]
+        buffer = self.buffers.get(symbol)
+        if buffer is None:
+            return
+
+        open_time = kline["t"] / 1000
+        last_open_time = buffer.last_open_time
+        if last_open_time is not None:
+            if open_time <= last_open_time:
+                return
+            if open_time - last_open_time > self.interval_in_seconds:
+                self.backfill(symbol, end_time=open_time)
+
+        buffer.append(np.array((
+            open_time,
+            float(kline["o"]),
+            float(kline["h"]),
+            float(kline["l"]),
+            float(kline["c"]),
+            float(kline["v"]),
+        )))
+
+        candles = buffer.view()
+        strategy = self.strategies.get(symbol)
+        if strategy is not None:
+            strategy(candles)
+        for callback in self.callbacks:
+            callback(symbol, candles)
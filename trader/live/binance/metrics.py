@@ -0,0 +1,157 @@
+import threading
+from typing import Dict, List, Optional
+
+from ..log import logger
+
+# Latencies are counted in buckets of 1 us up to 8 us, then 4 buckets per power of two (< 19% error).
+_BUCKETS = 160
+
+
+def _bucket(microseconds: int) -> int:
+    if microseconds < 8:
+        return microseconds
+    length = microseconds.bit_length()
+    return min((length - 2) * 4 + ((microseconds >> (length - 3)) & 3), _BUCKETS - 1)
+
+
+def _bucket_bounds(bucket: int):
+    if bucket < 8:
+        return bucket, bucket + 1
+    shift = bucket // 4 - 1
+    lower = (4 + bucket % 4) << shift
+    return lower, lower + (1 << shift)
+
+
+class LatencyHistogram:
+
+    __slots__ = "counts", "max"
+
+    def __init__(self):
+        self.counts: List[int] = [0] * _BUCKETS
+        self.max = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def add(self, microseconds: int):
+        self.counts[_bucket(microseconds)] += 1
+        if microseconds > self.max:
+            self.max = microseconds
+
+    def percentile(self, percent: float) -> float:
+        """
+        :return: Upper bound of the bucket holding the percentile, in milliseconds.
+        """
+
+        total = self.total
+        if total == 0:
+            return 0.0
+
+        rank = percent / 100 * total
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if bucket == _BUCKETS - 1:
+                    # The last bucket also counts every latency above its bounds.
+                    return self.max / 1000
+                return min(_bucket_bounds(bucket)[1], self.max) / 1000
+        return self.max / 1000
+
+
+class EndpointMetrics:
+
+    __slots__ = "latency", "wait_ns", "max_wait_ns", "weight", "errors", "rate_limited"
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.wait_ns = 0
+        self.max_wait_ns = 0
+        self.weight = 0
+        self.errors = 0
+        self.rate_limited = 0
+
+    def summary(self, percentiles=(50, 90, 99)) -> dict:
+        calls = self.latency.total
+        summary = dict(
+            calls=calls,
+            weight=self.weight,
+            errors=self.errors,
+            error_rate=self.errors / calls if calls else 0.0,
+            rate_limited=self.rate_limited,
+            mean_wait_ms=self.wait_ns / calls / 1e6 if calls else 0.0,
+            max_wait_ms=self.max_wait_ns / 1e6,
+            max_ms=self.latency.max / 1000,
+        )
+        for percent in percentiles:
+            summary[f"p{percent}_ms"] = self.latency.percentile(percent)
+        return summary
+
+
+class RequestMetrics:
+    """
+    Per-endpoint round-trip latency histograms, rate-limit wait times, request weights,
+    error and rate-limit counts of the REST calls going through a RequestScheduler.
+
+    Round trip is the python-binance call (serialization, signing, network and exchange),
+    wait is the time spent waiting for the rate limits before it.
+    record is called under the scheduler's lock and only does a few integer operations.
+    """
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self._logger_stop: Optional[threading.Event] = None
+
+    def record(self, name: str, weight: int, wait_ns: int, latency_ns: int, error: bool, rate_limited: bool):
+        endpoint = self.endpoints.get(name)
+        if endpoint is None:
+            endpoint = self.endpoints[name] = EndpointMetrics()
+
+        endpoint.latency.add(latency_ns // 1000)
+
+        endpoint.wait_ns += wait_ns
+        if wait_ns > endpoint.max_wait_ns:
+            endpoint.max_wait_ns = wait_ns
+        endpoint.weight += weight
+        if error:
+            endpoint.errors += 1
+            if rate_limited:
+                endpoint.rate_limited += 1
+
+    def snapshot(self, percentiles=(50, 90, 99)) -> Dict[str, dict]:
+        return {name: endpoint.summary(percentiles) for name, endpoint in list(self.endpoints.items())}
+
+    def reset(self):
+        self.endpoints = {}
+
+    def log(self):
+        snapshot = self.snapshot()
+        if not snapshot:
+            return
+
+        logger.info("REST " + "; ".join(
+            f"{name[len('futures_'):] if name.startswith('futures_') else name} "
+            f"n={m['calls']} p50={m['p50_ms']:.1f}ms p99={m['p99_ms']:.1f}ms "
+            f"wait={m['mean_wait_ms']:.1f}ms w={m['weight']} err={m['error_rate']:.1%}"
+            for name, m in sorted(snapshot.items())
+        ))
+
+    def start_logging(self, interval=60.0):
+        """
+        Logs the metrics on the live logger every interval seconds from a daemon thread.
+        """
+
+        self.stop_logging()
+        stop = self._logger_stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                self.log()
+
+        threading.Thread(target=run, name="rest-metrics", daemon=True).start()
+
+    def stop_logging(self):
+        if self._logger_stop is not None:
+            self._logger_stop.set()
+            self._logger_stop = None
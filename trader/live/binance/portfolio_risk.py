@@ -0,0 +1,183 @@
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ...core.const.trade_actions import BUY, SELL
+from ...core.util.trade import calculate_pnl
+
+DEFAULT_MAINTENANCE_MARGIN_RATE = 0.004
+
+# positionSide of one-way mode; hedge mode has a LONG and a SHORT position per symbol.
+BOTH = "BOTH"
+
+
+class RiskSnapshot:
+    """
+    Open positions and their risk at the time of the snapshot, one array element per position.
+
+    Quantities are signed (negative for shorts). liquidation_distance is the relative
+    adverse mark price move which would liquidate the position (isolated margin estimate).
+    In hedge mode a symbol appears once per open position side.
+    """
+
+    __slots__ = (
+        "symbols",
+        "position_sides",
+        "quantity",
+        "entry_price",
+        "mark_price",
+        "leverage",
+        "unrealized_profit",
+        "initial_margin",
+        "roe",
+        "liquidation_price",
+        "liquidation_distance",
+    )
+
+    def __init__(self, symbols: List[str], position_sides: List[str], **arrays: np.ndarray):
+        self.symbols = symbols
+        self.position_sides = position_sides
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    @property
+    def total_unrealized_profit(self) -> float:
+        return float(self.unrealized_profit.sum())
+
+    @property
+    def total_initial_margin(self) -> float:
+        return float(self.initial_margin.sum())
+
+    @property
+    def closest_to_liquidation(self) -> str:
+        return self.symbols[int(np.argmin(self.liquidation_distance))]
+
+
+class PortfolioRisk:
+    """
+    Positions and mark prices of many symbols in preallocated arrays,
+    so a portfolio-wide risk snapshot is a handful of vectorized operations.
+
+    Unrealized PnL, initial margin and ROE are computed by calculate_pnl (trader.core.util.trade) on the arrays,
+    liquidation prices are isolated-margin estimates with a flat maintenance margin rate per symbol.
+
+    Positions are kept per symbol and position side (BOTH in one-way mode, LONG and SHORT in hedge mode);
+    mark prices, leverage and maintenance margin rates apply to every position side of a symbol.
+    """
+
+    def __init__(self, capacity=64, maintenance_margin_rate=DEFAULT_MAINTENANCE_MARGIN_RATE):
+        self.default_maintenance_margin_rate = maintenance_margin_rate
+        self._index: Dict[Tuple[str, str], int] = {}
+        self._symbol_slots: Dict[str, List[int]] = {}
+        self._symbols: List[str] = []
+        self._position_sides: List[str] = []
+        self._lock = threading.Lock()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        size = len(self._symbols)
+
+        def grow(old: np.ndarray = None, fill=0.0):
+            array = np.full(capacity, fill, dtype=np.float64)
+            if old is not None:
+                array[:size] = old[:size]
+            return array
+
+        self.quantity = grow(getattr(self, "quantity", None))
+        self.entry_price = grow(getattr(self, "entry_price", None))
+        self.mark_price = grow(getattr(self, "mark_price", None), fill=np.nan)
+        self.leverage = grow(getattr(self, "leverage", None), fill=1.0)
+        self.maintenance_margin_rate = grow(
+            getattr(self, "maintenance_margin_rate", None),
+            fill=self.default_maintenance_margin_rate,
+        )
+
+    def _slot(self, symbol: str, position_side=BOTH) -> int:
+        slot = self._index.get((symbol, position_side))
+        if slot is None:
+            slot = len(self._symbols)
+            if slot == self.quantity.shape[0]:
+                self._allocate(2 * slot)
+
+            symbol_slots = self._symbol_slots.setdefault(symbol, [])
+            if symbol_slots:
+                # A new position side of a known symbol shares its mark price and settings.
+                for array in (self.mark_price, self.leverage, self.maintenance_margin_rate):
+                    array[slot] = array[symbol_slots[0]]
+            symbol_slots.append(slot)
+            self._symbols.append(symbol)
+            self._position_sides.append(position_side)
+            self._index[(symbol, position_side)] = slot
+        return slot
+
+    def set_position(self, symbol: str, quantity: float, entry_price: float, position_side=BOTH):
+        with self._lock:
+            slot = self._slot(symbol, position_side)
+            self.quantity[slot] = quantity
+            self.entry_price[slot] = entry_price
+
+    def set_leverage(self, symbol: str, leverage: int):
+        with self._lock:
+            self._slot(symbol)
+            self.leverage[self._symbol_slots[symbol]] = leverage
+
+    def set_maintenance_margin_rate(self, symbol: str, rate: float):
+        with self._lock:
+            self._slot(symbol)
+            self.maintenance_margin_rate[self._symbol_slots[symbol]] = rate
+
+    def set_mark_price(self, symbol: str, price: float):
+        with self._lock:
+            self._slot(symbol)
+            self.mark_price[self._symbol_slots[symbol]] = price
+
+    def has_mark_price(self, symbol: str) -> bool:
+        with self._lock:
+            slots = self._symbol_slots.get(symbol)
+            return slots is not None and not np.isnan(self.mark_price[slots[0]])
+
+    def unrealized_profit(self, symbol: str, position_side=BOTH) -> float:
+        with self._lock:
+            slot = self._index[(symbol, position_side)]
+            quantity = float(self.quantity[slot])
+            entry_price = float(self.entry_price[slot])
+            mark_price = float(self.mark_price[slot])
+
+        if quantity == 0.0:
+            return 0.0
+        return calculate_pnl(entry_price, mark_price, abs(quantity), BUY if quantity > 0 else SELL)[1]
+
+    def snapshot(self) -> RiskSnapshot:
+        with self._lock:
+            size = len(self._symbols)
+            open_slots = np.flatnonzero(self.quantity[:size])
+            quantity = self.quantity[open_slots]
+            entry_price = self.entry_price[open_slots]
+            mark_price = self.mark_price[open_slots]
+            leverage = self.leverage[open_slots]
+            maintenance_margin_rate = self.maintenance_margin_rate[open_slots]
+            symbols = [self._symbols[slot] for slot in open_slots]
+            position_sides = [self._position_sides[slot] for slot in open_slots]
+
+        direction = np.sign(quantity)
+        initial_margin, unrealized_profit, roe = calculate_pnl(
+            entry_price, mark_price, np.abs(quantity), np.where(direction > 0, BUY, SELL), leverage,
+        )
+        liquidation_price = (
+            entry_price * (1.0 - direction / leverage) / (1.0 - direction * maintenance_margin_rate)
+        )
+
+        return RiskSnapshot(
+            symbols=symbols,
+            position_sides=position_sides,
+            quantity=quantity,
+            entry_price=entry_price,
+            mark_price=mark_price,
+            leverage=leverage,
+            unrealized_profit=unrealized_profit,
+            initial_margin=initial_margin,
+            roe=roe,
+            liquidation_price=liquidation_price,
+            liquidation_distance=direction * (mark_price - liquidation_price) / mark_price,
+        )
@@ -18,6 +18,8 @@ class BinancePosition(Position):
         entry_price: float,
         leverage: int,
         client: Client,
+        account_state: 'AccountState' = None,
+        position_side="BOTH",
         *args, **kwargs
     ):
         super().__init__(
@@ -27,18 +29,32 @@ class BinancePosition(Position):
             leverage=int(leverage)
         )
         self.client = client
+        self.account_state = account_state
+        self.position_side = position_side
 
     def profit(self) -> float:
+        if self.account_state is not None:
+            return self.account_state.unrealized_profit(self.symbol, self.position_side)
         return float(get_position_info(self.client, self.symbol)["unrealizedProfit"])
 
+    def roe(self) -> float:
+        """
+        Return on equity (unrealized PnL relative to the initial margin).
+        """
+
+        initial_margin = abs(self.quantity) * self.entry_price / self.leverage
+        return self.profit() / initial_margin
+
     @classmethod
-    def from_binance(cls, client: Client, data: dict):
+    def from_binance(cls, client: Client, data: dict, account_state: 'AccountState' = None):
         return cls(
             client=client,
+            account_state=account_state,
             symbol=data["symbol"],
             quantity=data["positionAmt"],
             entry_price=data["entryPrice"],
             leverage=data["leverage"],
+            position_side=data.get("positionSide", "BOTH"),
         )
 
     def reduce_position_market_order(self, quantity: float) -> Order:
@@ -61,3 +77,43 @@ class BinancePosition(Position):
         )
 
         return order
+
+
+class AsyncBinancePosition(BinancePosition):
+    """
+    Position of AsyncBinanceFuturesTrader.
+
+    An AsyncClient can not be called from the synchronous profit, so profit returns the unrealized profit
+    of the account snapshot the position was read from. Await current_profit to query it again.
+    """
+
+    def __init__(self, *args, unrealized_profit: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.unrealized_profit = float(unrealized_profit)
+
+    def profit(self) -> float:
+        if self.account_state is not None:
+            return super().profit()
+        return self.unrealized_profit
+
+    async def current_profit(self) -> float:
+        for position in (await self.client.futures_account())["positions"]:
+            if position["symbol"] == self.symbol and position.get("positionSide", "BOTH") == self.position_side:
+                self.unrealized_profit = float(position["unrealizedProfit"])
+                break
+        else:
+            self.unrealized_profit = 0.0
+        return self.unrealized_profit
+
+    @classmethod
+    def from_binance(cls, client: 'AsyncClient', data: dict, account_state: 'AccountState' = None):
+        return cls(
+            client=client,
+            account_state=account_state,
+            symbol=data["symbol"],
+            quantity=data["positionAmt"],
+            entry_price=data["entryPrice"],
+            leverage=data["leverage"],
+            position_side=data.get("positionSide", "BOTH"),
+            unrealized_profit=data["unrealizedProfit"],
+        )
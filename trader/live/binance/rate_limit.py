@@ -0,0 +1,287 @@
+import copy
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable
+
+from binance.client import Client
+from binance.exceptions import BinanceAPIException
+
+from ..log import logger
+from .metrics import RequestMetrics
+
+ORDER_PRIORITY = 0
+READ_PRIORITY = 1
+
+# Request weights of the futures endpoints, anything missing weighs 1.
+ENDPOINT_WEIGHTS: Dict[str, int] = {
+    "futures_account": 5,
+    "futures_account_balance": 5,
+    "futures_position_information": 5,
+    "futures_place_batch_order": 5,
+    "futures_get_all_orders": 5,
+}
+
+# Endpoints which count against the order rate limits.
+ORDER_ENDPOINTS = {
+    "futures_create_order": 1,
+    "futures_place_batch_order": 5,
+    "futures_modify_order": 1,
+    "futures_v1_put_batch_orders": 5,
+}
+
+# Endpoints which place, amend or cancel orders or change settings. They are never coalesced.
+WRITE_PREFIXES = (
+    "futures_create",
+    "futures_place",
+    "futures_cancel",
+    "futures_change",
+    "futures_modify",
+    "futures_v1_post",
+    "futures_v1_put",
+    "futures_v1_delete",
+)
+
+
+# Latest HTTP response received by each thread, set by a response hook of the client's session.
+# Client.response is shared by every thread using the client, so it can belong to another call.
+_responses = threading.local()
+
+
+def _capture_response(response, *args, **kwargs):
+    _responses.response = response
+
+
+def _is_write(name: str):
+    return name.startswith(WRITE_PREFIXES)
+
+
+def _weight(name: str, kwargs: dict) -> int:
+    if name == "futures_get_open_orders" and "symbol" not in kwargs:
+        return 40
+    if name == "futures_klines":
+        limit = int(kwargs.get("limit", 500))
+        return 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10
+    return ENDPOINT_WEIGHTS.get(name, 1)
+
+
+class _Window:
+
+    __slots__ = "length", "limit", "used", "started"
+
+    def __init__(self, length: float, limit: int):
+        self.length = length
+        self.limit = limit
+        self.used = 0
+        self.started = 0.0
+
+    def roll(self, now: float):
+        start = now // self.length * self.length
+        if start != self.started:
+            self.started = start
+            self.used = 0
+
+    def wait_time(self, now: float, amount: int) -> float:
+        self.roll(now)
+        if self.used + amount <= self.limit:
+            return 0.0
+        return self.started + self.length - now
+
+
+class RequestScheduler:
+    """
+    Keeps futures REST calls under Binance's request-weight and order-count limits.
+
+    Used weight and order counts are tracked locally and corrected from
+    the X-MBX-USED-WEIGHT-1M / X-MBX-ORDER-COUNT-* response headers.
+    Calls that would exceed a limit wait for the next window instead of being rejected.
+    Order placement and cancels are admitted before waiting state queries,
+    and identical reads that are already in flight share one response.
+    After a 429 or 418 every call waits for the Retry-After period.
+
+    Latency, weight and errors of every call are recorded in metrics (see RequestMetrics).
+
+    :param safety_ratio: Fraction of the exchange limits to use.
+    :param max_in_flight: Maximum number of concurrent requests.
+    """
+
+    def __init__(
+            self,
+            weight_limit=2400,
+            order_limit_10s=300,
+            order_limit_1m=1200,
+            safety_ratio=0.9,
+            max_in_flight=16,
+    ):
+        self.weight = _Window(60.0, int(weight_limit * safety_ratio))
+        self.orders_10s = _Window(10.0, int(order_limit_10s * safety_ratio))
+        self.orders_1m = _Window(60.0, int(order_limit_1m * safety_ratio))
+        self.max_in_flight = max_in_flight
+
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.coalesced = 0
+        self.metrics = RequestMetrics()
+
+        self._condition = threading.Condition()
+        self._waiting: Dict[int, int] = {ORDER_PRIORITY: 0, READ_PRIORITY: 0}
+        self._reads: Dict[Hashable, Future] = {}
+
+    def _wait_time(self, now: float, priority: int, weight: int, orders: int) -> float:
+        if self.paused_until > now:
+            return self.paused_until - now
+        if priority == READ_PRIORITY and self._waiting[ORDER_PRIORITY] > 0:
+            return 0.05
+        if self.in_flight >= self.max_in_flight:
+            return 0.05
+
+        wait = self.weight.wait_time(now, weight)
+        if orders:
+            wait = max(
+                wait,
+                self.orders_10s.wait_time(now, orders),
+                self.orders_1m.wait_time(now, orders),
+            )
+        return wait
+
+    def _acquire(self, priority: int, weight: int, orders: int):
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    wait = self._wait_time(time.time(), priority, weight, orders)
+                    if wait <= 0.0:
+                        break
+                    self._condition.wait(wait)
+
+                self.in_flight += 1
+                self.weight.used += weight
+                self.orders_10s.used += orders
+                self.orders_1m.used += orders
+            finally:
+                self._waiting[priority] -= 1
+
+    def _release(self, response, name: str, weight: int, started: int, sent: int, error: bool):
+        finished = time.perf_counter_ns()
+        with self._condition:
+            self.in_flight -= 1
+            headers = getattr(response, "headers", None)
+            if headers is not None:
+                self._update_from_headers(headers)
+            self.metrics.record(
+                name,
+                weight,
+                sent - started,
+                finished - sent,
+                error,
+                error and getattr(response, "status_code", None) in (418, 429),
+            )
+            self._condition.notify_all()
+
+    def _update_from_headers(self, headers):
+        now = time.time()
+        used_weight = headers.get("X-MBX-USED-WEIGHT-1M")
+        if used_weight is not None:
+            self.weight.roll(now)
+            self.weight.used = max(self.weight.used, int(used_weight))
+
+        for key, value in headers.items():
+            key = key.upper()
+            if key == "X-MBX-ORDER-COUNT-10S":
+                self.orders_10s.roll(now)
+                self.orders_10s.used = max(self.orders_10s.used, int(value))
+            elif key == "X-MBX-ORDER-COUNT-1M":
+                self.orders_1m.roll(now)
+                self.orders_1m.used = max(self.orders_1m.used, int(value))
+
+    def _on_rate_limited(self, e: BinanceAPIException):
+        headers = getattr(e.response, "headers", None) or {}
+        retry_after = float(headers.get("Retry-After", 60))
+        with self._condition:
+            self.paused_until = max(self.paused_until, time.time() + retry_after)
+        logger.warning(f"Rate limited ({e.status_code}), pausing requests for {retry_after}s.")
+
+    def _send(self, client: Client, name: str, func: Callable, kwargs: dict):
+        started = time.perf_counter_ns()
+        priority = ORDER_PRIORITY if _is_write(name) else READ_PRIORITY
+        weight = _weight(name, kwargs)
+        self._acquire(priority, weight, ORDER_ENDPOINTS.get(name, 0))
+        sent = time.perf_counter_ns()
+
+        _responses.response = None
+        response = None
+        error = True
+        try:
+            result = func(**kwargs)
+            response = _responses.response
+            error = False
+            return result
+        except BinanceAPIException as e:
+            response = e.response
+            if e.status_code in (418, 429):
+                self._on_rate_limited(e)
+            raise
+        finally:
+            self._release(response, name, weight, started, sent, error)
+
+    def call(self, client: Client, name: str, func: Callable, **kwargs):
+        if _is_write(name):
+            return self._send(client, name, func, kwargs)
+
+        try:
+            key = (id(client), name, frozenset(kwargs.items()))
+            hash(key)
+        except TypeError:
+            return self._send(client, name, func, kwargs)
+
+        with self._condition:
+            future = self._reads.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._reads[key] = future
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            # Every caller gets its own copy, so one modifying the result does not affect the others.
+            return copy.deepcopy(future.result())
+
+        try:
+            result = self._send(client, name, func, kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._condition:
+                self._reads.pop(key, None)
+
+
+class ScheduledClient:
+    """
+    Proxy of a binance Client which sends every futures_* call through a RequestScheduler.
+    Every other attribute is passed through.
+
+    A response hook is added to the session of the client, so the scheduler reads
+    the usage headers of each call from its own response.
+    """
+
+    def __init__(self, client: Client, scheduler: RequestScheduler):
+        self.client = client
+        self.scheduler = scheduler
+
+        session = getattr(client, "session", None)
+        if session is not None and _capture_response not in session.hooks["response"]:
+            session.hooks["response"].append(_capture_response)
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.client, name)
+        if not name.startswith("futures_") or not callable(attribute):
+            return attribute
+
+        def scheduled(**kwargs):
+            return self.scheduler.call(self.client, name, attribute, **kwargs)
+
+        return scheduled
@@ -0,0 +1,12 @@
+# nopycln: file
+
+from .exchange import SimulatedExchange, SimulatedWebsocketManager, SimulatorError, default_symbol_info
+
+
+def __getattr__(name: str):
+    # The server needs aiohttp and python-binance, the in-process exchange does not.
+    if name == "SimulatorServer":
+        from .server import SimulatorServer
+
+        return SimulatorServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
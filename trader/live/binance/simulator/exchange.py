@@ -0,0 +1,541 @@
+import itertools
+import json
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from trader.backtest import BacktestFuturesTrader
+from trader.backtest.exceptions import LiquidationError, NotEnoughFundsError
+from trader.backtest.position import calculate_profit
+from trader.core.const.candle_index import (
+    OPEN_TIME_INDEX,
+    OPEN_PRICE_INDEX,
+    HIGH_PRICE_INDEX,
+    LOW_PRICE_INDEX,
+    CLOSE_PRICE_INDEX,
+    VOLUME_INDEX,
+)
+from trader.core.model import Balance, Order
+from trader.core.util.common import interval_to_seconds
+
+from ...log import logger
+from ..symbol_info import BinanceSymbolInfo
+
+EventCallback = Callable[[dict], None]
+
+# Trader attribute holding the (single) open order of each order type.
+_ORDER_SLOTS = {
+    "MARKET": "market_order",
+    "LIMIT": "limit_order",
+    "STOP_MARKET": "stop_order",
+    "TAKE_PROFIT_MARKET": "take_profit_order",
+}
+
+
+class SimulatorError(Exception):
+    """
+    Error answered like a Binance API error: HTTP status with a {code, msg} body.
+    """
+
+    def __init__(self, code: int, msg: str, status=400):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.status = status
+
+
+def default_symbol_info(symbol: str, tick_size="0.01", step_size="0.001") -> dict:
+    return {
+        "symbol": symbol, "pair": symbol, "contractType": "PERPETUAL", "status": "TRADING",
+        "baseAsset": symbol[:-4], "quoteAsset": symbol[-4:], "marginAsset": symbol[-4:],
+        "pricePrecision": 2, "quantityPrecision": 3, "baseAssetPrecision": 8, "quotePrecision": 8,
+        "underlyingType": "COIN",
+        "filters": [
+            {"filterType": "PRICE_FILTER", "minPrice": "0.01", "maxPrice": "1000000", "tickSize": tick_size},
+            {"filterType": "LOT_SIZE", "minQty": step_size, "maxQty": "1000", "stepSize": step_size},
+            {"filterType": "MARKET_LOT_SIZE", "minQty": step_size, "maxQty": "1000", "stepSize": step_size},
+            {"filterType": "MAX_NUM_ORDERS", "limit": 200},
+            {"filterType": "MAX_NUM_ALGO_ORDERS", "limit": 10},
+            {"filterType": "MIN_NOTIONAL", "notional": "5"},
+            {"filterType": "PERCENT_PRICE", "multiplierUp": "1.0500", "multiplierDown": "0.9500", "multiplierDecimal": "4"},
+        ],
+        "orderTypes": list(_ORDER_SLOTS),
+        "timeInForce": ["GTC", "IOC", "FOK", "GTX"],
+    }
+
+
+def _order_from_params(params: dict) -> Order:
+    order_type = params.get("type", "").upper()
+    symbol = params["symbol"].upper()
+    side = params["side"].upper()
+    stop_price = params.get("stopPrice", params.get("triggerPrice"))
+
+    if order_type == "MARKET":
+        order = Order.market(symbol=symbol, side=side, quantity=float(params["quantity"]))
+    elif order_type == "LIMIT":
+        order = Order.limit(
+            symbol=symbol,
+            side=side,
+            quantity=float(params["quantity"]),
+            price=float(params["price"]),
+            time_in_force=params.get("timeInForce", "GTC"),
+        )
+    elif order_type == "STOP_MARKET":
+        order = Order.stop_market(symbol=symbol, side=side, stop_price=float(stop_price))
+    elif order_type == "TAKE_PROFIT_MARKET":
+        order = Order.take_profit_market(symbol=symbol, side=side, stop_price=float(stop_price))
+    else:
+        raise SimulatorError(-1116, "Invalid orderType.")
+
+    if "quantity" in params and order.quantity is None:
+        order.quantity = float(params["quantity"])
+    order.close_position = str(params.get("closePosition", "false")).lower() == "true"
+    order.reduce_only = str(params.get("reduceOnly", "false")).lower() == "true"
+    return order
+
+
+class SimulatedExchange:
+    """
+    Binance futures account replaying candles of many symbols.
+
+    Every symbol is matched by its own BacktestFuturesTrader (sharing one balance),
+    so fills follow the backtest rules: market orders fill at the close of the next candle,
+    limit, stop and take profit orders when the next candles cross their price.
+    Like the backtest trader, a symbol holds at most one open order per order type;
+    a new one replaces (expires) the previous one.
+
+    Quantities have the margin-based semantics of the backtester, not the contract quantities of Binance:
+    an order of quantity q at price p with leverage L reserves p * q of the balance
+    and gains or loses L times the price move of q, like q * L contracts on Binance.
+    Strategies sized for the backtester behave the same against the simulator,
+    but quantities sent to the real exchange must be multiplied by the leverage for the same exposure.
+
+    Requests are answered with Binance-shaped payloads, and every closed candle,
+    order update and account update is published to the kline and user-data subscribers.
+
+    :param candles: Candles per symbol, all with the same open times.
+    :param start: Number of candles which are already closed at the start.
+    """
+
+    def __init__(
+            self,
+            candles: Dict[str, np.ndarray],
+            interval: str,
+            symbol_infos: List[dict] = None,
+            balance: float = 1000.0,
+            asset="USDT",
+            fee_ratio=0.001,
+            leverage=1,
+            start=1,
+    ):
+        self.candles = {symbol.upper(): symbol_candles for symbol, symbol_candles in candles.items()}
+        if len({symbol_candles.shape[0] for symbol_candles in self.candles.values()}) != 1:
+            raise ValueError("Candles of every symbol must have the same length!")
+
+        self.interval = interval
+        self.interval_in_seconds = interval_to_seconds(interval)
+        self.cursor = start
+        self.size = next(iter(self.candles.values())).shape[0]
+
+        infos = {info["symbol"]: info for info in symbol_infos or ()}
+        self.symbol_infos = [infos.get(symbol) or default_symbol_info(symbol) for symbol in self.candles]
+
+        self.balance = Balance(asset, total=balance, available=balance)
+        self.traders: Dict[str, BacktestFuturesTrader] = {
+            info["symbol"]: BacktestFuturesTrader(
+                symbol_info=BinanceSymbolInfo(**info),
+                interval=interval,
+                balance=self.balance,
+                fee_ratio=fee_ratio,
+                leverage=leverage,
+            )
+            for info in self.symbol_infos
+        }
+        self.orders: Dict[int, Order] = {}
+
+        self.kline_subscribers: List[EventCallback] = []
+        self.user_subscribers: List[EventCallback] = []
+        self._order_ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    @property
+    def finished(self):
+        return self.cursor >= self.size
+
+    def server_time(self) -> int:
+        """
+        :return: Close time of the latest closed candle, in milliseconds.
+        """
+
+        candles = next(iter(self.candles.values()))
+        return int((candles[self.cursor - 1][OPEN_TIME_INDEX] + self.interval_in_seconds) * 1000)
+
+    def _trader(self, symbol: str) -> BacktestFuturesTrader:
+        trader = self.traders.get(str(symbol).upper())
+        if trader is None:
+            raise SimulatorError(-1121, "Invalid symbol.")
+        return trader
+
+    def _publish(self, subscribers: List[EventCallback], event: dict):
+        for callback in subscribers:
+            callback(event)
+
+    def _order_payload(self, order: Order, executed_price: float = None) -> dict:
+        executed = executed_price is not None
+        return {
+            "orderId": order.order_id,
+            "symbol": order.symbol,
+            "status": order.status,
+            "clientOrderId": f"sim-{order.order_id}",
+            "price": str(order.price or 0),
+            "avgPrice": str(executed_price if executed else 0),
+            "origQty": str(order.quantity or 0),
+            "executedQty": str(order.quantity or 0) if executed else "0",
+            "type": order.type,
+            "side": order.side_as_str(),
+            "stopPrice": str(order.stop_price or 0),
+            "timeInForce": order.time_in_force or "GTC",
+            "reduceOnly": order.reduce_only,
+            "closePosition": order.close_position,
+            "updateTime": self.server_time(),
+        }
+
+    def _publish_order(self, order: Order, executed_price: float = None):
+        data = self._order_payload(order, executed_price)
+        self._publish(self.user_subscribers, {
+            "e": "ORDER_TRADE_UPDATE",
+            "E": data["updateTime"],
+            "T": data["updateTime"],
+            "o": {
+                "s": data["symbol"], "c": data["clientOrderId"], "S": data["side"], "o": data["type"],
+                "f": data["timeInForce"], "q": data["origQty"], "p": data["price"], "ap": data["avgPrice"],
+                "sp": data["stopPrice"], "X": data["status"], "i": data["orderId"], "z": data["executedQty"],
+                "T": data["updateTime"],
+            },
+        })
+
+    def _position_payload(self, symbol: str) -> dict:
+        trader = self.traders[symbol]
+        position = trader.position
+        if position is None:
+            amount, entry_price, profit = 0.0, 0.0, 0.0
+        else:
+            amount = sum(position.quantities)
+            entry_price = position.entry_price
+            profit = calculate_profit(self.candles[symbol][self.cursor - 1][CLOSE_PRICE_INDEX], position)
+        return {
+            "symbol": symbol,
+            "positionAmt": str(amount),
+            "entryPrice": str(entry_price),
+            "markPrice": str(self.candles[symbol][self.cursor - 1][CLOSE_PRICE_INDEX]),
+            "unrealizedProfit": str(profit),
+            "unRealizedProfit": str(profit),
+            "leverage": str(trader.get_leverage(symbol)),
+            "positionSide": "BOTH",
+        }
+
+    def _publish_account(self, symbols: List[str]):
+        positions = [self._position_payload(symbol) for symbol in symbols]
+        self._publish(self.user_subscribers, {
+            "e": "ACCOUNT_UPDATE",
+            "E": self.server_time(),
+            "a": {
+                "m": "ORDER",
+                "B": [{"a": self.balance.asset, "wb": str(self.balance.total), "cw": str(self.balance.total)}],
+                "P": [
+                    {
+                        "s": p["symbol"], "pa": p["positionAmt"], "ep": p["entryPrice"],
+                        "up": p["unrealizedProfit"], "ps": p["positionSide"],
+                    }
+                    for p in positions
+                ],
+            },
+        })
+
+    # Matching
+
+    def advance(self) -> bool:
+        """
+        Closes the next candle of every symbol.
+
+        :return: False if there are no more candles.
+        """
+
+        with self._lock:
+            if self.finished:
+                return False
+
+            changed = []
+            for symbol, trader in self.traders.items():
+                if self._match(symbol, trader):
+                    changed.append(symbol)
+
+            self.cursor += 1
+            for symbol in self.candles:
+                self._publish(self.kline_subscribers, self._kline_event(symbol, self.cursor - 1))
+            if changed:
+                self._publish_account(changed)
+            return True
+
+    def _match(self, symbol: str, trader: BacktestFuturesTrader) -> bool:
+        before = {slot: getattr(trader, slot) for slot in _ORDER_SLOTS.values()}
+        closed_positions = len(trader.positions)
+        had_position = trader.position is not None
+
+        try:
+            trader(self.candles[symbol][:self.cursor + 1])
+        except LiquidationError as e:
+            logger.warning(f"Simulator: {symbol} {e}")
+            self._liquidate(trader)
+            trader.cancel_orders(symbol)
+        except NotEnoughFundsError as e:
+            logger.warning(f"Simulator: {symbol} {e}")
+            trader.cancel_orders(symbol)
+
+        exit_price = trader.positions[-1].prices[-1] if len(trader.positions) > closed_positions else None
+        for slot, order in before.items():
+            if order is None or getattr(trader, slot) is order:
+                continue
+
+            self.orders.pop(order.order_id, None)
+            if slot in ("market_order", "limit_order"):
+                order.status = "FILLED"
+                price = trader.latest_close_price if slot == "market_order" else order.price
+                self._publish_order(order, price)
+            elif exit_price is not None and exit_price == order.stop_price:
+                order.status = "FILLED"
+                self._publish_order(order, exit_price)
+            else:
+                order.status = "EXPIRED"
+                self._publish_order(order)
+
+        return had_position or trader.position is not None
+
+    def _liquidate(self, trader: BacktestFuturesTrader):
+        """
+        Charges the margin of the liquidated position and the fee of closing it to the shared balance,
+        then removes the position. The margin was already taken from the available balance at entry.
+        """
+
+        position = trader.position
+        margin = position.entry_price * abs(sum(position.quantities))
+        fee = margin * position.leverage * trader.fee_ratio
+        loss = min(margin + fee, self.balance.total)
+
+        self.balance.total -= loss
+        self.balance.available = min(self.balance.available - (loss - margin), self.balance.total)
+        trader.position = None
+
+    def _kline_event(self, symbol: str, index: int) -> dict:
+        candle = self.candles[symbol][index]
+        open_time = int(candle[OPEN_TIME_INDEX] * 1000)
+        close_time = open_time + self.interval_in_seconds * 1000 - 1
+        return {
+            "stream": f"{symbol.lower()}@kline_{self.interval}",
+            "data": {
+                "e": "kline",
+                "E": close_time + 1,
+                "s": symbol,
+                "k": {
+                    "t": open_time, "T": close_time, "s": symbol, "i": self.interval,
+                    "o": str(candle[OPEN_PRICE_INDEX]), "h": str(candle[HIGH_PRICE_INDEX]),
+                    "l": str(candle[LOW_PRICE_INDEX]), "c": str(candle[CLOSE_PRICE_INDEX]),
+                    "v": str(candle[VOLUME_INDEX]), "x": True,
+                },
+            },
+        }
+
+    # REST endpoints
+
+    def exchange_info(self) -> dict:
+        return {"timezone": "UTC", "serverTime": self.server_time(), "symbols": self.symbol_infos}
+
+    def time(self) -> dict:
+        return {"serverTime": self.server_time()}
+
+    def klines(self, symbol: str, interval: str = None, startTime=None, endTime=None, limit=500, **_) -> list:
+        if interval is not None and interval != self.interval:
+            raise SimulatorError(-1120, f"The simulator only serves {self.interval} klines.")
+
+        self._trader(symbol)
+        candles = self.candles[symbol.upper()][:self.cursor]
+        open_times = candles[:, OPEN_TIME_INDEX] * 1000
+        start = 0 if startTime is None else np.searchsorted(open_times, int(startTime))
+        end = candles.shape[0] if endTime is None else np.searchsorted(open_times, int(endTime), side="right")
+        start = max(start, end - int(limit)) if startTime is None else start
+        end = min(end, start + int(limit))
+
+        interval_ms = self.interval_in_seconds * 1000
+        return [
+            [
+                int(open_time), str(candle[OPEN_PRICE_INDEX]), str(candle[HIGH_PRICE_INDEX]),
+                str(candle[LOW_PRICE_INDEX]), str(candle[CLOSE_PRICE_INDEX]), str(candle[VOLUME_INDEX]),
+                int(open_time) + interval_ms - 1, "0", 0, "0", "0", "0",
+            ]
+            for open_time, candle in zip(open_times[start:end], candles[start:end])
+        ]
+
+    def account(self, **_) -> dict:
+        with self._lock:
+            positions = [self._position_payload(symbol) for symbol in self.traders]
+            profit = sum(float(position["unrealizedProfit"]) for position in positions)
+            return {
+                "totalWalletBalance": str(self.balance.total),
+                "totalUnrealizedProfit": str(profit),
+                "availableBalance": str(self.balance.available),
+                "assets": [{
+                    "asset": self.balance.asset,
+                    "walletBalance": str(self.balance.total),
+                    "availableBalance": str(self.balance.available),
+                    "unrealizedProfit": str(profit),
+                    "marginBalance": str(self.balance.total + profit),
+                }],
+                "positions": positions,
+            }
+
+    def balances(self, **_) -> list:
+        return [{
+            "asset": self.balance.asset,
+            "balance": str(self.balance.total),
+            "availableBalance": str(self.balance.available),
+        }]
+
+    def position_risk(self, symbol: str = None, **_) -> list:
+        with self._lock:
+            symbols = self.traders if symbol is None else [self._trader(symbol).symbol_info.symbol]
+            return [self._position_payload(symbol) for symbol in symbols]
+
+    def change_leverage(self, symbol: str, leverage, **_) -> dict:
+        self._trader(symbol).set_leverage(symbol, int(leverage))
+        return {"symbol": symbol.upper(), "leverage": int(leverage), "maxNotionalValue": "1000000"}
+
+    def create_order(self, **params) -> dict:
+        with self._lock:
+            order = _order_from_params(params)
+            trader = self._trader(order.symbol)
+
+            order.order_id = next(self._order_ids)
+            order.status = "NEW"
+
+            slot = _ORDER_SLOTS[order.type]
+            replaced: Optional[Order] = getattr(trader, slot)
+            if replaced is not None:
+                self.orders.pop(replaced.order_id, None)
+                replaced.status = "EXPIRED"
+                self._publish_order(replaced)
+
+            setattr(trader, slot, order)
+            self.orders[order.order_id] = order
+            self._publish_order(order)
+            return self._order_payload(order)
+
+    def create_orders(self, batchOrders, **_) -> list:
+        responses = []
+        for params in json.loads(batchOrders) if isinstance(batchOrders, str) else batchOrders:
+            try:
+                responses.append(self.create_order(**params))
+            except SimulatorError as e:
+                responses.append({"code": e.code, "msg": e.msg})
+        return responses
+
+    def modify_order(self, orderId, symbol: str = None, quantity=None, price=None, **_) -> dict:
+        with self._lock:
+            order = self.orders.get(int(orderId))
+            if order is None:
+                raise SimulatorError(-2013, "Order does not exist.")
+            if order.type != "LIMIT":
+                raise SimulatorError(-4028, "Only limit orders can be modified.")
+
+            if quantity is not None:
+                order.quantity = float(quantity)
+            if price is not None:
+                order.price = float(price)
+            self._publish_order(order)
+            return self._order_payload(order)
+
+    def modify_orders(self, batchOrders, **_) -> list:
+        responses = []
+        for params in json.loads(batchOrders) if isinstance(batchOrders, str) else batchOrders:
+            try:
+                responses.append(self.modify_order(**params))
+            except SimulatorError as e:
+                responses.append({"code": e.code, "msg": e.msg})
+        return responses
+
+    def cancel_order(self, orderId, symbol: str = None, **_) -> dict:
+        with self._lock:
+            order = self.orders.pop(int(orderId), None)
+            if order is None:
+                raise SimulatorError(-2011, "Unknown order sent.")
+
+            trader = self.traders[order.symbol]
+            slot = _ORDER_SLOTS[order.type]
+            if getattr(trader, slot) is order:
+                setattr(trader, slot, None)
+
+            order.status = "CANCELED"
+            self._publish_order(order)
+            return self._order_payload(order)
+
+    def cancel_orders(self, symbol: str, orderIdList, **_) -> list:
+        responses = []
+        for order_id in json.loads(orderIdList) if isinstance(orderIdList, str) else orderIdList:
+            try:
+                responses.append(self.cancel_order(order_id, symbol))
+            except SimulatorError as e:
+                responses.append({"code": e.code, "msg": e.msg})
+        return responses
+
+    def cancel_all_orders(self, symbol: str, **_) -> dict:
+        symbol = self._trader(symbol).symbol_info.symbol
+        for order in self.open_orders(symbol):
+            self.cancel_order(order["orderId"])
+        return {"code": 200, "msg": "The operation of cancel all open order is done."}
+
+    def open_orders(self, symbol: str = None, **_) -> list:
+        with self._lock:
+            return [
+                self._order_payload(order)
+                for order in self.orders.values()
+                if symbol is None or order.symbol == symbol.upper()
+            ]
+
+    def listen_key(self, **_) -> dict:
+        return {"listenKey": "simulator"}
+
+
+class SimulatedWebsocketManager:
+    """
+    In-process stand-in of ThreadedWebsocketManager: stream callbacks are called by SimulatedExchange.advance.
+    """
+
+    def __init__(self, exchange: SimulatedExchange):
+        self.exchange = exchange
+        self._streams: Dict[str, tuple] = {}
+
+    def start_futures_user_socket(self, callback: EventCallback) -> str:
+        self.exchange.user_subscribers.append(callback)
+        name = f"user-{len(self._streams)}"
+        self._streams[name] = (self.exchange.user_subscribers, callback)
+        return name
+
+    def start_futures_multiplex_socket(self, callback: EventCallback, streams: List[str]) -> str:
+        subscribed = set(streams)
+
+        def on_kline(message: dict):
+            if message["stream"] in subscribed:
+                callback(message)
+
+        self.exchange.kline_subscribers.append(on_kline)
+        name = f"multiplex-{len(self._streams)}"
+        self._streams[name] = (self.exchange.kline_subscribers, on_kline)
+        return name
+
+    def stop_socket(self, name: str):
+        subscribers, callback = self._streams.pop(name)
+        subscribers.remove(callback)
+
+    def stop(self):
+        for name in list(self._streams):
+            self.stop_socket(name)
@@ -0,0 +1,249 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from aiohttp import WSMsgType, web
+from binance.client import Client
+
+from ...log import logger
+from ..rate_limit import ORDER_ENDPOINTS, _Window, _weight
+from .exchange import SimulatedExchange, SimulatorError
+
+# (HTTP method, path after /fapi/<version>/) -> (python-binance method name, SimulatedExchange method name)
+ROUTES: Dict[Tuple[str, str], Tuple[str, str]] = {
+    ("GET", "time"): ("futures_time", "time"),
+    ("GET", "exchangeInfo"): ("futures_exchange_info", "exchange_info"),
+    ("GET", "klines"): ("futures_klines", "klines"),
+    ("GET", "account"): ("futures_account", "account"),
+    ("GET", "balance"): ("futures_account_balance", "balances"),
+    ("GET", "positionRisk"): ("futures_position_information", "position_risk"),
+    ("GET", "openOrders"): ("futures_get_open_orders", "open_orders"),
+    ("POST", "order"): ("futures_create_order", "create_order"),
+    ("POST", "algoOrder"): ("futures_create_order", "create_order"),
+    ("POST", "batchOrders"): ("futures_place_batch_order", "create_orders"),
+    ("PUT", "order"): ("futures_modify_order", "modify_order"),
+    ("PUT", "batchOrders"): ("futures_v1_put_batch_orders", "modify_orders"),
+    ("DELETE", "order"): ("futures_cancel_order", "cancel_order"),
+    ("DELETE", "batchOrders"): ("futures_cancel_orders", "cancel_orders"),
+    ("DELETE", "allOpenOrders"): ("futures_cancel_all_open_orders", "cancel_all_orders"),
+    ("POST", "leverage"): ("futures_change_leverage", "change_leverage"),
+    ("POST", "listenKey"): ("futures_stream_get_listen_key", "listen_key"),
+    ("PUT", "listenKey"): ("futures_stream_keepalive", "listen_key"),
+}
+
+# Request parameters which are not passed to the exchange.
+_TRANSPORT_PARAMS = ("timestamp", "signature", "recvWindow", "newClientOrderId", "clientAlgoId", "algoType")
+
+
+class SimulatorServer:
+    """
+    Serves a SimulatedExchange over HTTP and websockets with the Binance futures layout:
+    REST under /fapi/<version>/, combined kline streams under /stream?streams=...
+    and the user-data stream under /ws/<listenKey>.
+    Signatures are not checked.
+
+    Request weights and order counts are limited like on Binance (429 with Retry-After when exceeded,
+    usage in the X-MBX-* headers), and every response can be delayed by a fixed latency.
+
+    :param candle_period: Seconds between candle closes. If None, candles are closed by advance
+        or POST /simulator/advance.
+    """
+
+    def __init__(
+            self,
+            exchange: SimulatedExchange,
+            host="127.0.0.1",
+            port=0,
+            latency=0.0,
+            weight_limit=2400,
+            order_limit_10s=300,
+            order_limit_1m=1200,
+            candle_period: float = None,
+    ):
+        self.exchange = exchange
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.candle_period = candle_period
+
+        self.weight = _Window(60.0, weight_limit)
+        self.orders_10s = _Window(10.0, order_limit_10s)
+        self.orders_1m = _Window(60.0, order_limit_1m)
+        self.requests = 0
+        self.rejected = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._kline_sockets: Dict[web.WebSocketResponse, Set[str]] = {}
+        self._user_sockets: List[web.WebSocketResponse] = []
+
+        exchange.kline_subscribers.append(self._on_kline)
+        exchange.user_subscribers.append(self._on_user_event)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def client(self, api_key="simulator", api_secret="simulator") -> Client:
+        """
+        :return: python-binance Client sending its futures requests to this server.
+        """
+
+        client = Client(api_key, api_secret, ping=False)
+        client.FUTURES_URL = f"{self.url}/fapi"
+        return client
+
+    def _application(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/fapi/{version}/{path}", self._handle_rest)
+        app.router.add_post("/simulator/advance", self._handle_advance)
+        app.router.add_get("/stream", self._handle_kline_socket)
+        app.router.add_get("/ws/{listen_key}", self._handle_user_socket)
+        return app
+
+    def _admit(self, name: str, params: dict) -> Tuple[Optional[float], dict]:
+        now = time.time()
+        weight = _weight(name, params)
+        orders = ORDER_ENDPOINTS.get(name, 0)
+
+        wait = self.weight.wait_time(now, weight)
+        if orders:
+            wait = max(wait, self.orders_10s.wait_time(now, orders), self.orders_1m.wait_time(now, orders))
+        if wait <= 0.0:
+            self.weight.used += weight
+            self.orders_10s.used += orders
+            self.orders_1m.used += orders
+
+        headers = {
+            "X-MBX-USED-WEIGHT-1M": str(self.weight.used),
+            "X-MBX-ORDER-COUNT-10S": str(self.orders_10s.used),
+            "X-MBX-ORDER-COUNT-1M": str(self.orders_1m.used),
+        }
+        return (wait if wait > 0.0 else None), headers
+
+    async def _handle_rest(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        route = ROUTES.get((request.method, request.match_info["path"]))
+        if route is None:
+            return web.json_response({"code": -5000, "msg": "Path not served by the simulator."}, status=404)
+
+        params = dict(request.query)
+        if request.can_read_body:
+            params.update(await request.post())
+        for name in _TRANSPORT_PARAMS:
+            params.pop(name, None)
+
+        client_method, exchange_method = route
+        retry_after, headers = self._admit(client_method, params)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if retry_after is not None:
+            self.rejected += 1
+            headers["Retry-After"] = str(int(retry_after) + 1)
+            return web.json_response(
+                {"code": -1003, "msg": "Too many requests."}, status=429, headers=headers,
+            )
+
+        try:
+            body = getattr(self.exchange, exchange_method)(**params)
+        except SimulatorError as e:
+            return web.json_response({"code": e.code, "msg": e.msg}, status=e.status, headers=headers)
+        except (KeyError, TypeError, ValueError) as e:
+            return web.json_response({"code": -1102, "msg": f"Invalid parameters: {e}"}, status=400, headers=headers)
+        return web.json_response(body, headers=headers)
+
+    async def _handle_advance(self, request: web.Request) -> web.Response:
+        return web.json_response({"advanced": self.exchange.advance(), "serverTime": self.exchange.server_time()})
+
+    async def _drain(self, socket: web.WebSocketResponse):
+        async for message in socket:
+            if message.type == WSMsgType.ERROR:
+                break
+
+    async def _handle_kline_socket(self, request: web.Request) -> web.WebSocketResponse:
+        socket = web.WebSocketResponse(heartbeat=30.0)
+        await socket.prepare(request)
+        self._kline_sockets[socket] = set(request.query.get("streams", "").split("/"))
+        try:
+            await self._drain(socket)
+        finally:
+            self._kline_sockets.pop(socket, None)
+        return socket
+
+    async def _handle_user_socket(self, request: web.Request) -> web.WebSocketResponse:
+        socket = web.WebSocketResponse(heartbeat=30.0)
+        await socket.prepare(request)
+        self._user_sockets.append(socket)
+        try:
+            await self._drain(socket)
+        finally:
+            self._user_sockets.remove(socket)
+        return socket
+
+    def _broadcast(self, sockets, message: dict):
+        data = json.dumps(message)
+        for socket in list(sockets):
+            if not socket.closed:
+                self._loop.call_soon_threadsafe(asyncio.ensure_future, socket.send_str(data))
+
+    def _on_kline(self, message: dict):
+        if self._loop is None:
+            return
+        self._broadcast(
+            [socket for socket, streams in self._kline_sockets.items() if message["stream"] in streams],
+            message,
+        )
+
+    def _on_user_event(self, event: dict):
+        if self._loop is not None:
+            self._broadcast(self._user_sockets, event)
+
+    async def _advance_periodically(self):
+        while self.exchange.advance():
+            await asyncio.sleep(self.candle_period)
+        logger.info("Simulator: no more candles.")
+
+    async def _start(self):
+        self._runner = web.AppRunner(self._application())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        if self.candle_period is not None:
+            asyncio.ensure_future(self._advance_periodically())
+        logger.info(f"Simulator serving {len(self.exchange.traders)} symbols on {self.url}.")
+
+    def start(self) -> str:
+        """
+        Starts serving on a background thread.
+
+        :return: Base URL of the server.
+        """
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._start())
+            self._started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._runner.cleanup())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name="binance-simulator", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self.url
+
+    def advance(self) -> bool:
+        return self.exchange.advance()
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
@@ -0,0 +1,136 @@
+import hashlib
+import hmac
+import json
+import time
+from typing import List
+from urllib.parse import quote, urlencode
+
+from binance.client import Client
+
+from trader.core.model import Order
+from trader.core.util.trade import create_position
+
+from .batch import MAX_BATCH_MODIFY, OrderResult, map_batch_response
+from .symbol_info import BinanceSymbolInfo
+from .symbol_info_cache import SymbolInfoCache, shared_symbol_info_cache
+
+MAX_BATCH_ORDERS = MAX_BATCH_MODIFY
+
+
+class StagedRequest:
+    """
+    Signed order request prepared ahead of time: the body is serialized and already fed to the HMAC,
+    only the timestamp is appended and signed when it is sent.
+    """
+
+    __slots__ = "orders", "endpoint", "body", "_mac"
+
+    def __init__(self, orders: List[Order], endpoint: str, body: str, secret: str):
+        self.orders = orders
+        self.endpoint = endpoint
+        self.body = body
+        self._mac = hmac.new(secret.encode("utf-8"), body.encode("utf-8"), hashlib.sha256)
+
+    @property
+    def is_batch(self):
+        return self.endpoint == "batchOrders"
+
+    def sign(self, timestamp: int) -> bytes:
+        tail = f"&timestamp={timestamp}"
+        mac = self._mac.copy()
+        mac.update(tail.encode("utf-8"))
+        return f"{self.body}{tail}&signature={mac.hexdigest()}".encode("utf-8")
+
+
+class OrderStager:
+    """
+    Moves the work of sending orders off the candle-close critical path.
+
+    stage quantizes prices to the tick size and quantities to the step size of the symbol (see Quantizer),
+    serializes the request body and prepares the signature while the candle is still open.
+    send then only timestamps, signs and posts it on the session of the client.
+    Only HMAC (API secret) authentication is supported.
+
+    :param client: Client or ScheduledClient; through a ScheduledClient sends are rate limited.
+    """
+
+    def __init__(self, client: Client, symbol_info_cache: SymbolInfoCache = None, recv_window: int = None):
+        self.client = client
+        self.raw_client: Client = getattr(client, "client", client)
+        self.scheduler = getattr(client, "scheduler", None)
+        self.symbol_info_cache = symbol_info_cache or shared_symbol_info_cache(self.raw_client)
+        self.recv_window = recv_window
+
+        if getattr(self.raw_client, "PRIVATE_KEY", None):
+            raise ValueError("Staged orders support HMAC API keys only.")
+
+        self._urls = {
+            endpoint: self.raw_client._create_futures_api_uri(endpoint)
+            for endpoint in ("order", "batchOrders")
+        }
+
+    def order_params(self, order: Order, symbol_info: BinanceSymbolInfo = None) -> dict:
+        symbol_info = symbol_info or self.symbol_info_cache.get(order.symbol)
+        return order.to_binance_order(quantizer=symbol_info.quantizer)
+
+    def _extra_params(self) -> str:
+        return "" if self.recv_window is None else f"&recvWindow={self.recv_window}"
+
+    def stage(self, order: Order) -> StagedRequest:
+        body = urlencode(self.order_params(order)) + self._extra_params()
+        return StagedRequest([order], "order", body, self.raw_client.API_SECRET)
+
+    def stage_batch(self, orders: List[Order]) -> StagedRequest:
+        if not 0 < len(orders) <= MAX_BATCH_ORDERS:
+            raise ValueError(f"A batch must have 1 to {MAX_BATCH_ORDERS} orders.")
+
+        batch = json.dumps([self.order_params(order) for order in orders], separators=(",", ":"))
+        body = f"batchOrders={quote(batch)}" + self._extra_params()
+        return StagedRequest(list(orders), "batchOrders", body, self.raw_client.API_SECRET)
+
+    def stage_position(
+            self,
+            symbol: str,
+            quantity: float,
+            price: float = None,
+            take_profit_price: float = None,
+            stop_loss_price: float = None,
+    ) -> StagedRequest:
+        """
+        Stages the entry and exit orders of a position (see trader.core.util.trade.create_position) as one batch.
+        """
+
+        orders = create_position(
+            symbol=symbol,
+            quantity=quantity,
+            price=price,
+            take_profit_price=take_profit_price,
+            stop_loss_price=stop_loss_price,
+        )
+        return self.stage_batch([order for order in orders if order is not None])
+
+    def _post(self, staged: StagedRequest):
+        timestamp = int(time.time() * 1000 + getattr(self.raw_client, "timestamp_offset", 0))
+        response = self.raw_client.session.post(
+            self._urls[staged.endpoint],
+            data=staged.sign(timestamp),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=getattr(self.raw_client, "REQUEST_TIMEOUT", 10),
+        )
+        return self.raw_client._handle_response(response)
+
+    def send(self, staged: StagedRequest) -> List[OrderResult]:
+        name = "futures_place_batch_order" if staged.is_batch else "futures_create_order"
+        if self.scheduler is None:
+            response = self._post(staged)
+        else:
+            response = self.scheduler.call(self.raw_client, name, lambda: self._post(staged))
+
+        if staged.is_batch:
+            return map_batch_response(staged.orders, response)
+
+        order: Order = staged.orders[0]
+        order.order_id = response.get("orderId")
+        order.status = response.get("status")
+        return [OrderResult(order, response)]
+
@@ -20,6 +20,7 @@ from typing import List, Dict
 # 'timeInForce': ['GTC', 'IOC', 'FOK', 'GTX']
 # }
 from trader.core.model import SymbolInfo
+from trader.core.util.quantization import Quantizer
 
 
 class PriceFilter:
@@ -69,31 +70,32 @@ class BinanceSymbolInfo(SymbolInfo):
 
         filters: List[Dict] = kwargs["filters"]
         for flt in filters:
-            if "PRICE_FILTER" in flt:
+            filter_type = flt["filterType"]
+            if filter_type == "PRICE_FILTER":
                 self.price_filter = PriceFilter(
                     max_price=flt["maxPrice"],
                     min_price=flt["minPrice"],
                     tick_size=flt["tickSize"],
                 )
-            elif "LOT_SIZE" in flt:
+            elif filter_type == "LOT_SIZE":
                 self.limit_lot_size_filter = LimitLotSizeFilter(
                     max_quantity=flt["maxQty"],
                     min_quantity=flt["minQty"],
                     step_size=flt["stepSize"],
                 )
-            elif "MARKET_LOT_SIZE" in flt:
-                self.limit_lot_size_filter = LimitLotSizeFilter(
+            elif filter_type == "MARKET_LOT_SIZE":
+                self.market_lot_size_filter = MarketLotSizeFilter(
                     max_quantity=flt["maxQty"],
                     min_quantity=flt["minQty"],
                     step_size=flt["stepSize"],
                 )
-            elif "MAX_NUM_ORDERS" in flt:
+            elif filter_type == "MAX_NUM_ORDERS":
                 self.max_orders = float(flt["limit"])
-            elif "MAX_NUM_ALGO_ORDERS" in flt:
+            elif filter_type == "MAX_NUM_ALGO_ORDERS":
                 self.max_algo_orders = float(flt["limit"])
-            elif "MIN_NOTIONAL" in flt:
-                self.minimum_notional = int(flt["notional"])
-            elif "PERCENT_PRICE" in flt:
+            elif filter_type == "MIN_NOTIONAL":
+                self.minimum_notional = float(flt["notional"])
+            elif filter_type == "PERCENT_PRICE":
                 self.price_percent_filter = PercentPriceFilter(
                     multiplier_up=float(flt["multiplierUp"]),
                     multiplier_down=float(flt["multiplierDown"]),
@@ -102,3 +104,22 @@ class BinanceSymbolInfo(SymbolInfo):
 
         self.order_types: List[str] = kwargs["orderTypes"]
         self.time_in_force: List[str] = kwargs["timeInForce"]
+
+        self.quantizer = self._create_quantizer(filters)
+
+    def _create_quantizer(self, filters: List[Dict]) -> Quantizer:
+        by_type = {flt["filterType"]: flt for flt in filters}
+        price_filter = by_type.get("PRICE_FILTER")
+        lot_size = by_type.get("LOT_SIZE")
+        if price_filter is None or lot_size is None:
+            return Quantizer.from_precision(self.price_precision, self.quantity_precision)
+
+        return Quantizer(
+            tick_size=price_filter["tickSize"],
+            step_size=lot_size["stepSize"],
+            min_price=price_filter["minPrice"],
+            max_price=price_filter["maxPrice"],
+            min_quantity=lot_size["minQty"],
+            max_quantity=lot_size["maxQty"],
+            min_notional=by_type.get("MIN_NOTIONAL", {}).get("notional", 0.0),
+        )
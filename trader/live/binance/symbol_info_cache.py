@@ -0,0 +1,224 @@
+import asyncio
+import inspect
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional
+
+from binance import AsyncClient
+from binance.client import Client
+
+from ..log import logger
+from .symbol_info import BinanceSymbolInfo
+
+_MIN_REFRESH_INTERVAL = 60.0
+
+
+class SymbolInfoCache:
+    """
+    Exchange metadata loaded once and indexed by symbol.
+
+    Refreshed in a background thread every ttl seconds
+    and persisted to path (if given), so a restart within ttl needs no REST call.
+    """
+
+    def __init__(
+            self,
+            client: Client,
+            ttl: float = 3600.0,
+            path: str = None,
+            background_refresh=True,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.path = path
+        self.background_refresh = background_refresh
+
+        self.updated_at = 0.0
+        self._symbol_infos: Dict[str, BinanceSymbolInfo] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _index(self, symbols: List[dict], updated_at: float):
+        symbol_infos = {data["symbol"]: BinanceSymbolInfo(**data) for data in symbols}
+        with self._lock:
+            self._symbol_infos = symbol_infos
+            self.updated_at = updated_at
+
+    def _load_from_disk(self) -> bool:
+        if self.path is None or not os.path.isfile(self.path):
+            return False
+
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if time.time() - data["updated_at"] > self.ttl:
+            return False
+
+        self._index(data["symbols"], data["updated_at"])
+        return True
+
+    def _save_to_disk(self, symbols: List[dict]):
+        if self.path is None:
+            return
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(dict(updated_at=self.updated_at, symbols=symbols), f)
+        os.replace(tmp_path, self.path)
+
+    def refresh(self):
+        exchange_info = self.client.futures_exchange_info()
+        if inspect.isawaitable(exchange_info):
+            exchange_info.close()
+            raise TypeError("SymbolInfoCache can not call an AsyncClient, use AsyncSymbolInfoCache instead!")
+
+        self.populate(exchange_info["symbols"])
+
+    def _refresh_loop(self):
+        while not self._stop.wait(max(self.ttl - (time.time() - self.updated_at), 0.0)):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Failed to refresh exchange info: {e!r}")
+                self._stop.wait(min(self.ttl, 60.0))
+
+    def load(self):
+        """
+        Loads from disk if the file is fresh, otherwise from REST,
+        and starts the background refresh (once, even if called from many threads).
+        """
+
+        with self._load_lock:
+            if not self._load_from_disk():
+                self.refresh()
+
+            if self.background_refresh and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._refresh_loop,
+                    name="symbol-info-refresh",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _ensure_loaded(self):
+        if not self._symbol_infos:
+            with self._load_lock:
+                if not self._symbol_infos:
+                    self.load()
+
+    def stop(self):
+        self._stop.set()
+
+    def populate(self, symbols: List[dict]):
+        self._index(symbols, time.time())
+        self._save_to_disk(symbols)
+
+    def get_all(self) -> List[BinanceSymbolInfo]:
+        self._ensure_loaded()
+        return list(self._symbol_infos.values())
+
+    def lookup(self, symbol: str) -> Optional[BinanceSymbolInfo]:
+        """
+        :return: Cached symbol info or None, never calls REST.
+        """
+
+        return self._symbol_infos.get(symbol.upper())
+
+    def get(self, symbol: str) -> BinanceSymbolInfo:
+        symbol = symbol.upper()
+
+        self._ensure_loaded()
+
+        symbol_info = self._symbol_infos.get(symbol)
+        if symbol_info is None and time.time() - self.updated_at > _MIN_REFRESH_INTERVAL:
+            # Symbol could have been listed since the last refresh.
+            self.refresh()
+            symbol_info = self._symbol_infos.get(symbol)
+
+        if symbol_info is None:
+            raise ValueError(f"Invalid symbol: {symbol}")
+
+        return symbol_info
+
+
+_shared_caches: 'weakref.WeakKeyDictionary[Client, SymbolInfoCache]' = weakref.WeakKeyDictionary()
+
+
+def shared_symbol_info_cache(client: Client) -> SymbolInfoCache:
+    """
+    :return: The SymbolInfoCache used by every helper and trader of this client.
+    """
+
+    cache = _shared_caches.get(client)
+    if cache is None:
+        cache = SymbolInfoCache(client)
+        _shared_caches[client] = cache
+    return cache
+
+
+class AsyncSymbolInfoCache(SymbolInfoCache):
+    """
+    SymbolInfoCache of an AsyncClient: load, refresh, get and get_all are coroutines.
+
+    There is no background thread, get and get_all refresh the metadata once it is older than ttl.
+    Concurrent callers share one refresh.
+    """
+
+    def __init__(self, client: AsyncClient, ttl: float = 3600.0, path: str = None):
+        super().__init__(client, ttl=ttl, path=path, background_refresh=False)
+        self._async_lock: Optional[asyncio.Lock] = None
+
+    async def refresh(self):
+        exchange_info: dict = await self.client.futures_exchange_info()
+        self.populate(exchange_info["symbols"])
+
+    async def load(self):
+        """
+        Loads from disk if the file is fresh, otherwise from REST.
+        """
+
+        if not self._load_from_disk():
+            await self.refresh()
+
+    async def _ensure_fresh(self):
+        if self._symbol_infos and time.time() - self.updated_at <= self.ttl:
+            return
+
+        if self._async_lock is None:
+            # Created here, so it belongs to the running event loop.
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if not self._symbol_infos:
+                await self.load()
+            elif time.time() - self.updated_at > self.ttl:
+                await self.refresh()
+
+    async def get_all(self) -> List[BinanceSymbolInfo]:
+        await self._ensure_fresh()
+        return list(self._symbol_infos.values())
+
+    async def get(self, symbol: str) -> BinanceSymbolInfo:
+        symbol = symbol.upper()
+        await self._ensure_fresh()
+
+        symbol_info = self._symbol_infos.get(symbol)
+        if symbol_info is None and time.time() - self.updated_at > _MIN_REFRESH_INTERVAL:
+            # Symbol could have been listed since the last refresh.
+            async with self._async_lock:
+                symbol_info = self._symbol_infos.get(symbol)
+                if symbol_info is None and time.time() - self.updated_at > _MIN_REFRESH_INTERVAL:
+                    await self.refresh()
+                    symbol_info = self._symbol_infos.get(symbol)
+
+        if symbol_info is None:
+            raise ValueError(f"Invalid symbol: {symbol}")
+
+        return symbol_info
@@ -0,0 +1,64 @@
+from typing import Optional
+
+import numpy as np
+
+from trader.core.const.candle_index import OPEN_TIME_INDEX, VOLUME_INDEX
+
+
+class CandleRingBuffer:
+    """
+    Fixed-capacity candle store in the candles ndarray layout of trader.core.const.candle_index.
+
+    Every candle is written twice into a buffer of 2 * capacity rows,
+    so the latest candles are always one contiguous slice and view() never copies or reallocates.
+    """
+
+    __slots__ = "capacity", "_buffer", "_position", "_count"
+
+    def __init__(self, capacity: int, columns: int = VOLUME_INDEX + 1, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive!")
+
+        self.capacity = capacity
+        self._buffer = np.zeros((2 * capacity, columns), dtype=dtype)
+        self._position = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def last_open_time(self) -> Optional[float]:
+        if self._count == 0:
+            return None
+        return self._buffer[self._position + self.capacity - 1][OPEN_TIME_INDEX]
+
+    def append(self, candle: np.ndarray):
+        self._buffer[self._position] = candle
+        self._buffer[self._position + self.capacity] = candle
+
+        self._position = (self._position + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def extend(self, candles: np.ndarray):
+        candles = candles[-self.capacity:]
+        size = candles.shape[0]
+        first = min(size, self.capacity - self._position)
+
+        for offset in (0, self.capacity):
+            start = self._position + offset
+            self._buffer[start:start + first] = candles[:first]
+            self._buffer[offset:offset + size - first] = candles[first:]
+
+        self._position = (self._position + size) % self.capacity
+        self._count = min(self._count + size, self.capacity)
+
+    def view(self) -> np.ndarray:
+        """
+        :return: Read-only view of the stored candles, oldest first.
+        """
+
+        end = self._position + self.capacity
+        view = self._buffer[end - self._count:end]
+        view.flags.writeable = False
+        return view
@@ -0,0 +1,270 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional
+
+import numpy as np
+
+from trader.core.const.candle_index import OPEN_TIME_INDEX
+from trader.core.strategy import Strategy
+from trader.core.util.common import interval_to_seconds
+
+from .log import logger
+
+# Trader methods which send orders to the exchange.
+ORDER_METHODS = frozenset((
+    "create_position",
+    "create_positions",
+    "create_order",
+    "create_orders",
+    "close_position",
+    "close_positions",
+    "cancel_orders",
+    "cancel_symbol_orders",
+    "modify_orders",
+    "send_staged",
+))
+
+
+class CandleFeed(ABC):
+
+    @abstractmethod
+    def candles(self, symbol: str, close_time: float) -> Optional[np.ndarray]:
+        """
+        :return: Candles of symbol ending with the candle which closed at close_time
+            (or None if that candle is not available yet).
+        """
+
+
+class Clock:
+    """
+    Exchange time: local time corrected by the server clock offset (see helpers.server_time_offset).
+    """
+
+    def __init__(self, offset: float = 0.0):
+        self.offset = offset
+
+    def time(self) -> float:
+        return time.time() + self.offset
+
+    def wait(self, seconds: float, stop: threading.Event) -> bool:
+        """
+        :return: True if stopped while waiting.
+        """
+
+        return stop.wait(max(seconds, 0.0))
+
+
+class SimulatedClock(Clock):
+    """
+    Clock which jumps forward instead of sleeping, so runs are deterministic and instant.
+    Waits of the runner and of its worker threads (polling the feed) advance it under a lock.
+    """
+
+    def __init__(self, start: float = 0.0):
+        super().__init__()
+        self.now = start
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self.now
+
+    def wait(self, seconds: float, stop: threading.Event) -> bool:
+        with self._lock:
+            self.now += max(seconds, 0.0)
+        return stop.is_set()
+
+
+class ReplayFeed(CandleFeed):
+    """
+    Stand-in feed which serves recorded candles as if they were closing in real time.
+    """
+
+    def __init__(self, candles: Dict[str, np.ndarray], interval: str):
+        self.interval_in_seconds = interval_to_seconds(interval)
+        self._candles = {symbol.upper(): symbol_candles for symbol, symbol_candles in candles.items()}
+
+    def candles(self, symbol: str, close_time: float) -> Optional[np.ndarray]:
+        candles = self._candles[symbol]
+        end = np.searchsorted(candles[:, OPEN_TIME_INDEX], close_time - self.interval_in_seconds, side="right")
+        if end == 0 or candles[end - 1, OPEN_TIME_INDEX] + self.interval_in_seconds != close_time:
+            return None
+        return candles[:end]
+
+
+class Decision:
+    """
+    Timing of one strategy evaluation, in seconds after the candle close.
+
+    order_latency is measured when the strategy calls the first order method of its trader,
+    it is None if the strategy did not trade.
+    """
+
+    __slots__ = "symbol", "close_time", "start_latency", "order_latency", "duration", "error"
+
+    def __init__(self, symbol: str, close_time: float):
+        self.symbol = symbol
+        self.close_time = close_time
+        self.start_latency: Optional[float] = None
+        self.order_latency: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.error: Optional[BaseException] = None
+
+
+class _TimedTrader:
+    """
+    Proxy of a trader which stamps the current decision of the calling thread on its first order call.
+    """
+
+    def __init__(self, trader, clock: Clock, current: threading.local):
+        self.trader = trader
+        self._clock = clock
+        self._current = current
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.trader, name)
+        if name not in ORDER_METHODS:
+            return attribute
+
+        def timed(*args, **kwargs):
+            decision: Optional[Decision] = getattr(self._current, "decision", None)
+            if decision is not None and decision.order_latency is None:
+                decision.order_latency = self._clock.time() - decision.close_time
+            return attribute(*args, **kwargs)
+
+        return timed
+
+
+class LiveRunner:
+    """
+    Live counterpart of run_backtest: evaluates every strategy right after each candle close.
+
+    Candle closes are computed from the interval on the exchange clock, so there is no polling.
+    Symbols are evaluated concurrently, and the close-to-order latency of every decision is recorded.
+    Only the latest max_decisions decisions are kept, so a long running runner does not grow without bound.
+
+    The trader of every strategy is replaced by a timing proxy, close (or leaving the runner as a context manager)
+    puts the original traders back.
+
+    :param strategies: Strategy per symbol.
+    :param feed: Source of the closed candles, e.g. KlineStream or ReplayFeed.
+    :param clock: Defaults to the local clock without offset.
+    :param feed_timeout: Seconds to wait for a closed candle before skipping the symbol for that close.
+    :param max_workers: Number of symbols evaluated at the same time.
+    :param max_decisions: Number of latest decisions kept for latency_percentiles.
+    """
+
+    def __init__(
+            self,
+            strategies: Dict[str, Strategy],
+            feed: CandleFeed,
+            interval: str,
+            clock: Clock = None,
+            feed_timeout=5.0,
+            poll_interval=0.01,
+            max_workers=None,
+            max_decisions=10_000,
+    ):
+        self.strategies = {symbol.upper(): strategy for symbol, strategy in strategies.items()}
+        self.feed = feed
+        self.interval = interval
+        self.interval_in_seconds = interval_to_seconds(interval)
+        self.clock = clock or Clock()
+        self.feed_timeout = feed_timeout
+        self.poll_interval = poll_interval
+        self.max_workers = max_workers or min(32, len(self.strategies))
+
+        self.decisions: Deque[Decision] = deque(maxlen=max_decisions)
+        self._current = threading.local()
+        self._stop = threading.Event()
+
+        self._traders = {symbol: strategy.trader for symbol, strategy in self.strategies.items()}
+        for strategy in self.strategies.values():
+            strategy.trader = _TimedTrader(strategy.trader, self.clock, self._current)
+
+    def close(self):
+        """
+        Gives the strategies their original traders back.
+        """
+
+        for symbol, trader in self._traders.items():
+            self.strategies[symbol].trader = trader
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def next_close_time(self) -> float:
+        return (self.clock.time() // self.interval_in_seconds + 1) * self.interval_in_seconds
+
+    def stop(self):
+        self._stop.set()
+
+    def _wait_for_candles(self, symbol: str, close_time: float) -> Optional[np.ndarray]:
+        deadline = close_time + self.feed_timeout
+        while True:
+            candles = self.feed.candles(symbol, close_time)
+            if candles is not None:
+                return candles
+            if self.clock.time() >= deadline or self.clock.wait(self.poll_interval, self._stop):
+                return None
+
+    def _evaluate(self, symbol: str, close_time: float) -> Decision:
+        decision = Decision(symbol, close_time)
+        candles = self._wait_for_candles(symbol, close_time)
+        if candles is None:
+            logger.warning(f"No {symbol} candle closed at {close_time}, skipping.")
+            return decision
+
+        self._current.decision = decision
+        decision.start_latency = self.clock.time() - close_time
+        try:
+            self.strategies[symbol](candles)
+        except Exception as e:
+            decision.error = e
+            logger.exception(f"{symbol} strategy failed on candle closed at {close_time}.")
+        finally:
+            decision.duration = self.clock.time() - close_time - decision.start_latency
+            self._current.decision = None
+        return decision
+
+    def run_once(self, close_time: float, executor: ThreadPoolExecutor = None) -> List[Decision]:
+        if executor is None or len(self.strategies) == 1:
+            decisions = [self._evaluate(symbol, close_time) for symbol in self.strategies]
+        else:
+            decisions = list(executor.map(lambda symbol: self._evaluate(symbol, close_time), self.strategies))
+
+        self.decisions.extend(decisions)
+        return decisions
+
+    def run(self, closes: int = None):
+        """
+        Evaluates the strategies on every candle close until stop is called
+        or closes candle closes have been processed.
+        """
+
+        self._stop.clear()
+        logger.info(f"Running {len(self.strategies)} strategies on {self.interval} candle closes.")
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="live-runner") as executor:
+            processed = 0
+            while closes is None or processed < closes:
+                close_time = self.next_close_time()
+                if self.clock.wait(close_time - self.clock.time(), self._stop):
+                    break
+
+                self.run_once(close_time, executor)
+                processed += 1
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)) -> Dict[int, float]:
+        """
+        :return: Close-to-order latency percentiles in seconds of the kept decisions which traded.
+        """
+
+        latencies = [decision.order_latency for decision in self.decisions if decision.order_latency is not None]
+        if not latencies:
+            return {}
+        return dict(zip(percentiles, np.percentile(latencies, percentiles).tolist()))